@@ -1,10 +1,71 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog, font as tkfont
 import math
-import random
+import itertools
+from collections import deque
+from contextlib import contextmanager
+
+from graph_model import SemanticGraph
+import layout
+from network_renderer import NetworkRenderer
+from frames_renderer import FramesRenderer, TextMeasure, SLOT_FONT
+from spatial_index import GridIndex, find_free_position
+from layout_worker import LayoutWorker
+from network_import import import_network
+from network_storage import save_network, load_network
+from inference import InheritanceIndex
+from frame_model import FrameStore
+from frame_resolution import SlotResolver
+from query import TripleQuery, QueryError
+from example_data import EXAMPLE_NODES, EXAMPLE_RELATIONS, EXAMPLE_FRAMES
+from history import History
+from autocomplete import PrefixIndex
+from search_index import KnowledgeSearch
+from derived_frames import DerivedFrames
+from profiling import Profiler
 
 class SemanticNetworkEditor:
-    def __init__(self, root):
+    # Режимы силового размещения: авто выбирает точный алгоритм для небольших сетей
+    LAYOUT_MODES = {
+        "авто": None,
+        "точный": layout.MODE_EXACT,
+        "Barnes–Hut": layout.MODE_BARNES_HUT,
+    }
+    if layout.MODE_VECTORIZED in layout.available_modes():
+        LAYOUT_MODES["NumPy"] = layout.MODE_VECTORIZED
+        LAYOUT_MODES["сетка NumPy"] = layout.MODE_GRID
+    # Послойное размещение иерархии "является" без силового расчета
+    LAYOUT_MODES["иерархия"] = layout.MODE_HIERARCHY
+    
+    # С этого числа узлов отрисовывается только видимая область сети
+    CULLING_AUTO_LIMIT = 2000
+    # С этого числа фреймов отрисовывается только видимая область, а фреймы свернуты
+    FRAMES_CULLING_AUTO_LIMIT = 500
+    FRAMES_COLLAPSE_AUTO_LIMIT = 200
+    # Шаг масштаба на одно деление колеса мыши и его пределы
+    ZOOM_STEP = 1.1
+    ZOOM_MIN = 0.05
+    ZOOM_MAX = 8.0
+    # Задержка перерисовки после прокрутки колеса, мс (серия делений - одна перерисовка)
+    ZOOM_RENDER_MS = 60
+    # Период опроса фонового расчета размещения, мс
+    LAYOUT_POLL_MS = 50
+    # Сколько решений запроса показывать в списке
+    QUERY_RESULT_LIMIT = 200
+    # Сколько результатов полнотекстового поиска показывать в списке
+    SEARCH_RESULT_LIMIT = 200
+    # Сколько последних сообщений хранится в журнале строки состояния
+    STATUS_LOG_SIZE = 200
+    # Сколько шагов можно отменить
+    HISTORY_DEPTH = 100
+    # Классы полей ввода: в них Ctrl+Z/Ctrl+Y относятся к тексту, а не к истории правок
+    TEXT_INPUT_CLASSES = frozenset(("Entry", "TEntry", "TCombobox", "Spinbox", "TSpinbox", "Text"))
+    # Сколько подсказок показывать в выпадающих списках узлов и фреймов
+    COMPLETION_LIMIT = 20
+    # Период обновления статистики профилирования, мс
+    PROFILE_REFRESH_MS = 1000
+    
+    def __init__(self, root, interactive=True):
         self.root = root
         self.root.title("Редактор семантической сети и фреймов")
         self.root.geometry("1600x1000")
@@ -18,9 +79,22 @@ class SemanticNetworkEditor:
         self.style.configure('TCombobox', font=('Arial', 9))
         self.style.configure('TEntry', font=('Arial', 9))
         
-        self.nodes = {}
-        self.relations = []
-        self.frames = {}
+        self.graph = SemanticGraph()
+        # Индекс иерархии "является" для запросов "X является Y" и наследования свойств
+        self.inheritance = InheritanceIndex(self.graph)
+        self.frame_store = FrameStore()
+        # Действующие значения слотов с учетом наследования (кэшируются)
+        self.slot_resolver = SlotResolver(self.frame_store)
+        
+        # Без интерактивного режима сообщения пишутся только в строку состояния
+        self.interactive = interactive
+        self.status_log = deque(maxlen=self.STATUS_LOG_SIZE)
+        # Вложенность пакетных изменений и отложенные до их конца обновления
+        self._batch_depth = 0
+        self._pending_views = set()
+        # Замеры длительности операций (включаются в информационной панели)
+        self.profiler = Profiler()
+        self.profile_refresh_id = None
         
         self.network_canvas_width = 1200
         self.network_canvas_height = 700
@@ -28,123 +102,241 @@ class SemanticNetworkEditor:
         self.frames_canvas_height = 700
         self.node_radius = 60
         
+        # Пространственные индексы центров узлов и фреймов для поиска свободного места
+        self.node_positions = GridIndex(cell_size=self.node_radius * 2.2)
+        self.frame_positions = GridIndex(cell_size=250)
+        self.graph.subscribe(self.update_node_positions)
+        self.frame_store.subscribe(self.update_frame_positions)
+        
+        # Индексы имен для подсказок при вводе в выпадающих списках
+        self.node_completion = PrefixIndex()
+        self.frame_completion = PrefixIndex()
+        self.graph.subscribe(self.update_node_completion)
+        self.frame_store.subscribe(self.update_frame_completion)
+        
+        # Полнотекстовый индекс узлов, типов связей, фреймов и слотов для строки поиска
+        self.search = KnowledgeSearch(self.graph, self.frame_store)
+        self.search_hits = []
+        # Текст последнего выполненного поиска (клавиши, не меняющие текст, поиск не повторяют)
+        self.search_query = ""
+        # Подсветка узлов результатами запроса и поиска хранится раздельно
+        self.query_highlight = set()
+        self.search_highlight = set()
+        
         # Сохраняем пример сети для восстановления
         self.example_nodes = {}
         self.example_relations = []
         self.example_frames = {}
         self.load_example_network()
         
+        # История отмены; загрузка примера в нее не входит
+        self.history = History(self.graph, self.frame_store, depth=self.HISTORY_DEPTH)
+        # Фреймы классов и объектов, поддерживаемые по связям сети (включаются на вкладке фреймов)
+        self.derived_frames = DerivedFrames(self.graph, self.frame_store, self.history)
+        
         self.create_widgets()
         self.draw_network()
         self.draw_frames()
     
+    @property
+    def nodes(self):
+        """Узлы сети (имя -> данные узла)"""
+        return self.graph.nodes
+    
+    @property
+    def relations(self):
+        """Связи сети"""
+        return self.graph.relations
+    
+    @property
+    def frames(self):
+        """Фреймы (имя -> данные фрейма)"""
+        return self.frame_store.frames
+    
     def load_example_network(self):
         """Загрузка примера семантической сети и фреймов"""
-        # Узлы
-        self.example_nodes = {
-            "птица": {"type": "class", "x": 450, "y": 100},
-            "животные": {"type": "class", "x": 450, "y": 50},
-            "страус": {"type": "object", "x": 200, "y": 200},
-            "канарейка": {"type": "object", "x": 400, "y": 200},
-            "дрозд": {"type": "object", "x": 600, "y": 200},
-            "пингвин": {"type": "object", "x": 800, "y": 200},
-            "летать": {"type": "property", "x": 700, "y": 300},
-            "ходить": {"type": "property", "x": 100, "y": 300},
-            "петь": {"type": "property", "x": 500, "y": 300},
-            "оперенье": {"type": "property", "x": 200, "y": 50},
-            "желтый": {"type": "property", "x": 300, "y": 450},
-            "черный": {"type": "property", "x": 700, "y": 450},
-            "коричневый": {"type": "property", "x": 500, "y": 450},
-        }
-        
-        # Отношения
-        self.example_relations = [
-            {"from": "страус", "to": "птица", "type": "является"},
-            {"from": "канарейка", "to": "птица", "type": "является"},
-            {"from": "дрозд", "to": "птица", "type": "является"},
-            {"from": "пингвин", "to": "птица", "type": "является"},
-            {"from": "птица", "to": "животные", "type": "является"},
-            {"from": "страус", "to": "ходить", "type": "умеет"},
-            {"from": "птица", "to": "оперенье", "type": "имеет"},
-            {"from": "пингвин", "to": "черный", "type": "имеет цвет"},
-            {"from": "пингвин", "to": "ходить", "type": "умеет"},
-            {"from": "канарейка", "to": "желтый", "type": "имеет цвет"},
-            {"from": "дрозд", "to": "коричневый", "type": "имеет цвет"},
-            {"from": "дрозд", "to": "петь", "type": "умеет"},
-            {"from": "канарейка", "to": "петь", "type": "умеет"},
-            {"from": "дрозд", "to": "летать", "type": "умеет"},
-            {"from": "канарейка", "to": "летать", "type": "умеет"},
-        ]
-        
-        # Фреймы
-        self.example_frames = {
-            "Фрейм: Птица": {
-                "type": "class_frame",
-                "x": 300, 
-                "y": 200,
-                "slots": {
-                    "Класс": "Птица",
-                    "Наследует": "Животные",
-                    "Имеет": "Оперенье",
-                    "Умеет": "Летать, Петь",
-                    "Примеры": "Страус, Канарейка, Дрозд, Пингвин"
-                }
-            },
-            "Фрейм: Канарейка": {
-                "type": "object_frame", 
-                "x": 600, 
-                "y": 200,
-                "slots": {
-                    "Объект": "Канарейка",
-                    "Тип": "Птица",
-                    "Цвет": "Желтый",
-                    "Умеет": "Летать, Петь",
-                    "Особенности": "Маленькая, Певчая"
-                }
-            },
-            "Фрейм: Пингвин": {
-                "type": "object_frame",
-                "x": 900, 
-                "y": 200,
-                "slots": {
-                    "Объект": "Пингвин",
-                    "Тип": "Птица",
-                    "Цвет": "Черный",
-                    "Умеет": "Ходить, Плавать",
-                    "Особенности": "Не летает, Живет в Антарктиде"
-                }
-            },
-            "Фрейм: Страус": {
-                "type": "object_frame",
-                "x": 300, 
-                "y": 400,
-                "slots": {
-                    "Объект": "Страус",
-                    "Тип": "Птица",
-                    "Цвет": "Коричневый",
-                    "Умеет": "Ходить, Бегать",
-                    "Особенности": "Не летает, Самая большая птица"
-                }
-            }
-        }
+        # Модели копируют данные при загрузке, поэтому пример не меняется при правке сети
+        self.example_nodes = EXAMPLE_NODES
+        self.example_relations = EXAMPLE_RELATIONS
+        self.example_frames = EXAMPLE_FRAMES
         
         # Загружаем пример в текущую сеть
-        self.nodes = self.example_nodes.copy()
-        self.relations = self.example_relations.copy()
-        self.frames = self.example_frames.copy()
+        self.graph.load(self.example_nodes, self.example_relations)
+        self.frame_store.load(self.example_frames)
+    
+    def update_node_positions(self, event, *args):
+        """Поддержка индекса центров узлов в актуальном состоянии"""
+        if event in ("node_added", "node_moved"):
+            node = self.nodes[args[0]]
+            self.node_positions.insert(args[0], node["x"], node["y"])
+        elif event == "node_removed":
+            self.node_positions.discard(args[0])
+        elif event == "cleared":
+            self.node_positions.clear()
+        elif event == "reset":
+            self.node_positions.clear()
+            for name, node in self.nodes.items():
+                self.node_positions.insert(name, node["x"], node["y"])
+    
+    def update_frame_positions(self, event, *args):
+        """Поддержка индекса центров фреймов в актуальном состоянии"""
+        if event in ("frame_added", "frame_moved"):
+            frame_data = self.frames[args[0]]
+            self.frame_positions.insert(args[0], frame_data["x"], frame_data["y"])
+        elif event == "frame_removed":
+            self.frame_positions.discard(args[0])
+        elif event in ("cleared", "reset"):
+            self.frame_positions.clear()
+            for frame_name, frame_data in self.frames.items():
+                self.frame_positions.insert(frame_name, frame_data["x"], frame_data["y"])
+    
+    def update_node_completion(self, event, *args):
+        """Поддержка индекса подсказок по именам узлов"""
+        if event == "node_added":
+            self.node_completion.add(args[0])
+        elif event == "node_removed":
+            self.node_completion.discard(args[0])
+        elif event in ("cleared", "reset"):
+            self.node_completion.rebuild(self.nodes)
+    
+    def update_frame_completion(self, event, *args):
+        """Поддержка индекса подсказок по именам фреймов"""
+        if event == "frame_added":
+            self.frame_completion.add(args[0])
+        elif event == "frame_removed":
+            self.frame_completion.discard(args[0])
+        elif event in ("cleared", "reset"):
+            self.frame_completion.rebuild(self.frames)
+    
+    def complete_combobox(self, combobox, completion):
+        """Подсказки в выпадающем списке: первые совпадения с введенным началом имени"""
+        combobox['values'] = completion.complete(combobox.get(), self.COMPLETION_LIMIT)
+    
+    def create_completing_combobox(self, parent, completion, width):
+        """Выпадающий список с подсказками по мере ввода"""
+        combobox = ttk.Combobox(parent, width=width)
+        combobox.configure(postcommand=lambda: self.complete_combobox(combobox, completion))
+        combobox.bind("<KeyRelease>", lambda event: self.complete_combobox(combobox, completion))
+        self.complete_combobox(combobox, completion)
+        return combobox
     
     def restore_network(self):
         """Восстановление примера сети"""
-        self.nodes = self.example_nodes.copy()
-        self.relations = self.example_relations.copy()
-        self.frames = self.example_frames.copy()
-        self.update_comboboxes()
-        self.draw_network()
-        self.draw_frames()
-        messagebox.showinfo("Успех", "Сеть восстановлена до исходного состояния")
+        self.graph.load(self.example_nodes, self.example_relations)
+        self.frame_store.load(self.example_frames)
+        # Загрузка фреймов заменила построенные по сети - строим их заново
+        self.derived_frames.rebuild()
+        self.request_refresh("comboboxes", "frames_list", "network", "frames")
+        self.notify("info", "Успех", "Сеть восстановлена до исходного состояния")
+    
+    @contextmanager
+    def batch(self):
+        """Пакетное изменение сети и фреймов
+        
+        Внутри блока перерисовка холстов, списков и комбобоксов только
+        запоминается и выполняется один раз при выходе из внешнего блока;
+        диалоги не показываются, сообщения пишутся в строку состояния.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.history.commit()
+                if self._pending_views:
+                    views, self._pending_views = self._pending_views, set()
+                    self.refresh_views(views)
+    
+    def request_refresh(self, *views):
+        """Обновление частей интерфейса сразу или по окончании пакета
+        
+        Вне пакета вызов завершает действие пользователя, поэтому его
+        изменения закрываются одним шагом истории.
+        """
+        if self._batch_depth:
+            self._pending_views.update(views)
+        else:
+            self.history.commit()
+            self.refresh_views(views)
+    
+    def refresh_views(self, views):
+        """Обновление перечисленных частей интерфейса"""
+        # Правка сети меняет фреймы, построенные по ней; список - только если изменилось число фреймов
+        if self.derived_frames.enabled and not {"network", "network_full", "comboboxes"}.isdisjoint(views):
+            views = set(views) | {"frames"}
+            if self.frames_listbox.size() != len(self.frames):
+                views.add("frames_list")
+        if "frames_list" in views:
+            self.update_frames_list()
+        if "comboboxes" in views:
+            self.update_comboboxes()
+        if "network_full" in views:
+            self.draw_network(full=True)
+        elif "network" in views:
+            self.draw_network()
+        if "frames" in views:
+            self.draw_frames()
+    
+    def notify(self, kind, title, message):
+        """Сообщение пользователю: диалог или запись в строке состояния
+        
+        Сообщения вида "status" только пишутся в строку состояния.
+        """
+        self.status_log.append((kind, title, message))
+        self.status_bar.config(text=f"{title}: {message.splitlines()[0] if message else ''}")
+        if self.interactive and not self._batch_depth and kind != "status":
+            show = {"info": messagebox.showinfo, "warning": messagebox.showwarning,
+                    "error": messagebox.showerror}[kind]
+            show(title, message)
+    
+    def confirm(self, title, message):
+        """Подтверждение действия (вне интерактивного режима и в пакете - без вопроса)"""
+        if not self.interactive or self._batch_depth:
+            return True
+        return messagebox.askyesno(title, message)
+    
+    def undo(self):
+        """Отмена последнего изменения сети или фреймов"""
+        # Фоновое размещение иначе перезапишет восстановленные позиции
+        self.discard_layout_worker()
+        if not self.history.undo():
+            self.notify("status", "История", "Нечего отменять")
+            return False
+        self.request_refresh("comboboxes", "frames_list", "network", "frames")
+        self.notify("status", "История", "Изменение отменено")
+        return True
+    
+    def redo(self):
+        """Повтор отмененного изменения"""
+        self.discard_layout_worker()
+        if not self.history.redo():
+            self.notify("status", "История", "Нечего повторять")
+            return False
+        self.request_refresh("comboboxes", "frames_list", "network", "frames")
+        self.notify("status", "История", "Изменение повторено")
+        return True
+    
+    def history_shortcut(self, event, action):
+        """Отмена или повтор по клавишам, если фокус не в поле ввода"""
+        if event.widget.winfo_class() in self.TEXT_INPUT_CLASSES:
+            return None
+        action()
+        return "break"
     
     def create_widgets(self):
         """Создание элементов интерфейса"""
+        # Строка состояния с последним сообщением
+        self.status_bar = ttk.Label(self.root, text="", anchor=tk.W, relief=tk.SUNKEN)
+        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        
+        # Отмена и повтор правок сети и фреймов (кроме полей ввода)
+        self.root.bind("<Control-z>", lambda event: self.history_shortcut(event, self.undo))
+        self.root.bind("<Control-y>", lambda event: self.history_shortcut(event, self.redo))
+        
+        # Строка поиска по сети и фреймам
+        self.create_search_bar()
+        
         # Создаем Notebook для переключения между сетью и фреймами
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -163,6 +355,23 @@ class SemanticNetworkEditor:
         # ===== ВКЛАДКА ФРЕЙМОВ =====
         self.create_frames_tab()
     
+    def create_search_bar(self):
+        """Создание строки поиска со списком найденного"""
+        search_frame = ttk.LabelFrame(self.root, text="Поиск по сети и фреймам", padding=5)
+        search_frame.pack(side=tk.TOP, fill=tk.X, padx=10, pady=(10, 0))
+        
+        ttk.Label(search_frame, text="Искать:").pack(side=tk.LEFT, padx=5, anchor=tk.N)
+        self.search_text = ttk.Entry(search_frame, width=40)
+        self.search_text.pack(side=tk.LEFT, padx=5, anchor=tk.N)
+        # Запрос выполняется при каждом нажатии клавиши
+        self.search_text.bind("<KeyRelease>", lambda event: self.on_search_key())
+        self.search_text.bind("<Return>", lambda event: self.show_search_hit(0))
+        ttk.Button(search_frame, text="Сбросить", command=self.clear_search).pack(side=tk.LEFT, padx=5, anchor=tk.N)
+        
+        self.search_results = tk.Listbox(search_frame, height=4, font=('Arial', 9))
+        self.search_results.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.search_results.bind("<<ListboxSelect>>", lambda event: self.show_search_hit())
+    
     def create_network_tab(self):
         """Создание вкладки семантической сети"""
         # Главный контейнер с разделением на две части
@@ -201,16 +410,21 @@ class SemanticNetworkEditor:
             scrollregion=(0, 0, self.network_canvas_width, self.network_canvas_height)
         )
         self.network_canvas.pack(fill=tk.BOTH, expand=True)
+        self.network_renderer = NetworkRenderer(self.network_canvas, self.graph, self.node_radius)
         
-        v_scrollbar.config(command=self.network_canvas.yview)
-        h_scrollbar.config(command=self.network_canvas.xview)
+        v_scrollbar.config(command=self.scroll_network_y)
+        h_scrollbar.config(command=self.scroll_network_x)
         
         # Добавляем возможность масштабирования и перемещения
         self.network_canvas.bind("<MouseWheel>", self.zoom_network)
+        self.network_canvas.bind("<Configure>", lambda event: self.schedule_network_refresh())
         self.network_canvas.bind("<ButtonPress-1>", self.scroll_start_network)
         self.network_canvas.bind("<B1-Motion>", self.scroll_move_network)
         
         self.network_zoom_level = 1.0
+        self.network_zoom_pending = False
+        self.network_refresh_pending = False
+        self.layout_worker = None
         
         # Панель управления сетью
         self.create_network_controls(right_frame)
@@ -253,16 +467,24 @@ class SemanticNetworkEditor:
             scrollregion=(0, 0, self.frames_canvas_width, self.frames_canvas_height)
         )
         self.frames_canvas.pack(fill=tk.BOTH, expand=True)
+        # Высоты текста слотов измеряются шрифтом Tk и кэшируются
+        slot_measure = TextMeasure(tkfont.Font(root=self.root, font=SLOT_FONT))
+        self.frames_renderer = FramesRenderer(self.frames_canvas, self.frame_store, slot_measure)
         
-        v_scrollbar.config(command=self.frames_canvas.yview)
-        h_scrollbar.config(command=self.frames_canvas.xview)
+        v_scrollbar.config(command=self.scroll_frames_y)
+        h_scrollbar.config(command=self.scroll_frames_x)
         
         # Добавляем возможность масштабирования и перемещения
         self.frames_canvas.bind("<MouseWheel>", self.zoom_frames)
+        self.frames_canvas.bind("<Configure>", lambda event: self.schedule_frames_refresh())
         self.frames_canvas.bind("<ButtonPress-1>", self.scroll_start_frames)
         self.frames_canvas.bind("<B1-Motion>", self.scroll_move_frames)
+        # Двойной щелчок сворачивает или разворачивает фрейм
+        self.frames_canvas.bind("<Double-Button-1>", self.toggle_frame_at)
         
         self.frames_zoom_level = 1.0
+        self.frames_zoom_pending = False
+        self.frames_refresh_pending = False
         
         # Панель управления фреймами
         self.create_frame_controls(right_frame)
@@ -289,11 +511,11 @@ class SemanticNetworkEditor:
         relation_frame.pack(fill=tk.X, pady=5)
         
         ttk.Label(relation_frame, text="От:").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
-        self.relation_from = ttk.Combobox(relation_frame, values=list(self.nodes.keys()), width=15)
+        self.relation_from = self.create_completing_combobox(relation_frame, self.node_completion, width=15)
         self.relation_from.grid(row=0, column=1, padx=5, pady=5)
         
         ttk.Label(relation_frame, text="К:").grid(row=0, column=2, padx=5, pady=5, sticky=tk.W)
-        self.relation_to = ttk.Combobox(relation_frame, values=list(self.nodes.keys()), width=15)
+        self.relation_to = self.create_completing_combobox(relation_frame, self.node_completion, width=15)
         self.relation_to.grid(row=0, column=3, padx=5, pady=5)
         
         ttk.Label(relation_frame, text="Тип связи:").grid(row=0, column=4, padx=5, pady=5, sticky=tk.W)
@@ -307,10 +529,41 @@ class SemanticNetworkEditor:
         management_frame = ttk.LabelFrame(parent, text="Управление сетью", padding=10)
         management_frame.pack(fill=tk.X, pady=5)
         
-        ttk.Button(management_frame, text="Обновить отображение", command=self.draw_network).pack(side=tk.LEFT, padx=5)
+        ttk.Button(management_frame, text="Обновить отображение", command=lambda: self.draw_network(full=True)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(management_frame, text="Отменить", command=self.undo).pack(side=tk.LEFT, padx=5)
+        ttk.Button(management_frame, text="Повторить", command=self.redo).pack(side=tk.LEFT, padx=5)
         ttk.Button(management_frame, text="Авторазмещение", command=self.auto_layout_network).pack(side=tk.LEFT, padx=5)
+        self.cancel_layout_button = ttk.Button(management_frame, text="Остановить", command=self.cancel_layout_network,
+                                               state=tk.DISABLED)
+        self.cancel_layout_button.pack(side=tk.LEFT, padx=5)
         ttk.Button(management_frame, text="Очистить сеть", command=self.clear_network).pack(side=tk.LEFT, padx=5)
         ttk.Button(management_frame, text="Восстановить сеть", command=self.restore_network).pack(side=tk.LEFT, padx=5)
+        ttk.Button(management_frame, text="Импорт...", command=self.import_network_file).pack(side=tk.LEFT, padx=5)
+        ttk.Button(management_frame, text="Сохранить...", command=self.save_network_file).pack(side=tk.LEFT, padx=5)
+        ttk.Button(management_frame, text="Открыть...", command=self.open_network_file).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Label(management_frame, text="Алгоритм:").pack(side=tk.LEFT, padx=(10, 2))
+        self.layout_mode = ttk.Combobox(management_frame, values=list(self.LAYOUT_MODES.keys()), width=11, state="readonly")
+        self.layout_mode.pack(side=tk.LEFT, padx=5)
+        self.layout_mode.set("авто")
+        
+        self.network_culling = tk.BooleanVar(value=False)
+        ttk.Checkbutton(management_frame, text="Только видимая область", variable=self.network_culling,
+                        command=lambda: self.draw_network(full=True)).pack(side=tk.LEFT, padx=5)
+        
+        # Панель запросов
+        query_frame = ttk.LabelFrame(parent, text="Запрос к сети", padding=10)
+        query_frame.pack(fill=tk.X, pady=5)
+        
+        ttk.Label(query_frame, text="Образцы (через ;):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
+        self.query_text = ttk.Entry(query_frame, width=45)
+        self.query_text.grid(row=0, column=1, padx=5, pady=5)
+        self.query_text.bind("<Return>", lambda event: self.run_network_query())
+        ttk.Button(query_frame, text="Найти", command=self.run_network_query).grid(row=0, column=2, padx=5, pady=5)
+        ttk.Button(query_frame, text="Сбросить", command=self.clear_network_query).grid(row=0, column=3, padx=5, pady=5)
+        
+        self.query_results = tk.Listbox(query_frame, height=5, font=('Arial', 9))
+        self.query_results.grid(row=1, column=0, columnspan=4, padx=5, pady=5, sticky=tk.EW)
         
         # Информационная панель
         info_frame = ttk.LabelFrame(parent, text="Информация о сети", padding=10)
@@ -319,6 +572,16 @@ class SemanticNetworkEditor:
         self.network_info_label = ttk.Label(info_frame, text="Узлов: 0, Связей: 0")
         self.network_info_label.pack(anchor=tk.W)
         
+        profile_controls = ttk.Frame(info_frame)
+        profile_controls.pack(fill=tk.X, pady=(5, 0))
+        self.profiling_enabled = tk.BooleanVar(value=False)
+        ttk.Checkbutton(profile_controls, text="Профилирование", variable=self.profiling_enabled,
+                        command=self.toggle_profiling).pack(side=tk.LEFT)
+        ttk.Button(profile_controls, text="Сбросить", command=self.reset_profiling).pack(side=tk.LEFT, padx=5)
+        ttk.Button(profile_controls, text="Сохранить трассу...", command=self.save_profile_trace).pack(side=tk.LEFT, padx=5)
+        self.profile_label = ttk.Label(info_frame, text="", font=('Courier', 8), justify=tk.LEFT)
+        self.profile_label.pack(anchor=tk.W)
+        
         # Легенда
         legend_frame = ttk.LabelFrame(parent, text="Легенда сети", padding=10)
         legend_frame.pack(fill=tk.X, pady=5)
@@ -374,7 +637,7 @@ class SemanticNetworkEditor:
         slot_frame.pack(fill=tk.X, pady=10)
         
         ttk.Label(slot_frame, text="Фрейм:").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
-        self.slot_frame_name = ttk.Combobox(slot_frame, values=list(self.frames.keys()), width=20)
+        self.slot_frame_name = self.create_completing_combobox(slot_frame, self.frame_completion, width=20)
         self.slot_frame_name.grid(row=0, column=1, padx=5, pady=5)
         
         ttk.Label(slot_frame, text="Имя слота:").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
@@ -391,10 +654,24 @@ class SemanticNetworkEditor:
         management_frame = ttk.LabelFrame(frame_control, text="Управление фреймами", padding=10)
         management_frame.pack(fill=tk.X, pady=10)
         
-        ttk.Button(management_frame, text="Обновить отображение", command=self.draw_frames).pack(side=tk.LEFT, padx=5)
+        ttk.Button(management_frame, text="Обновить отображение", command=lambda: self.draw_frames(full=True)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(management_frame, text="Отменить", command=self.undo).pack(side=tk.LEFT, padx=5)
+        ttk.Button(management_frame, text="Повторить", command=self.redo).pack(side=tk.LEFT, padx=5)
         ttk.Button(management_frame, text="Авторазмещение", command=self.auto_layout_frames).pack(side=tk.LEFT, padx=5)
         ttk.Button(management_frame, text="Очистить фреймы", command=self.clear_frames).pack(side=tk.LEFT, padx=5)
         
+        view_frame = ttk.Frame(frame_control)
+        view_frame.pack(fill=tk.X)
+        self.frames_collapsed = tk.BooleanVar(value=False)
+        ttk.Checkbutton(view_frame, text="Свернуть фреймы", variable=self.frames_collapsed,
+                        command=self.draw_frames).pack(side=tk.LEFT, padx=5)
+        self.frames_culling = tk.BooleanVar(value=False)
+        ttk.Checkbutton(view_frame, text="Только видимая область", variable=self.frames_culling,
+                        command=self.draw_frames).pack(side=tk.LEFT, padx=5)
+        self.frames_derived = tk.BooleanVar(value=False)
+        ttk.Checkbutton(view_frame, text="Строить по сети", variable=self.frames_derived,
+                        command=self.toggle_derived_frames).pack(side=tk.LEFT, padx=5)
+        
         # Информационная панель
         info_frame = ttk.LabelFrame(frame_control, text="Информация о фреймах", padding=10)
         info_frame.pack(fill=tk.X, pady=10)
@@ -460,12 +737,13 @@ class SemanticNetworkEditor:
         self.frames_listbox.delete(0, tk.END)
         for frame_name in self.frames.keys():
             self.frames_listbox.insert(tk.END, frame_name)
+        self.complete_combobox(self.slot_frame_name, self.frame_completion)
     
     def show_frame(self):
         """Отображение выбранного фрейма"""
         selection = self.frames_listbox.curselection()
         if not selection:
-            messagebox.showwarning("Предупреждение", "Выберите фрейм для просмотра")
+            self.notify("warning", "Предупреждение", "Выберите фрейм для просмотра")
             return
         
         frame_name = self.frames_listbox.get(selection[0])
@@ -477,104 +755,158 @@ class SemanticNetworkEditor:
         display_text += f"Позиция: ({frame_data['x']}, {frame_data['y']})\n\n"
         display_text += "Слоты:\n"
         
-        for slot_name, slot_value in frame_data['slots'].items():
-            display_text += f"  {slot_name}: {slot_value}\n"
+        # Собственные слоты и слоты, унаследованные по цепочке "Наследует"/"Тип"
+        for slot_name, (slot_value, source) in self.slot_resolver.resolved_slots(frame_name).items():
+            if source == frame_name:
+                display_text += f"  {slot_name}: {slot_value}\n"
+            else:
+                display_text += f"  {slot_name}: {slot_value} (от '{source}')\n"
         
         self.frame_display.delete(1.0, tk.END)
         self.frame_display.insert(1.0, display_text)
     
-    def create_frame(self):
-        """Создание нового фрейма"""
-        frame_name = self.frame_name.get().strip()
-        frame_type = self.frame_type.get()
+    def create_frame(self, frame_name=None, frame_type=None, x=None, y=None):
+        """Создание нового фрейма (по умолчанию - из полей формы)"""
+        from_form = frame_name is None
+        if from_form:
+            frame_name = self.frame_name.get()
+        frame_name = frame_name.strip()
+        if frame_type is None:
+            frame_type = self.frame_type.get()
         
         if not frame_name:
-            messagebox.showerror("Ошибка", "Введите имя фрейма")
-            return
+            self.notify("error", "Ошибка", "Введите имя фрейма")
+            return False
         
         if frame_name in self.frames:
-            messagebox.showerror("Ошибка", "Фрейм с таким именем уже существует")
-            return
+            self.notify("error", "Ошибка", "Фрейм с таким именем уже существует")
+            return False
         
         # Находим свободную позицию для фрейма
-        x, y = self.find_free_position_frames(200, 200)
+        if x is None or y is None:
+            x, y = self.find_free_position_frames(200, 200)
         
         # Создаем фрейм
-        self.frames[frame_name] = {
-            "type": frame_type,
-            "x": x,
-            "y": y,
-            "slots": {}
-        }
+        self.frame_store.create_frame(frame_name, frame_type, x, y)
         
-        self.update_frames_list()
-        self.slot_frame_name['values'] = list(self.frames.keys())
-        self.draw_frames()
+        self.request_refresh("frames_list", "frames")
         
-        self.frame_name.delete(0, tk.END)
-        messagebox.showinfo("Успех", f"Фрейм '{frame_name}' создан")
+        if from_form:
+            self.frame_name.delete(0, tk.END)
+        self.notify("info", "Успех", f"Фрейм '{frame_name}' создан")
+        return True
     
-    def add_slot(self):
-        """Добавление слота к фрейму"""
-        frame_name = self.slot_frame_name.get()
-        slot_name = self.slot_name.get().strip()
-        slot_value = self.slot_value.get().strip()
+    def add_slot(self, frame_name=None, slot_name=None, slot_value=None):
+        """Добавление слота к фрейму (по умолчанию - из полей формы)"""
+        from_form = slot_name is None
+        if frame_name is None:
+            frame_name = self.slot_frame_name.get()
+        if from_form:
+            slot_name = self.slot_name.get()
+        if slot_value is None:
+            slot_value = self.slot_value.get()
+        slot_name = slot_name.strip()
+        slot_value = slot_value.strip()
         
         if not frame_name or not slot_name or not slot_value:
-            messagebox.showerror("Ошибка", "Заполните все поля")
-            return
+            self.notify("error", "Ошибка", "Заполните все поля")
+            return False
         
         if frame_name not in self.frames:
-            messagebox.showerror("Ошибка", "Выбранный фрейм не существует")
-            return
+            self.notify("error", "Ошибка", "Выбранный фрейм не существует")
+            return False
+        
+        if self.derived_frames.is_derived_slot(frame_name, slot_name):
+            self.notify("error", "Ошибка", f"Слот '{slot_name}' построен по сети: измените связи узла "
+                                           f"'{self.derived_frames.node_of(frame_name)}'")
+            return False
         
         # Добавляем слот
-        self.frames[frame_name]['slots'][slot_name] = slot_value
+        self.frame_store.set_slot(frame_name, slot_name, slot_value)
         
-        self.draw_frames()
+        self.request_refresh("frames")
         
-        self.slot_name.delete(0, tk.END)
-        self.slot_value.delete(0, tk.END)
-        messagebox.showinfo("Успех", f"Слот '{slot_name}' добавлен к фрейму '{frame_name}'")
+        if from_form:
+            self.slot_name.delete(0, tk.END)
+            self.slot_value.delete(0, tk.END)
+        self.notify("info", "Успех", f"Слот '{slot_name}' добавлен к фрейму '{frame_name}'")
+        return True
     
-    def delete_frame(self):
-        """Удаление выбранного фрейма"""
-        selection = self.frames_listbox.curselection()
-        if not selection:
-            messagebox.showwarning("Предупреждение", "Выберите фрейм для удаления")
-            return
+    def delete_frame(self, frame_name=None):
+        """Удаление фрейма (по умолчанию - выбранного в списке)"""
+        if frame_name is None:
+            selection = self.frames_listbox.curselection()
+            if not selection:
+                self.notify("warning", "Предупреждение", "Выберите фрейм для удаления")
+                return False
+            frame_name = self.frames_listbox.get(selection[0])
         
-        frame_name = self.frames_listbox.get(selection[0])
+        if frame_name not in self.frames:
+            self.notify("error", "Ошибка", "Выбранный фрейм не существует")
+            return False
         
-        if messagebox.askyesno("Подтверждение", f"Вы уверены, что хотите удалить фрейм '{frame_name}'?"):
-            del self.frames[frame_name]
-            self.update_frames_list()
-            self.slot_frame_name['values'] = list(self.frames.keys())
-            self.frame_display.delete(1.0, tk.END)
-            self.draw_frames()
-            messagebox.showinfo("Успех", f"Фрейм '{frame_name}' удален")
+        if self.derived_frames.is_derived(frame_name):
+            self.notify("error", "Ошибка",
+                        f"Фрейм построен по сети: удалите узел '{self.derived_frames.node_of(frame_name)}'")
+            return False
+        
+        if not self.confirm("Подтверждение", f"Вы уверены, что хотите удалить фрейм '{frame_name}'?"):
+            return False
+        self.frame_store.delete_frame(frame_name)
+        self.frame_display.delete(1.0, tk.END)
+        self.request_refresh("frames_list", "frames")
+        self.notify("info", "Успех", f"Фрейм '{frame_name}' удален")
+        return True
     
     def clear_frames(self):
         """Очистка всех фреймов"""
-        if messagebox.askyesno("Подтверждение", "Вы уверены, что хотите очистить все фреймы?"):
-            self.frames.clear()
-            self.update_frames_list()
-            self.slot_frame_name['values'] = list(self.frames.keys())
-            self.frame_display.delete(1.0, tk.END)
-            self.draw_frames()
-            messagebox.showinfo("Успех", "Все фреймы очищены")
+        if not self.confirm("Подтверждение", "Вы уверены, что хотите очистить все фреймы?"):
+            return False
+        self.frame_store.clear()
+        # Фреймы, построенные по сети, очистка не удаляет
+        self.derived_frames.rebuild()
+        self.frame_display.delete(1.0, tk.END)
+        self.request_refresh("frames_list", "frames")
+        self.notify("info", "Успех", "Все фреймы очищены")
+        return True
     
-    def zoom_network(self, event):
-        """Масштабирование canvas сети"""
-        scale_factor = 1.1
-        if event.delta > 0:
-            self.network_zoom_level *= scale_factor
+    def toggle_derived_frames(self):
+        """Включение и выключение построения фреймов по сети (флажок на вкладке фреймов)"""
+        if self.frames_derived.get():
+            self.derived_frames.enable()
+            message = "Фреймы классов и объектов построены по сети и обновляются при ее правке"
         else:
-            self.network_zoom_level /= scale_factor
-        
-        self.network_canvas.scale("all", event.x, event.y, 
-                         scale_factor if event.delta > 0 else 1/scale_factor, 
-                         scale_factor if event.delta > 0 else 1/scale_factor)
+            self.derived_frames.disable()
+            message = "Фреймы больше не обновляются по сети"
+        # Прежние шаги истории не учитывают построенные фреймы - отменять их было бы небезопасно
+        self.history.clear()
+        self.request_refresh("frames_list", "frames")
+        self.notify("info", "Фреймы", message)
+    
+    def zoom_factor(self, event, zoom_level):
+        """Множитель масштаба для деления колеса мыши с учетом пределов масштаба"""
+        step = self.ZOOM_STEP if event.delta > 0 else 1 / self.ZOOM_STEP
+        return min(max(zoom_level * step, self.ZOOM_MIN), self.ZOOM_MAX) / zoom_level
+    
+    def zoom_network(self, event):
+        """Масштабирование сети относительно указателя с отложенной перерисовкой"""
+        scale_factor = self.zoom_factor(event, self.network_zoom_level)
+        if scale_factor == 1:
+            return
+        self.network_zoom_level *= scale_factor
+        
+        # Меняется только преобразование вида; элементы перерисуются в новом масштабе
+        canvas = self.network_canvas
+        self.network_renderer.scale_view(canvas.canvasx(event.x), canvas.canvasy(event.y), scale_factor)
+        self.network_renderer.invalidate()
+        if not self.network_zoom_pending:
+            self.network_zoom_pending = True
+            self.root.after(self.ZOOM_RENDER_MS, self.render_network_zoom)
+    
+    def render_network_zoom(self):
+        """Перерисовка сети после серии делений колеса"""
+        self.network_zoom_pending = False
+        self.draw_network()
     
     def scroll_start_network(self, event):
         """Начало перемещения canvas сети"""
@@ -583,18 +915,47 @@ class SemanticNetworkEditor:
     def scroll_move_network(self, event):
         """Перемещение canvas сети"""
         self.network_canvas.scan_dragto(event.x, event.y, gain=1)
+        self.schedule_network_refresh()
+    
+    def scroll_network_x(self, *args):
+        """Горизонтальная прокрутка canvas сети"""
+        self.network_canvas.xview(*args)
+        self.schedule_network_refresh()
+    
+    def scroll_network_y(self, *args):
+        """Вертикальная прокрутка canvas сети"""
+        self.network_canvas.yview(*args)
+        self.schedule_network_refresh()
+    
+    def schedule_network_refresh(self):
+        """Отложенная дорисовка видимой области после прокрутки или масштабирования"""
+        if self.network_renderer.culling and not self.network_refresh_pending:
+            self.network_refresh_pending = True
+            self.root.after_idle(self.refresh_network_viewport)
+    
+    def refresh_network_viewport(self):
+        """Дорисовка элементов, попавших в видимую область"""
+        self.network_refresh_pending = False
+        self.draw_network()
     
     def zoom_frames(self, event):
-        """Масштабирование canvas фреймов"""
-        scale_factor = 1.1
-        if event.delta > 0:
-            self.frames_zoom_level *= scale_factor
-        else:
-            self.frames_zoom_level /= scale_factor
-        
-        self.frames_canvas.scale("all", event.x, event.y, 
-                         scale_factor if event.delta > 0 else 1/scale_factor, 
-                         scale_factor if event.delta > 0 else 1/scale_factor)
+        """Масштабирование фреймов относительно указателя с отложенной перерисовкой"""
+        scale_factor = self.zoom_factor(event, self.frames_zoom_level)
+        if scale_factor == 1:
+            return
+        self.frames_zoom_level *= scale_factor
+        
+        canvas = self.frames_canvas
+        self.frames_renderer.scale_view(canvas.canvasx(event.x), canvas.canvasy(event.y), scale_factor)
+        self.frames_renderer.invalidate()
+        if not self.frames_zoom_pending:
+            self.frames_zoom_pending = True
+            self.root.after(self.ZOOM_RENDER_MS, self.render_frames_zoom)
+    
+    def render_frames_zoom(self):
+        """Перерисовка фреймов после серии делений колеса"""
+        self.frames_zoom_pending = False
+        self.draw_frames()
     
     def scroll_start_frames(self, event):
         """Начало перемещения canvas фреймов"""
@@ -603,157 +964,297 @@ class SemanticNetworkEditor:
     def scroll_move_frames(self, event):
         """Перемещение canvas фреймов"""
         self.frames_canvas.scan_dragto(event.x, event.y, gain=1)
+        self.schedule_frames_refresh()
+    
+    def scroll_frames_x(self, *args):
+        """Горизонтальная прокрутка canvas фреймов"""
+        self.frames_canvas.xview(*args)
+        self.schedule_frames_refresh()
+    
+    def scroll_frames_y(self, *args):
+        """Вертикальная прокрутка canvas фреймов"""
+        self.frames_canvas.yview(*args)
+        self.schedule_frames_refresh()
+    
+    def schedule_frames_refresh(self):
+        """Отложенная дорисовка видимых фреймов после прокрутки или масштабирования"""
+        if self.frames_renderer.culling and not self.frames_refresh_pending:
+            self.frames_refresh_pending = True
+            self.root.after_idle(self.refresh_frames_viewport)
+    
+    def refresh_frames_viewport(self):
+        """Дорисовка фреймов, попавших в видимую область"""
+        self.frames_refresh_pending = False
+        self.draw_frames()
+    
+    def toggle_frame_at(self, event):
+        """Сворачивание или разворачивание фрейма под указателем"""
+        canvas = self.frames_canvas
+        frame_name = self.frames_renderer.frame_at(canvas.canvasx(event.x), canvas.canvasy(event.y))
+        if frame_name is not None:
+            self.frames_renderer.toggle(frame_name)
+            self.draw_frames()
     
     def find_free_position_network(self, center_x, center_y, max_attempts=100):
         """Поиск свободной позиции для нового узла в сети"""
-        for attempt in range(max_attempts):
-            radius = self.node_radius * (attempt // 10 + 1)
-            angle = attempt * 0.5 
-            
-            x = center_x + radius * math.cos(angle)
-            y = center_y + radius * math.sin(angle)
-            
-            if (x < self.node_radius or x > self.network_canvas_width - self.node_radius or
-                y < self.node_radius or y > self.network_canvas_height - self.node_radius):
-                continue
-            
-            collision = False
-            for node_name, node_data in self.nodes.items():
-                distance = math.sqrt((x - node_data["x"])**2 + (y - node_data["y"])**2)
-                if distance < self.node_radius * 2.2: 
-                    collision = True
-                    break
-            
-            if not collision:
-                return x, y
-        
-        return (random.randint(self.node_radius, self.network_canvas_width - self.node_radius),
-                random.randint(self.node_radius, self.network_canvas_height - self.node_radius))
+        bounds = (self.node_radius, self.node_radius,
+                  self.network_canvas_width - self.node_radius,
+                  self.network_canvas_height - self.node_radius)
+        with self.profiler.span("placement", nodes=len(self.node_positions)):
+            return find_free_position(self.node_positions, center_x, center_y,
+                                      min_distance=self.node_radius * 2.2, bounds=bounds,
+                                      spiral_step=self.node_radius, max_attempts=max_attempts)
     
     def find_free_position_frames(self, center_x, center_y, max_attempts=100):
         """Поиск свободной позиции для нового фрейма"""
         frame_width = 200
         frame_height = 150
         
-        for attempt in range(max_attempts):
-            radius = 150 * (attempt // 10 + 1)
-            angle = attempt * 0.5 
-            
-            x = center_x + radius * math.cos(angle)
-            y = center_y + radius * math.sin(angle)
-            
-            if (x < frame_width/2 or x > self.frames_canvas_width - frame_width/2 or
-                y < frame_height/2 or y > self.frames_canvas_height - frame_height/2):
-                continue
-            
-            collision = False
-            for frame_name, frame_data in self.frames.items():
-                distance = math.sqrt((x - frame_data["x"])**2 + (y - frame_data["y"])**2)
-                if distance < 250:  # Минимальное расстояние между фреймами
-                    collision = True
-                    break
-            
-            if not collision:
-                return x, y
-        
-        return (random.randint(frame_width//2, self.frames_canvas_width - frame_width//2),
-                random.randint(frame_height//2, self.frames_canvas_height - frame_height//2))
+        bounds = (frame_width / 2, frame_height / 2,
+                  self.frames_canvas_width - frame_width / 2,
+                  self.frames_canvas_height - frame_height / 2)
+        # Минимальное расстояние между фреймами - 250
+        with self.profiler.span("placement.frames", frames=len(self.frame_positions)):
+            return find_free_position(self.frame_positions, center_x, center_y,
+                                      min_distance=250, bounds=bounds,
+                                      spiral_step=150, max_attempts=max_attempts)
     
-    def add_node(self):
-        """Добавление нового узла"""
-        name = self.node_name.get().strip()
-        node_type = self.node_type.get()
+    def add_node(self, name=None, node_type=None, x=None, y=None):
+        """Добавление нового узла (по умолчанию - из полей формы)"""
+        from_form = name is None
+        if from_form:
+            name = self.node_name.get()
+        name = name.strip()
+        if node_type is None:
+            node_type = self.node_type.get()
         
         if not name:
-            messagebox.showerror("Ошибка", "Введите имя узла")
-            return
+            self.notify("error", "Ошибка", "Введите имя узла")
+            return False
         
         if name in self.nodes:
-            messagebox.showerror("Ошибка", "Узел с таким именем уже существует")
-            return
+            self.notify("error", "Ошибка", "Узел с таким именем уже существует")
+            return False
         
-        x, y = self.find_free_position_network(self.network_canvas_width // 2, self.network_canvas_height // 2)
+        if x is None or y is None:
+            x, y = self.find_free_position_network(self.network_canvas_width // 2, self.network_canvas_height // 2)
         
-        self.nodes[name] = {
-            "type": node_type,
-            "x": x,
-            "y": y
-        }
+        self.graph.add_node(name, node_type, x, y)
         
-        self.update_comboboxes()
-        self.draw_network()
+        self.request_refresh("comboboxes", "network")
         
-        self.node_name.delete(0, tk.END)
-        messagebox.showinfo("Успех", f"Узел '{name}' добавлен")
+        if from_form:
+            self.node_name.delete(0, tk.END)
+        self.notify("info", "Успех", f"Узел '{name}' добавлен")
+        return True
     
-    def add_relation(self):
-        """Добавление новой связи"""
-        from_node = self.relation_from.get()
-        to_node = self.relation_to.get()
-        relation_type = self.relation_type.get()
+    def add_relation(self, from_node=None, to_node=None, relation_type=None):
+        """Добавление новой связи (по умолчанию - из полей формы)"""
+        if from_node is None:
+            from_node = self.relation_from.get()
+        if to_node is None:
+            to_node = self.relation_to.get()
+        if relation_type is None:
+            relation_type = self.relation_type.get()
         
         if not from_node or not to_node:
-            messagebox.showerror("Ошибка", "Выберите узлы для связи")
-            return
+            self.notify("error", "Ошибка", "Выберите узлы для связи")
+            return False
         
         if from_node == to_node:
-            messagebox.showerror("Ошибка", "Нельзя создать связь узла с самим собой")
-            return
+            self.notify("error", "Ошибка", "Нельзя создать связь узла с самим собой")
+            return False
         
-        for relation in self.relations:
-            if (relation["from"] == from_node and 
-                relation["to"] == to_node and 
-                relation["type"] == relation_type):
-                messagebox.showerror("Ошибка", "Такая связь уже существует")
-                return
+        if not self.graph.has_node(from_node) or not self.graph.has_node(to_node):
+            self.notify("error", "Ошибка", "Выбранный узел не существует")
+            return False
         
-        self.relations.append({
-            "from": from_node,
-            "to": to_node,
-            "type": relation_type
-        })
+        if self.graph.has_relation(from_node, to_node, relation_type):
+            self.notify("error", "Ошибка", "Такая связь уже существует")
+            return False
         
-        self.draw_network()
-        messagebox.showinfo("Успех", f"Связь '{relation_type}' добавлена")
+        self.graph.add_relation(from_node, to_node, relation_type)
+        
+        self.request_refresh("network")
+        self.notify("info", "Успех", f"Связь '{relation_type}' добавлена")
+        return True
     
     def auto_layout_network(self):
         """Автоматическое размещение узлов в сети"""
-        # Группируем узлы по типам
-        classes = [name for name, data in self.nodes.items() if data["type"] == "класс"]
-        objects = [name for name, data in self.nodes.items() if data["type"] == "объект"]
-        properties = [name for name, data in self.nodes.items() if data["type"] == "свойство"]
-        
-        # Размещаем классы вверху
-        class_y = 80
-        class_spacing = self.network_canvas_width / (len(classes) + 1)
-        for i, class_name in enumerate(classes):
-            self.nodes[class_name]["x"] = class_spacing * (i + 1)
-            self.nodes[class_name]["y"] = class_y
-        
-        # Размещаем объекты посередине
-        object_y = self.network_canvas_height / 2
-        object_spacing = self.network_canvas_width / (len(objects) + 1)
-        for i, object_name in enumerate(objects):
-            self.nodes[object_name]["x"] = object_spacing * (i + 1)
-            self.nodes[object_name]["y"] = object_y
-        
-        # Размещаем свойства внизу
-        property_y = self.network_canvas_height - 80
-        property_spacing = self.network_canvas_width / (len(properties) + 1)
-        for i, property_name in enumerate(properties):
-            self.nodes[property_name]["x"] = property_spacing * (i + 1)
-            self.nodes[property_name]["y"] = property_y
-        
-        # Применяем force-directed layout для улучшения размещения
-        self.apply_force_directed_layout_network()
+        if self.LAYOUT_MODES[self.layout_mode.get()] == layout.MODE_HIERARCHY:
+            self.hierarchical_layout_network()
+            return
         
-        self.draw_network()
-        messagebox.showinfo("Успех", "Авторазмещение сети выполнено")
+        # Классы вверху, объекты посередине, свойства внизу
+        names, xs, ys = layout.layered_positions(self.graph, self.network_canvas_width, self.network_canvas_height)
+        self.graph.set_positions(names, xs, ys)
+        
+        # Применяем force-directed layout для улучшения размещения (в фоновом потоке);
+        # начальная расстановка входит в тот же шаг истории, что и сам расчет
+        self.start_layout_worker()
+        self.request_refresh("network")
+    
+    def hierarchical_layout_network(self):
+        """Иерархическое размещение: уровни по связям "является", свойства рядом с владельцами"""
+        self.apply_hierarchical_layout_network()
+        self.request_refresh("network")
+        self.notify("info", "Успех", "Иерархическое размещение сети выполнено")
+    
+    def force_layout_mode(self):
+        """Выбранный силовой режим (для иерархии - автоматический выбор)"""
+        mode = self.LAYOUT_MODES[self.layout_mode.get()]
+        return None if mode == layout.MODE_HIERARCHY else mode
+    
+    def layout_bounds_network(self):
+        """Границы, в которых алгоритмы размещения держат центры узлов"""
+        return (self.node_radius, self.node_radius,
+                self.network_canvas_width - self.node_radius,
+                self.network_canvas_height - self.node_radius)
+    
+    def start_layout_worker(self, iterations=50, mode=None):
+        """Запуск силового размещения в фоне с анимацией промежуточных результатов"""
+        if self.layout_worker is not None:
+            self.layout_worker.cancel()
+        if mode is None:
+            mode = self.force_layout_mode()
+        
+        self.layout_worker = LayoutWorker.from_graph(self.graph, self.layout_bounds_network(),
+                                                     mode=mode, max_iterations=iterations,
+                                                     profiler=self.profiler)
+        self.layout_worker.start()
+        self.history.commit(merge_key=self.layout_worker)
+        self.cancel_layout_button.config(state=tk.NORMAL)
+        self.root.after(self.LAYOUT_POLL_MS, self.poll_layout_worker, self.layout_worker)
+    
+    def cancel_layout_network(self):
+        """Остановка фонового авторазмещения"""
+        if self.layout_worker is not None:
+            self.layout_worker.cancel()
+    
+    def discard_layout_worker(self):
+        """Остановка фонового авторазмещения без применения его результатов"""
+        if self.layout_worker is not None:
+            self.layout_worker.cancel()
+            self.layout_worker = None
+            self.cancel_layout_button.config(state=tk.DISABLED)
+    
+    def apply_layout_positions(self, worker, positions):
+        """Перенос координат из фонового расчета в сеть"""
+        _, xs, ys = positions
+        with self.profiler.span("layout.apply") as span:
+            # Узлы могли быть удалены, пока шел расчет
+            moved = [(name, x, y) for name, x, y in zip(worker.names, xs, ys) if name in self.nodes]
+            self.graph.set_positions([m[0] for m in moved], [m[1] for m in moved], [m[2] for m in moved])
+            span["nodes"] = len(moved)
+        # Все промежуточные результаты одного расчета - один шаг истории
+        self.history.commit(merge_key=worker)
+        self.request_refresh("network")
+    
+    def poll_layout_worker(self, worker):
+        """Периодический опрос фонового расчета размещения из главного потока"""
+        if worker is not self.layout_worker:
+            return  # расчет заменен новым запуском
+        
+        done = worker.done
+        positions = worker.poll()
+        if positions is not None:
+            self.apply_layout_positions(worker, positions)
+        if not done:
+            self.root.after(self.LAYOUT_POLL_MS, self.poll_layout_worker, worker)
+            return
+        
+        self.layout_worker = None
+        self.cancel_layout_button.config(state=tk.DISABLED)
+        if worker.error is not None:
+            self.notify("error", "Ошибка", f"Авторазмещение не выполнено: {worker.error}")
+        elif worker.cancelled:
+            self.notify("info", "Информация", f"Авторазмещение остановлено (итераций: {worker.iteration})")
+        else:
+            self.notify("info", "Успех", f"Авторазмещение сети выполнено (итераций: {worker.iteration})")
+    
+    def import_network_file(self, path=None):
+        """Импорт узлов и связей из файла CSV/TSV/JSON Lines с одной перерисовкой в конце"""
+        if path is None:
+            path = filedialog.askopenfilename(
+                title="Импорт сети",
+                filetypes=[("Тройки", "*.csv *.tsv *.jsonl *.ndjson"), ("Все файлы", "*.*")]
+            )
+            if not path:
+                return
+        
+        def show_progress(lines, read_bytes, total_bytes):
+            percent = 100 * read_bytes / total_bytes if total_bytes else 100
+            self.network_info_label.config(text=f"Импорт: {lines} строк ({percent:.0f}%)")
+            self.root.update_idletasks()
+        
+        origin = (self.node_radius, self.node_radius)
+        self.discard_layout_worker()
+        # Импорт - отдельный шаг истории, который можно откатить целиком
+        self.history.commit()
+        try:
+            report = import_network(self.graph, path, origin=origin, spacing=self.node_radius * 2.2,
+                                    progress=show_progress)
+        except (OSError, ValueError) as error:
+            # Добавленное до ошибки убирается, не попадая в историю
+            with self.graph.bulk():
+                self.history.rollback()
+            self.request_refresh("comboboxes", "network_full")
+            self.notify("error", "Ошибка", f"Не удалось прочитать файл: {error}")
+            return
+        
+        # Иерархия считается за один проход, силовое размещение идет в фоне;
+        # вся сеть перерисовывается один раз, дальше - только сдвинутые узлы
+        if report.nodes_added or report.relations_added:
+            if self.LAYOUT_MODES[self.layout_mode.get()] == layout.MODE_HIERARCHY:
+                self.apply_hierarchical_layout_network()
+            else:
+                self.start_layout_worker()
+        self.request_refresh("comboboxes", "network_full")
+        self.notify("info", "Импорт", report.summary())
+        return report
+    
+    def save_network_file(self, path=None):
+        """Сохранение сети и фреймов в двоичный файл .snet"""
+        if path is None:
+            path = filedialog.asksaveasfilename(
+                title="Сохранить сеть", defaultextension=".snet",
+                filetypes=[("Семантическая сеть", "*.snet"), ("Все файлы", "*.*")]
+            )
+            if not path:
+                return
+        try:
+            save_network(path, self.graph, self.frames)
+        except OSError as error:
+            self.notify("error", "Ошибка", f"Не удалось сохранить сеть: {error}")
+            return False
+        self.notify("info", "Успех", f"Сеть сохранена в '{path}'")
+        return True
+    
+    def open_network_file(self, path=None):
+        """Загрузка сети и фреймов из двоичного файла .snet"""
+        if path is None:
+            path = filedialog.askopenfilename(
+                title="Открыть сеть",
+                filetypes=[("Семантическая сеть", "*.snet"), ("Все файлы", "*.*")]
+            )
+            if not path:
+                return
+        self.discard_layout_worker()
+        try:
+            frames = load_network(path, self.graph)
+            self.frame_store.load(frames)
+        except (OSError, ValueError) as error:
+            self.notify("error", "Ошибка", f"Не удалось открыть сеть: {error}")
+            return False
+        
+        self.derived_frames.rebuild()
+        self.request_refresh("frames_list", "comboboxes", "network_full", "frames")
+        return True
     
     def auto_layout_frames(self):
         """Автоматическое размещение фреймов"""
         if not self.frames:
-            messagebox.showinfo("Информация", "Нет фреймов для размещения")
+            self.notify("info", "Информация", "Нет фреймов для размещения")
             return
         
         # Размещаем фреймы в виде сетки
@@ -766,212 +1267,272 @@ class SemanticNetworkEditor:
         col_spacing = self.frames_canvas_width / (cols + 1)
         row_spacing = self.frames_canvas_height / (rows + 1)
         
-        for i, (frame_name, frame_data) in enumerate(self.frames.items()):
+        for i, frame_name in enumerate(list(self.frames.keys())):
             col = i % cols
             row = i // cols
             
-            frame_data["x"] = col_spacing * (col + 1)
-            frame_data["y"] = row_spacing * (row + 1)
+            self.frame_store.move_frame(frame_name, col_spacing * (col + 1), row_spacing * (row + 1))
         
-        self.draw_frames()
-        messagebox.showinfo("Успех", "Авторазмещение фреймов выполнено")
+        self.request_refresh("frames")
+        self.notify("info", "Успех", "Авторазмещение фреймов выполнено")
     
-    def apply_force_directed_layout_network(self, iterations=50):
+    def apply_hierarchical_layout_network(self):
+        """Расчет иерархического размещения без перерисовки"""
+        self.discard_layout_worker()
+        with self.profiler.span("layout.hierarchy", nodes=len(self.nodes)):
+            names, xs, ys = layout.hierarchical_positions(self.graph, self.network_canvas_width)
+            self.graph.set_positions(names, xs, ys)
+    
+    def apply_force_directed_layout_network(self, iterations=50, mode=None):
         """Применяет алгоритм force-directed для улучшения размещения узлов в сети"""
-        for _ in range(iterations):
-            for node1_name, node1_data in self.nodes.items():
-                fx, fy = 0, 0
-                
-                # Отталкивание от других узлов
-                for node2_name, node2_data in self.nodes.items():
-                    if node1_name != node2_name:
-                        dx = node1_data["x"] - node2_data["x"]
-                        dy = node1_data["y"] - node2_data["y"]
-                        distance = max(math.sqrt(dx*dx + dy*dy), 0.1)
-                        
-                        # Сила отталкивания
-                        force = 1000 / (distance * distance)
-                        fx += force * dx / distance
-                        fy += force * dy / distance
-                
-                # Притяжение к связанным узлам
-                for relation in self.relations:
-                    if relation["from"] == node1_name:
-                        other_node = self.nodes[relation["to"]]
-                    elif relation["to"] == node1_name:
-                        other_node = self.nodes[relation["from"]]
-                    else:
-                        continue
-                    
-                    dx = other_node["x"] - node1_data["x"]
-                    dy = other_node["y"] - node1_data["y"]
-                    distance = max(math.sqrt(dx*dx + dy*dy), 0.1)
-
-                    # Сила притяжения
-                    force = distance * 0.1
-                    fx += force * dx / distance
-                    fy += force * dy / distance
-
-                # Ограничиваем максимальное перемещение
-                max_move = 10
-                move_x = min(max(fx * 0.1, -max_move), max_move)
-                move_y = min(max(fy * 0.1, -max_move), max_move)
-                
-                # Обновляем позицию с учетом границ canvas
-                new_x = max(self.node_radius, min(self.network_canvas_width - self.node_radius, node1_data["x"] + move_x))
-                new_y = max(self.node_radius, min(self.network_canvas_height - self.node_radius, node1_data["y"] + move_y))
-                
-                node1_data["x"] = new_x
-                node1_data["y"] = new_y
+        if mode is None:
+            mode = self.force_layout_mode()
+        
+        with self.profiler.span("layout", nodes=len(self.nodes), iterations=iterations):
+            names, xs, ys, adjacency = layout.build_snapshot(self.graph)
+            layout.force_directed_layout(xs, ys, adjacency, self.layout_bounds_network(),
+                                         iterations=iterations, mode=mode)
+            
+            self.graph.set_positions(names, xs, ys)
+    
+    def run_network_query(self):
+        """Выполнение запроса по тройкам с подсветкой найденных узлов"""
+        try:
+            query = TripleQuery.parse(self.graph, self.query_text.get())
+        except QueryError as error:
+            self.notify("error", "Ошибка", str(error))
+            return
+        
+        self.query_results.delete(0, tk.END)
+        found_nodes = set()
+        solution_count = 0
+        # Решения выдаются генератором - берем только первые QUERY_RESULT_LIMIT
+        for solution in itertools.islice(query.results(), self.QUERY_RESULT_LIMIT):
+            solution_count += 1
+            if solution:
+                self.query_results.insert(tk.END, ", ".join(f"{var} = {value}" for var, value in solution.items()))
+                found_nodes.update(value for value in solution.values() if value in self.nodes)
+        
+        if not solution_count:
+            self.query_results.insert(tk.END, "Ничего не найдено")
+        elif not query.variables:
+            # Запрос без переменных - проверка наличия троек в сети
+            self.query_results.insert(tk.END, f"Истина (решений: {solution_count})")
+        self.query_highlight = found_nodes
+        self.update_network_highlight()
+        self.draw_network()
+    
+    def clear_network_query(self):
+        """Сброс результатов запроса и подсветки"""
+        self.query_results.delete(0, tk.END)
+        self.query_highlight = set()
+        self.update_network_highlight()
+        self.draw_network()
+    
+    def search_hit_text(self, hit):
+        """Строка списка для найденного документа"""
+        kind = hit[0]
+        if kind == "node":
+            return f"узел: {hit[1]}"
+        if kind == "frame":
+            return f"фрейм: {hit[1]}"
+        if kind == "slot":
+            return f"слот: {hit[1]} / {hit[2]}: {self.frames[hit[1]]['slots'][hit[2]]}"
+        return f"тип связи: {hit[1]}"
+    
+    def update_network_highlight(self):
+        """Подсветка узлов сети: результаты запроса и поиска вместе"""
+        self.network_renderer.set_highlight(self.query_highlight | self.search_highlight)
+    
+    def on_search_key(self):
+        """Поиск при вводе; клавиши, не изменившие текст (стрелки, Shift), пропускаются"""
+        if self.search_text.get() != self.search_query:
+            self.run_search()
+    
+    def run_search(self, text=None):
+        """Поиск по строке поиска с подсветкой найденных узлов и фреймов"""
+        if text is None:
+            text = self.search_text.get()
+        self.search_query = text
+        self.search_hits = self.search.search(text, self.SEARCH_RESULT_LIMIT) if text.strip() else []
+        
+        self.search_results.delete(0, tk.END)
+        for hit in self.search_hits:
+            self.search_results.insert(tk.END, self.search_hit_text(hit))
+        if text.strip() and not self.search_hits:
+            self.search_results.insert(tk.END, "Ничего не найдено")
+        
+        self.search_highlight = {hit[1] for hit in self.search_hits if hit[0] == "node"}
+        self.update_network_highlight()
+        self.frames_renderer.set_highlight(hit[1] for hit in self.search_hits if hit[0] in ("frame", "slot"))
+        self.draw_network()
+        self.draw_frames()
+        return self.search_hits
+    
+    def show_search_hit(self, index=None):
+        """Переход к найденному элементу: выбор вкладки и центрирование canvas на нем"""
+        if index is None:
+            selection = self.search_results.curselection()
+            if not selection:
+                return
+            index = selection[0]
+        if index >= len(self.search_hits):
+            return
+        
+        hit = self.search_hits[index]
+        kind, name = hit[0], hit[1]
+        # Найденное могло быть удалено после поиска - обновляем список
+        if (kind == "node" and name not in self.nodes) or (kind in ("frame", "slot") and name not in self.frames):
+            self.run_search()
+            return
+        if kind in ("frame", "slot"):
+            self.notebook.select(self.frames_tab)
+            # Выбираем фрейм в списке и показываем его слоты
+            frame_names = list(self.frames)
+            self.frames_listbox.selection_clear(0, tk.END)
+            self.frames_listbox.selection_set(frame_names.index(name))
+            self.frames_listbox.see(frame_names.index(name))
+            self.show_frame()
+            frame_data = self.frames[name]
+            self.center_view(self.frames_canvas, *self.frames_renderer.to_canvas(frame_data["x"], frame_data["y"]))
+            self.schedule_frames_refresh()
+            return
+        
+        if kind == "relation_type":
+            # Для типа связи подсвечиваются концы всех связей этого типа
+            relations = self.graph.relations_of_type(name)
+            self.search_highlight = set(
+                itertools.chain.from_iterable((relation["from"], relation["to"]) for relation in relations))
+            self.update_network_highlight()
+            self.draw_network()
+            if not relations:
+                return
+            name = relations[0]["from"]
+        self.notebook.select(self.network_tab)
+        self.center_view(self.network_canvas, *self.network_renderer.to_canvas(*self.graph.position(name)))
+        self.schedule_network_refresh()
+    
+    def center_view(self, canvas, x, y):
+        """Прокрутка canvas так, чтобы точка (x, y) оказалась в центре видимой области"""
+        region = canvas.cget("scrollregion")
+        if not region:
+            return
+        x1, y1, x2, y2 = (float(value) for value in str(region).split())
+        if x2 > x1:
+            canvas.xview_moveto(max(0.0, (x - canvas.winfo_width() / 2 - x1) / (x2 - x1)))
+        if y2 > y1:
+            canvas.yview_moveto(max(0.0, (y - canvas.winfo_height() / 2 - y1) / (y2 - y1)))
+    
+    def clear_search(self):
+        """Сброс строки поиска, списка найденного и подсветки"""
+        self.search_text.delete(0, tk.END)
+        self.run_search("")
     
     def clear_network(self):
         """Очистка сети"""
-        if messagebox.askyesno("Подтверждение", "Вы уверены, что хотите очистить всю сеть?"):
-            self.nodes.clear()
-            self.relations.clear()
-            self.update_comboboxes()
-            self.draw_network()
-            messagebox.showinfo("Успех", "Сеть очищена")
+        if not self.confirm("Подтверждение", "Вы уверены, что хотите очистить всю сеть?"):
+            return False
+        self.graph.clear()
+        self.request_refresh("comboboxes", "network")
+        self.notify("info", "Успех", "Сеть очищена")
+        return True
     
     def update_comboboxes(self):
-        """Обновление значений в комбобоксах"""
-        nodes_list = list(self.nodes.keys())
-        self.relation_from['values'] = nodes_list
-        self.relation_to['values'] = nodes_list
+        """Обновление значений в комбобоксах (только подсказки к уже введенному тексту)"""
+        with self.profiler.span("update_comboboxes", nodes=len(self.node_completion)):
+            self.complete_combobox(self.relation_from, self.node_completion)
+            self.complete_combobox(self.relation_to, self.node_completion)
         
         # Обновляем информацию о сети и фреймах
         self.network_info_label.config(text=f"Узлов: {len(self.nodes)}, Связей: {len(self.relations)}")
         self.frames_info_label.config(text=f"Фреймов: {len(self.frames)}")
     
-    def draw_network(self):
-        """Отрисовка семантической сети"""
-        self.network_canvas.delete("all")
-
-        # Рисуем связи
-        for relation in self.relations:
-            from_node = self.nodes[relation["from"]]
-            to_node = self.nodes[relation["to"]]
-
-            # Цвета для разных типов связей
-            color = "black"
-            if relation["type"] == "является":
-                color = "blue"
-            elif relation["type"] == "имеет":
-                color = "green"
-            elif relation["type"] == "умеет":
-                color = "red"
-            elif relation["type"] == "имеет цвет":
-                color = "black"
-
-            # Рисуем линию связи
-            self.network_canvas.create_line(
-                from_node["x"], from_node["y"], 
-                to_node["x"], to_node["y"],
-                fill=color, width=2, arrow=tk.LAST, smooth=True
-            )
-            
-            # Добавляем текст типа связи
-            mid_x = (from_node["x"] + to_node["x"]) / 2
-            mid_y = (from_node["y"] + to_node["y"]) / 2
-            
-            # Фон для текста для лучшей читаемости
-            text_bg = self.network_canvas.create_rectangle(
-                mid_x-30, mid_y-10, mid_x+30, mid_y+10, 
-                fill="white", outline="white"
-            )
-            self.network_canvas.tag_lower(text_bg)  # Перемещаем фон под текст
-            
-            self.network_canvas.create_text(
-                mid_x, mid_y, 
-                text=relation["type"], 
-                fill=color, 
-                font=("Arial", 9, "bold")
-            )
-        
-        # Рисуем узлы
-        for name, node in self.nodes.items():
-            # Цвета для разных типов узлов
-            color = "lightblue"
-            if node["type"] == "объект":
-                color = "lightgreen"
-            elif node["type"] == "свойство":
-                color = "lightyellow"
-            
-            # Рисуем узел
-            node_id = self.network_canvas.create_oval(
-                node["x"] - self.node_radius, node["y"] - 20,
-                node["x"] + self.node_radius, node["y"] + 20,
-                fill=color, outline="black", width=2
-            )
-            
-            # Добавляем текст имени узла
-            self.network_canvas.create_text(
-                node["x"], node["y"], 
-                text=name, 
-                font=("Arial", 10, "bold"),
-                width=self.node_radius * 1.8  # Ограничение ширины текста
-            )
-        
-        # Обновляем область прокрутки
-        self.network_canvas.configure(scrollregion=self.network_canvas.bbox("all"))
+    def draw_network(self, full=False):
+        """Отрисовка семантической сети (только изменившиеся элементы)"""
+        renderer = self.network_renderer
+        renderer.set_culling(self.network_culling.get() or len(self.nodes) > self.CULLING_AUTO_LIMIT)
+        if full:
+            renderer.invalidate()
+        
+        with self.profiler.span("draw_network", full=full, culling=renderer.culling) as span:
+            if not renderer.culling:
+                renderer.render()
+                # Обновляем область прокрутки
+                with self.profiler.span("draw_network.scrollregion"):
+                    self.network_canvas.configure(scrollregion=self.network_canvas.bbox("all"))
+            else:
+                # Отрисовываем только видимую часть; область прокрутки - по границам всей сети
+                canvas = self.network_canvas
+                renderer.set_viewport(canvas.canvasx(0), canvas.canvasy(0),
+                                      canvas.canvasx(canvas.winfo_width()), canvas.canvasy(canvas.winfo_height()))
+                renderer.render()
+                with self.profiler.span("draw_network.scrollregion"):
+                    bounds = renderer.world_bounds()
+                    if bounds is not None:
+                        canvas.configure(scrollregion=bounds)
+            span["nodes"] = len(renderer.node_items)
+            span["edges"] = len(renderer.edge_items)
     
-    def draw_frames(self):
-        """Отрисовка фреймов"""
-        self.frames_canvas.delete("all")
-
-        # Рисуем фреймы
-        for frame_name, frame_data in self.frames.items():
-            # Определяем цвет фрейма в зависимости от типа
-            frame_color = "#ffcc99"  # фрейм класса
-            if frame_data["type"] == "фрейм объекта":
-                frame_color = "#ccffcc"
-            
-            # Вычисляем размеры фрейма на основе количества слотов
-            slot_count = len(frame_data["slots"])
-            frame_width = 200
-            frame_height = 80 + slot_count * 20
+    def draw_frames(self, full=False):
+        """Отрисовка фреймов (только изменившиеся фреймы)"""
+        renderer = self.frames_renderer
+        renderer.set_culling(self.frames_culling.get() or len(self.frames) > self.FRAMES_CULLING_AUTO_LIMIT)
+        renderer.set_collapsed_by_default(self.frames_collapsed.get()
+                                          or len(self.frames) > self.FRAMES_COLLAPSE_AUTO_LIMIT)
+        if full:
+            renderer.invalidate()
+        
+        with self.profiler.span("draw_frames", full=full, culling=renderer.culling) as span:
+            canvas = self.frames_canvas
+            if renderer.culling:
+                renderer.set_viewport(canvas.canvasx(0), canvas.canvasy(0),
+                                      canvas.canvasx(canvas.winfo_width()), canvas.canvasy(canvas.winfo_height()))
+            renderer.render()
             
-            # Рисуем прямоугольник фрейма
-            x1 = frame_data["x"] - frame_width // 2
-            y1 = frame_data["y"] - frame_height // 2
-            x2 = frame_data["x"] + frame_width // 2
-            y2 = frame_data["y"] + frame_height // 2
-            
-            # Основной прямоугольник
-            self.frames_canvas.create_rectangle(
-                x1, y1, x2, y2,
-                fill=frame_color, outline="black", width=2
-            )
-            
-            # Заголовок фрейма
-            self.frames_canvas.create_rectangle(
-                x1, y1, x2, y1 + 30,
-                fill="#e6e6e6", outline="black", width=1
-            )
-            
-            # Текст заголовка
-            self.frames_canvas.create_text(
-                frame_data["x"], y1 + 15,
-                text=frame_name,
-                font=("Arial", 10, "bold"),
-                width=frame_width - 10
+            # Обновляем область прокрутки (при отсечении - по границам всех фреймов)
+            with self.profiler.span("draw_frames.scrollregion"):
+                bounds = renderer.world_bounds() if renderer.culling else canvas.bbox("all")
+                if bounds is not None:
+                    canvas.configure(scrollregion=bounds)
+            span["frames"] = len(renderer.frame_items)
+    
+    def toggle_profiling(self):
+        """Включение и выключение замеров по флажку в информационной панели"""
+        self.profiler.enabled = self.profiling_enabled.get()
+        self.update_profile_stats()
+    
+    def update_profile_stats(self):
+        """Показ скользящей статистики замеров (периодически, пока замеры включены)"""
+        if self.profile_refresh_id is not None:
+            self.root.after_cancel(self.profile_refresh_id)
+            self.profile_refresh_id = None
+        if not self.profiler.enabled:
+            self.profile_label.config(text="")
+            return
+        self.profile_label.config(text=self.profiler.format_stats() or "Нет замеров")
+        self.profile_refresh_id = self.root.after(self.PROFILE_REFRESH_MS, self.update_profile_stats)
+    
+    def reset_profiling(self):
+        """Удаление накопленных замеров"""
+        self.profiler.clear()
+        self.profile_label.config(text="Нет замеров" if self.profiler.enabled else "")
+    
+    def save_profile_trace(self, path=None):
+        """Сохранение замеров в формате Chrome trace event"""
+        if path is None:
+            path = filedialog.asksaveasfilename(
+                title="Сохранить трассу", defaultextension=".json",
+                filetypes=[("Chrome trace", "*.json"), ("Все файлы", "*.*")]
             )
-            
-            # Слоты фрейма
-            y_offset = y1 + 45
-            for i, (slot_name, slot_value) in enumerate(frame_data["slots"].items()):
-                slot_text = f"{slot_name}: {slot_value}"
-                self.frames_canvas.create_text(
-                    x1 + 10, y_offset,
-                    text=slot_text,
-                    font=("Arial", 8),
-                    anchor=tk.W,
-                    width=frame_width - 20
-                )
-                y_offset += 20
-        
-        # Обновляем область прокрутки
-        self.frames_canvas.configure(scrollregion=self.frames_canvas.bbox("all"))
+            if not path:
+                return
+        try:
+            self.profiler.write_trace(path)
+        except OSError as error:
+            self.notify("error", "Ошибка", f"Не удалось сохранить трассу: {error}")
+            return False
+        self.notify("info", "Успех", f"Трасса сохранена в '{path}'")
+        return True
 
 if __name__ == "__main__":
     root = tk.Tk()
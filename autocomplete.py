@@ -0,0 +1,55 @@
+from bisect import bisect_left, insort
+
+
+def normalize(text):
+    """Приведение строки к виду для сравнения без учета регистра и ё/е"""
+    return text.casefold().replace("ё", "е")
+
+
+class PrefixIndex:
+    """Отсортированный индекс имен для подсказок по началу имени
+
+    Хранит пары (нормализованное имя, имя) в отсортированном списке;
+    добавление и удаление - двоичный поиск и вставка, поиск первых
+    limit имен с заданным началом - O(log n + limit).
+    """
+
+    def __init__(self, names=()):
+        self._entries = []
+        self.rebuild(names)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def rebuild(self, names):
+        """Построение индекса заново"""
+        self._entries = sorted((normalize(name), name) for name in names)
+
+    def clear(self):
+        """Удаление всех имен"""
+        self._entries = []
+
+    def add(self, name):
+        """Добавление имени"""
+        insort(self._entries, (normalize(name), name))
+
+    def discard(self, name):
+        """Удаление имени, если оно есть в индексе"""
+        entry = (normalize(name), name)
+        position = bisect_left(self._entries, entry)
+        if position < len(self._entries) and self._entries[position] == entry:
+            del self._entries[position]
+
+    def complete(self, prefix, limit=20):
+        """Первые limit имен (по алфавиту), начинающихся с prefix"""
+        prefix = normalize(prefix.strip())
+        entries = self._entries
+        position = bisect_left(entries, (prefix,))
+        result = []
+        while position < len(entries) and len(result) < limit:
+            key, name = entries[position]
+            if not key.startswith(prefix):
+                break
+            result.append(name)
+            position += 1
+        return result
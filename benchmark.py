@@ -0,0 +1,403 @@
+import argparse
+import gc
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import layout
+from frame_model import FrameStore
+from graph_model import SemanticGraph
+from network_renderer import NetworkRenderer
+from search_index import KnowledgeSearch
+from spatial_index import GridIndex, find_free_position
+from svg_export import SvgCanvas
+
+# Параметры как в редакторе
+NODE_RADIUS = 60
+CANVAS_WIDTH = 1200
+CANVAS_HEIGHT = 700
+DEFAULT_SIZES = (100, 1000, 10000)
+# Порог замедления, после которого сравнение считается регрессией
+DEFAULT_THRESHOLD = 1.25
+# Результаты быстрее этого времени (с) не сравниваются - слишком шумные
+MIN_COMPARED_SECONDS = 0.01
+# Скрытое окно Tk для замеров на настоящем холсте (False - дисплея нет)
+_tk_root = None
+
+
+def _random_positions(graph, names, node_types, rng, width, height):
+    """Добавление узлов со случайными координатами"""
+    for name, node_type in zip(names, node_types):
+        graph.add_node(name, node_type, rng.uniform(0, width), rng.uniform(0, height))
+
+
+def taxonomy_graph(size, seed=0, branching=4):
+    """Дерево классов "является" с объектами-листьями и свойствами у классов"""
+    rng = random.Random(seed)
+    graph = SemanticGraph()
+    side = max(CANVAS_WIDTH, (size ** 0.5) * NODE_RADIUS * 2.5)
+    class_count = max(1, size // 3)
+    names = [f"класс {i}" for i in range(class_count)]
+    _random_positions(graph, names, ["класс"] * class_count, rng, side, side)
+    for i in range(1, class_count):
+        graph.add_relation(names[i], names[(i - 1) // branching], "является")
+    for i in range(size - class_count):
+        if i % 4 == 0:
+            name = f"свойство {i}"
+            graph.add_node(name, "свойство", rng.uniform(0, side), rng.uniform(0, side))
+            graph.add_relation(rng.choice(names), name, rng.choice(["имеет", "умеет"]))
+        else:
+            name = f"объект {i}"
+            graph.add_node(name, "объект", rng.uniform(0, side), rng.uniform(0, side))
+            graph.add_relation(name, rng.choice(names), "является")
+    return graph
+
+
+def scale_free_graph(size, seed=0, links=2):
+    """Сеть с предпочтительным присоединением (модель Барабаши - Альберт)"""
+    rng = random.Random(seed)
+    graph = SemanticGraph()
+    side = max(CANVAS_WIDTH, (size ** 0.5) * NODE_RADIUS * 2.5)
+    relation_types = ["является", "имеет", "умеет", "имеет цвет"]
+    # Каждый конец связи попадает в список - выбор из него пропорционален степени
+    endpoints = []
+    for i in range(size):
+        name = f"узел {i}"
+        graph.add_node(name, rng.choice(["класс", "объект", "свойство"]), rng.uniform(0, side), rng.uniform(0, side))
+        targets = set()
+        while endpoints and len(targets) < min(links, i):
+            targets.add(rng.choice(endpoints))
+        for target in targets:
+            graph.add_relation(name, target, rng.choice(relation_types))
+            endpoints.append(target)
+            endpoints.append(name)
+        if not targets:
+            endpoints.append(name)
+    return graph
+
+
+def dense_property_graph(size, seed=0, properties_per_object=8):
+    """Объекты с множеством общих свойств: плотная двудольная сеть"""
+    rng = random.Random(seed)
+    graph = SemanticGraph()
+    side = max(CANVAS_WIDTH, (size ** 0.5) * NODE_RADIUS * 2.5)
+    property_count = max(properties_per_object, size // 10)
+    properties = [f"свойство {i}" for i in range(property_count)]
+    _random_positions(graph, properties, ["свойство"] * property_count, rng, side, side)
+    for i in range(size - property_count):
+        name = f"объект {i}"
+        graph.add_node(name, "объект", rng.uniform(0, side), rng.uniform(0, side))
+        for target in rng.sample(properties, properties_per_object):
+            graph.add_relation(name, target, rng.choice(["имеет", "умеет", "имеет цвет"]))
+    return graph
+
+
+GENERATORS = {
+    "taxonomy": taxonomy_graph,
+    "scale_free": scale_free_graph,
+    "dense_property": dense_property_graph,
+}
+
+
+def bench_layout(graph, rng):
+    """Одна итерация силового размещения в режиме, выбранном автоматически"""
+    names, xs, ys, adjacency = layout.build_snapshot(graph)
+    bounds = (NODE_RADIUS, NODE_RADIUS, CANVAS_WIDTH - NODE_RADIUS, CANVAS_HEIGHT - NODE_RADIUS)
+    start = time.perf_counter()
+    layout.force_directed_layout(xs, ys, adjacency, bounds, iterations=1)
+    return time.perf_counter() - start
+
+
+def bench_hierarchy(graph, rng):
+    """Иерархическое размещение всей сети"""
+    start = time.perf_counter()
+    layout.hierarchical_positions(graph, CANVAS_WIDTH)
+    return time.perf_counter() - start
+
+
+def bench_placement(graph, rng, count=100):
+    """Поиск свободного места для count новых узлов (как при добавлении узла)"""
+    index = GridIndex(cell_size=NODE_RADIUS * 2.2)
+    for name in graph.nodes:
+        index.insert(name, *graph.position(name))
+    bounds = (NODE_RADIUS, NODE_RADIUS, CANVAS_WIDTH - NODE_RADIUS, CANVAS_HEIGHT - NODE_RADIUS)
+    start = time.perf_counter()
+    for i in range(count):
+        x, y = find_free_position(index, CANVAS_WIDTH // 2, CANVAS_HEIGHT // 2, min_distance=NODE_RADIUS * 2.2,
+                                  bounds=bounds, spiral_step=NODE_RADIUS)
+        index.insert(("новый", i), x, y)
+    return time.perf_counter() - start
+
+
+def bench_duplicate_check(graph, rng, count=10000):
+    """Проверка наличия связи перед добавлением (половина проверок - существующие связи)"""
+    names = list(graph.nodes)
+    existing = list(graph.relations)
+    probes = [rng.choice(existing) if i % 2 and existing else
+              (rng.choice(names), rng.choice(names), "имеет") for i in range(count)]
+    start = time.perf_counter()
+    for from_node, to_node, relation_type in probes:
+        graph.has_relation(from_node, to_node, relation_type)
+    return time.perf_counter() - start
+
+
+def bench_search(graph, rng, count=100):
+    """Поиск по началу имени для count случайных узлов (как при вводе в строку поиска)"""
+    frame_store = FrameStore()
+    search = KnowledgeSearch(graph, frame_store)
+    try:
+        queries = [name[:3] for name in rng.sample(list(graph.nodes), min(count, len(graph.nodes)))]
+        start = time.perf_counter()
+        for query in queries:
+            search.search(query, 200)
+        return time.perf_counter() - start
+    finally:
+        graph.unsubscribe(search.on_graph_event)
+
+
+def tk_canvas():
+    """Холст Tk в скрытом окне или None, если Tk или дисплей недоступны (окно одно на процесс)"""
+    global _tk_root
+    try:
+        import tkinter
+    except ImportError:
+        return None
+    if _tk_root is None:
+        try:
+            _tk_root = tkinter.Tk()
+            _tk_root.withdraw()
+        except tkinter.TclError:
+            _tk_root = False
+    if not _tk_root:
+        return None
+    return tkinter.Canvas(_tk_root, width=CANVAS_WIDTH, height=CANVAS_HEIGHT)
+
+
+def _render_full(graph, canvas):
+    """Время полной отрисовки сети на холсте"""
+    renderer = NetworkRenderer(canvas, graph, NODE_RADIUS)
+    try:
+        start = time.perf_counter()
+        renderer.render()
+        return time.perf_counter() - start
+    finally:
+        graph.unsubscribe(renderer.on_graph_event)
+
+
+def _render_incremental(graph, rng, canvas, fraction):
+    """Время перерисовки после перемещения доли fraction узлов"""
+    renderer = NetworkRenderer(canvas, graph, NODE_RADIUS)
+    try:
+        renderer.render()
+        names = rng.sample(list(graph.nodes), max(1, int(len(graph.nodes) * fraction)))
+        for name in names:
+            x, y = graph.position(name)
+            graph.move_node(name, x + 5, y + 5)
+        start = time.perf_counter()
+        renderer.render()
+        return time.perf_counter() - start
+    finally:
+        graph.unsubscribe(renderer.on_graph_event)
+
+
+def bench_render_full(graph, rng):
+    """Полная отрисовка сети на внеэкранном холсте"""
+    return _render_full(graph, SvgCanvas())
+
+
+def bench_render_incremental(graph, rng, fraction=0.01):
+    """Перерисовка после перемещения 1% узлов"""
+    return _render_incremental(graph, rng, SvgCanvas(), fraction)
+
+
+def bench_render_full_tk(graph, rng):
+    """Полная отрисовка на холсте Tk (None, если дисплея нет)"""
+    canvas = tk_canvas()
+    if canvas is None:
+        return None
+    try:
+        return _render_full(graph, canvas)
+    finally:
+        canvas.destroy()
+
+
+def bench_render_incremental_tk(graph, rng, fraction=0.01):
+    """Перерисовка после перемещения 1% узлов на холсте Tk (None, если дисплея нет)"""
+    canvas = tk_canvas()
+    if canvas is None:
+        return None
+    try:
+        return _render_incremental(graph, rng, canvas, fraction)
+    finally:
+        canvas.destroy()
+
+
+def measure_memory(graph):
+    """Память (байт) на копию сети: прежние словари на узел и связь и столбцовая модель"""
+    # Имена и типы создаются заново, как при импорте из файла
+    nodes = [(name + "", graph.node_type(name) + "", *graph.position(name)) for name in graph.nodes]
+    relations = [(from_node + "", relation_type + "", to_node + "")
+                 for from_node, to_node, relation_type in graph.relations]
+
+    def dict_model():
+        # Представление до перехода на столбцы: словарь на узел и на связь
+        model = {"nodes": {}, "relations": {}, "outgoing": {}, "incoming": {}, "by_type": {}}
+        for name, node_type, x, y in nodes:
+            model["nodes"][name] = {"type": node_type, "x": x, "y": y}
+            model["outgoing"][name] = {}
+            model["incoming"][name] = {}
+        for from_node, relation_type, to_node in relations:
+            key = (from_node, to_node, relation_type)
+            relation = {"from": from_node, "to": to_node, "type": relation_type}
+            model["relations"][key] = relation
+            model["outgoing"][from_node][key] = relation
+            model["incoming"][to_node][key] = relation
+            model["by_type"].setdefault(relation_type, {})[key] = relation
+        return model
+
+    def graph_model():
+        copy = SemanticGraph()
+        for name, node_type, x, y in nodes:
+            copy.add_node(name, node_type, x, y)
+        for from_node, relation_type, to_node in relations:
+            copy.add_relation(from_node, to_node, relation_type)
+        return copy
+
+    result = {}
+    for label, build in (("dict", dict_model), ("columns", graph_model)):
+        gc.collect()
+        tracemalloc.start()
+        model = build()
+        result[label] = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del model
+    return result
+
+
+BENCHMARKS = {
+    "layout_iteration": bench_layout,
+    "hierarchy_layout": bench_hierarchy,
+    "find_free_position": bench_placement,
+    "duplicate_check": bench_duplicate_check,
+    "full_text_search": bench_search,
+    "render_full": bench_render_full,
+    "render_incremental": bench_render_incremental,
+    "render_full_tk": bench_render_full_tk,
+    "render_incremental_tk": bench_render_incremental_tk,
+}
+
+
+def _revision():
+    """Текущая ревизия git (если доступна)"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, generators=None, benchmarks=None, repeat=3, seed=0, log=None,
+                   memory=False):
+    """Прогон замеров; для каждого - минимальное время из repeat повторов
+
+    При memory=True для каждой сети дополнительно замеряется память модели
+    (запись "model_memory" с полем "bytes" вместо "seconds").
+    """
+    results = []
+    for generator_name in generators or GENERATORS:
+        for size in sizes:
+            graph = GENERATORS[generator_name](size, seed=seed)
+            if memory:
+                usage = measure_memory(graph)
+                results.append({"generator": generator_name, "size": size, "benchmark": "model_memory",
+                                "nodes": len(graph.nodes), "relations": len(graph.relations), "bytes": usage})
+                if log is not None:
+                    log(f"{generator_name:>15} {size:>7} {'model_memory':>20} "
+                        f"словари {usage['dict'] / 2**20:.1f} МБ, столбцы {usage['columns'] / 2**20:.1f} МБ, "
+                        f"экономия {100 * (1 - usage['columns'] / usage['dict']):.0f}%")
+            for benchmark_name in benchmarks or BENCHMARKS:
+                timings = [BENCHMARKS[benchmark_name](graph, random.Random(seed + run))
+                           for run in range(repeat)]
+                if None in timings:
+                    # Замер недоступен в этом окружении (например, холст Tk без дисплея)
+                    if log is not None:
+                        log(f"{generator_name:>15} {size:>7} {benchmark_name:>20} пропущен")
+                    continue
+                result = {"generator": generator_name, "size": size, "benchmark": benchmark_name,
+                          "nodes": len(graph.nodes), "relations": len(graph.relations),
+                          "seconds": min(timings)}
+                results.append(result)
+                if log is not None:
+                    log(f"{generator_name:>15} {size:>7} {benchmark_name:>20} {result['seconds']:.6f} с")
+    return {
+        "revision": _revision(),
+        "python": platform.python_version(),
+        "layout_modes": layout.available_modes(),
+        "seed": seed,
+        "results": results,
+    }
+
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Сравнение двух прогонов: список (ключ, было, стало, отношение) и регрессии"""
+    def keyed(report):
+        return {(r["generator"], r["size"], r["benchmark"]): r["seconds"]
+                for r in report["results"] if "seconds" in r}
+
+    before = keyed(baseline)
+    after = keyed(current)
+    rows = []
+    regressions = []
+    for key in sorted(before.keys() & after.keys()):
+        ratio = after[key] / before[key] if before[key] else float("inf")
+        rows.append((key, before[key], after[key], ratio))
+        if ratio > threshold and max(before[key], after[key]) >= MIN_COMPARED_SECONDS:
+            regressions.append(key)
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замеры времени основных операций редактора")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="размеры сетей")
+    parser.add_argument("--generators", nargs="+", choices=list(GENERATORS), help="генераторы сетей")
+    parser.add_argument("--benchmarks", nargs="+", choices=list(BENCHMARKS), help="замеры")
+    parser.add_argument("--memory", action="store_true", help="замерить и память модели сети")
+    parser.add_argument("--repeat", type=int, default=3, help="число повторов каждого замера")
+    parser.add_argument("--seed", type=int, default=0, help="зерно генераторов")
+    parser.add_argument("-o", "--output", help="JSON-файл для результатов (по умолчанию - stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON-файл прошлого прогона для сравнения")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="допустимое отношение нового времени к старому")
+    args = parser.parse_args(argv)
+
+    def log(message):
+        print(message, file=sys.stderr)
+
+    report = run_benchmarks(args.sizes, args.generators, args.benchmarks, args.repeat, args.seed, log,
+                            args.memory)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as stream:
+            stream.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as stream:
+            baseline = json.load(stream)
+        rows, regressions = compare_results(baseline, report, args.threshold)
+        for (generator_name, size, benchmark_name), before, after, ratio in rows:
+            mark = "  РЕГРЕССИЯ" if (generator_name, size, benchmark_name) in regressions else ""
+            log(f"{generator_name:>15} {size:>7} {benchmark_name:>20} {before:.6f} -> {after:.6f} ({ratio:.2f}x){mark}")
+        if regressions:
+            log(f"Регрессий: {len(regressions)} (порог {args.threshold}x)")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
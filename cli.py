@@ -0,0 +1,100 @@
+import argparse
+import os
+import sys
+
+import layout
+from example_data import load_example
+from frame_model import FrameStore
+from graph_model import SemanticGraph
+from network_import import import_network
+from network_storage import load_network
+from svg_export import render_frames_svg, render_network_svg
+
+# Размеры области размещения и радиус узла - как в редакторе
+DEFAULT_WIDTH = 1200
+DEFAULT_HEIGHT = 700
+DEFAULT_NODE_RADIUS = 60
+LAYOUT_MODES = {
+    "auto": None,
+    "exact": layout.MODE_EXACT,
+    "barnes_hut": layout.MODE_BARNES_HUT,
+    "numpy": layout.MODE_VECTORIZED,
+    "grid": layout.MODE_GRID,
+    "hierarchy": layout.MODE_HIERARCHY,
+}
+
+
+def build_parser():
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(
+        description="Построение изображения семантической сети без графического интерфейса")
+    parser.add_argument("input", nargs="?", default="example",
+                        help="файл сети (.snet, .csv, .tsv, .jsonl) или example - встроенный пример")
+    parser.add_argument("-o", "--output", default="network.svg", help="SVG-файл сети")
+    parser.add_argument("--frames", metavar="PATH", help="дополнительно записать SVG-файл фреймов")
+    parser.add_argument("--no-layout", action="store_true", help="не выполнять авторазмещение")
+    parser.add_argument("--mode", choices=list(LAYOUT_MODES), default="auto", help="алгоритм размещения")
+    parser.add_argument("--iterations", type=int, default=50, help="число итераций размещения")
+    parser.add_argument("--width", type=float, default=DEFAULT_WIDTH, help="ширина области размещения")
+    parser.add_argument("--height", type=float, default=DEFAULT_HEIGHT, help="высота области размещения")
+    parser.add_argument("--node-radius", type=float, default=DEFAULT_NODE_RADIUS, help="радиус узла")
+    return parser
+
+
+def load_input(path, graph, frame_store):
+    """Загрузка сети (и фреймов, если они есть в файле)"""
+    if path == "example":
+        load_example(graph, frame_store)
+        return
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".snet":
+        frame_store.load(load_network(path, graph))
+    else:
+        report = import_network(graph, path)
+        print(report.summary(), file=sys.stderr)
+
+
+def auto_layout(graph, width, height, node_radius, mode=None, iterations=50):
+    """Авторазмещение как в редакторе: расстановка по типам и силовой алгоритм или иерархия"""
+    if mode == layout.MODE_HIERARCHY:
+        graph.set_positions(*layout.hierarchical_positions(graph, width))
+        return
+    graph.set_positions(*layout.layered_positions(graph, width, height))
+    names, xs, ys, adjacency = layout.build_snapshot(graph)
+    bounds = (node_radius, node_radius, width - node_radius, height - node_radius)
+    layout.force_directed_layout(xs, ys, adjacency, bounds, iterations=iterations, mode=mode)
+    graph.set_positions(names, xs, ys)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    mode = LAYOUT_MODES[args.mode]
+    if mode in layout.VECTORIZED_STEPS and mode not in layout.available_modes():
+        print(f"Режим размещения '{args.mode}' недоступен (нет NumPy)", file=sys.stderr)
+        return 2
+
+    graph = SemanticGraph()
+    frame_store = FrameStore()
+    try:
+        load_input(args.input, graph, frame_store)
+    except (OSError, ValueError, UnicodeDecodeError) as error:
+        print(f"Не удалось загрузить сеть: {error}", file=sys.stderr)
+        return 1
+
+    if not args.no_layout and len(graph.nodes):
+        auto_layout(graph, args.width, args.height, args.node_radius, mode, args.iterations)
+
+    try:
+        with open(args.output, "w", encoding="utf-8") as stream:
+            stream.write(render_network_svg(graph, args.node_radius))
+        if args.frames:
+            with open(args.frames, "w", encoding="utf-8") as stream:
+                stream.write(render_frames_svg(frame_store.frames))
+    except OSError as error:
+        print(f"Не удалось записать файл: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
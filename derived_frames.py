@@ -0,0 +1,222 @@
+from contextlib import nullcontext
+
+from inference import IS_A
+
+FRAME_NAME_PREFIX = "Фрейм: "
+CLASS_FRAME = "фрейм класса"
+OBJECT_FRAME = "фрейм объекта"
+# Типы узлов, для которых строятся фреймы (в примере - английские названия)
+CLASS_NODE_TYPES = frozenset(("класс", "class"))
+OBJECT_NODE_TYPES = frozenset(("объект", "object"))
+# Слоты для связей известных типов; для остальных - тип связи с заглавной буквы
+RELATION_SLOTS = {
+    "имеет": "Имеет",
+    "умеет": "Умеет",
+    "имеет цвет": "Цвет",
+}
+EXAMPLES_SLOT = "Примеры"
+# Сколько значений перечислять в слоте (у крупного класса могут быть тысячи примеров)
+VALUE_LIMIT = 20
+
+
+def title(name):
+    """Имя с заглавной буквы (как в слотах фреймов примера)"""
+    return name[:1].upper() + name[1:]
+
+
+def format_values(names):
+    """Значение слота: имена через запятую, не больше VALUE_LIMIT"""
+    text = ", ".join(title(name) for name in names[:VALUE_LIMIT])
+    if len(names) > VALUE_LIMIT:
+        text += f", … (+{len(names) - VALUE_LIMIT})"
+    return text
+
+
+class DerivedFrames:
+    """Фреймы классов и объектов, построенные по связям сети
+
+    Материализованное представление: для каждого узла-класса и
+    узла-объекта в хранилище фреймов поддерживается фрейм со слотами
+    "Класс"/"Объект", "Наследует"/"Тип" (связи "является"), "Примеры"
+    (обратные связи "является") и слотом для каждого типа исходящих
+    связей. При добавлении и удалении связи пересчитывается только
+    затронутый слот одного-двух фреймов; слоты, не построенные по сети
+    (например, "Особенности"), не меняются. Уже существующий фрейм с тем
+    же именем дополняется, а не заменяется. Фрейм удаленного узла
+    удаляется, только если в нем нет слотов пользователя, иначе из него
+    убираются построенные слоты. Новые фреймы ставятся в координаты
+    узла. Изменения представления не записываются в историю (history) -
+    при отмене правки сети фреймы пересчитываются сами.
+    """
+
+    def __init__(self, graph, frame_store, history=None):
+        self.graph = graph
+        self.frame_store = frame_store
+        self.history = history
+        self.enabled = False
+        # узел -> имя его фрейма и обратно; узел -> имена построенных слотов
+        self._frames = {}
+        self._owners = {}
+        self._slots = {}
+        graph.subscribe(self.on_graph_event)
+
+    def enable(self):
+        """Включение представления с построением всех фреймов"""
+        self.enabled = True
+        self.rebuild()
+
+    def disable(self):
+        """Выключение: построенные фреймы остаются обычными фреймами"""
+        self.enabled = False
+        self._frames.clear()
+        self._owners.clear()
+        self._slots.clear()
+
+    def _muted(self):
+        return self.history.muted() if self.history is not None else nullcontext()
+
+    def is_derived(self, frame_name):
+        """Фрейм построен по сети"""
+        return frame_name in self._owners
+
+    def is_derived_slot(self, frame_name, slot_name):
+        """Слот фрейма построен по сети (и меняется только через сеть)"""
+        node = self._owners.get(frame_name)
+        return node is not None and slot_name in self._slots.get(node, ())
+
+    def node_of(self, frame_name):
+        """Узел, по которому построен фрейм, или None"""
+        return self._owners.get(frame_name)
+
+    def _frame_type(self, node):
+        """Тип фрейма для узла или None, если узлу фрейм не нужен"""
+        node_type = self.graph.node_type(node)
+        if node_type in CLASS_NODE_TYPES:
+            return CLASS_FRAME
+        if node_type in OBJECT_NODE_TYPES:
+            return OBJECT_FRAME
+        return None
+
+    def _assign_name(self, node):
+        """Имя фрейма для узла; узлы, различающиеся только регистром, получают разные имена"""
+        frame_name = FRAME_NAME_PREFIX + title(node)
+        if self._owners.get(frame_name, node) != node:
+            frame_name = f"{frame_name} ({node})"
+        self._frames[node] = frame_name
+        self._owners[frame_name] = node
+        return frame_name
+
+    def _forget(self, node):
+        """Удаление фрейма узла из представления (сам фрейм не трогается)"""
+        frame_name = self._frames.pop(node, None)
+        if frame_name is not None:
+            del self._owners[frame_name]
+        self._slots.pop(node, None)
+        return frame_name
+
+    def _slot_name(self, frame_type, relation_type):
+        """Слот фрейма для исходящих связей заданного типа"""
+        if relation_type == IS_A:
+            return "Наследует" if frame_type == CLASS_FRAME else "Тип"
+        return RELATION_SLOTS.get(relation_type) or title(relation_type)
+
+    def _node_slots(self, node, frame_type):
+        """Все слоты фрейма узла, построенные по сети"""
+        slots = {"Класс" if frame_type == CLASS_FRAME else "Объект": title(node)}
+        targets = {}
+        for from_node, to_node, relation_type in self.graph.outgoing(node):
+            targets.setdefault(relation_type, []).append(to_node)
+        for relation_type, names in targets.items():
+            slots[self._slot_name(frame_type, relation_type)] = format_values(names)
+        examples = [from_node for from_node, _, _ in self.graph.incoming(node, IS_A)]
+        if examples:
+            slots[EXAMPLES_SLOT] = format_values(examples)
+        return slots
+
+    def _sync_node(self, node):
+        """Построение или обновление всего фрейма узла"""
+        store = self.frame_store
+        frame_type = self._frame_type(node) if self.graph.has_node(node) else None
+        if frame_type is None:
+            derived = self._slots.get(node, set())
+            frame_name = self._forget(node)
+            if frame_name is not None and frame_name in store:
+                slots = store.frames[frame_name]["slots"]
+                if slots.keys() <= derived:
+                    store.delete_frame(frame_name)
+                else:
+                    # Фрейм со слотами пользователя остается обычным фреймом без построенных слотов
+                    for slot_name in derived & slots.keys():
+                        store.remove_slot(frame_name, slot_name)
+            return
+
+        frame_name = self._frames.get(node) or self._assign_name(node)
+        old_slots = self._slots.get(node, set())
+        slots = self._node_slots(node, frame_type)
+        self._slots[node] = set(slots)
+        frame = store.frames.get(frame_name)
+        if frame is None:
+            store.create_frame(frame_name, frame_type, *self.graph.position(node), slots)
+        elif frame["type"] != frame_type:
+            # Тип фрейма не меняется на месте: пересоздаем с прежними позицией и своими слотами
+            own_slots = {slot_name: value for slot_name, value in frame["slots"].items()
+                         if slot_name not in old_slots and slot_name not in slots}
+            store.delete_frame(frame_name)
+            store.create_frame(frame_name, frame_type, frame["x"], frame["y"], {**slots, **own_slots})
+        else:
+            for slot_name in old_slots - slots.keys():
+                if slot_name in frame["slots"]:
+                    store.remove_slot(frame_name, slot_name)
+            for slot_name, value in slots.items():
+                store.set_slot(frame_name, slot_name, value)
+
+    def _sync_slot(self, node, slot_name, names):
+        """Обновление одного слота фрейма узла по списку имен"""
+        frame_name = self._frames.get(node)
+        if frame_name is None:
+            return
+        if frame_name not in self.frame_store:
+            # Фрейм удален в обход представления - строим заново
+            self._sync_node(node)
+            return
+        derived = self._slots[node]
+        if names:
+            derived.add(slot_name)
+            self.frame_store.set_slot(frame_name, slot_name, format_values(names))
+        elif slot_name in derived:
+            derived.discard(slot_name)
+            if slot_name in self.frame_store.frames[frame_name]["slots"]:
+                self.frame_store.remove_slot(frame_name, slot_name)
+
+    def _sync_relation(self, relation):
+        """Обновление слотов, зависящих от связи: у ее начала и (для "является") у конца"""
+        from_node, to_node, relation_type = relation["from"], relation["to"], relation["type"]
+        if from_node in self._frames:
+            names = [other["to"] for other in self.graph.outgoing(from_node, relation_type)]
+            self._sync_slot(from_node, self._slot_name(self._frame_type(from_node), relation_type), names)
+        if relation_type == IS_A and to_node in self._frames:
+            names = [other["from"] for other in self.graph.incoming(to_node, IS_A)]
+            self._sync_slot(to_node, EXAMPLES_SLOT, names)
+
+    def rebuild(self):
+        """Построение всех фреймов по сети (и удаление фреймов исчезнувших узлов)"""
+        if not self.enabled:
+            return
+        with self._muted(), self.frame_store.bulk():
+            for node in [node for node in self._frames if not self.graph.has_node(node)]:
+                self._sync_node(node)
+            for node in self.graph.nodes:
+                self._sync_node(node)
+
+    def on_graph_event(self, event, *args):
+        """Пересчет фреймов, затронутых изменением сети"""
+        if not self.enabled:
+            return
+        if event in ("cleared", "reset"):
+            self.rebuild()
+            return
+        with self._muted():
+            if event in ("node_added", "node_changed", "node_removed"):
+                self._sync_node(args[0])
+            elif event in ("relation_added", "relation_removed"):
+                self._sync_relation(args[0])
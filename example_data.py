@@ -0,0 +1,93 @@
+# Пример семантической сети и фреймов (птицы); модуль не зависит от tkinter
+
+EXAMPLE_NODES = {
+    "птица": {"type": "class", "x": 450, "y": 100},
+    "животные": {"type": "class", "x": 450, "y": 50},
+    "страус": {"type": "object", "x": 200, "y": 200},
+    "канарейка": {"type": "object", "x": 400, "y": 200},
+    "дрозд": {"type": "object", "x": 600, "y": 200},
+    "пингвин": {"type": "object", "x": 800, "y": 200},
+    "летать": {"type": "property", "x": 700, "y": 300},
+    "ходить": {"type": "property", "x": 100, "y": 300},
+    "петь": {"type": "property", "x": 500, "y": 300},
+    "оперенье": {"type": "property", "x": 200, "y": 50},
+    "желтый": {"type": "property", "x": 300, "y": 450},
+    "черный": {"type": "property", "x": 700, "y": 450},
+    "коричневый": {"type": "property", "x": 500, "y": 450},
+}
+
+EXAMPLE_RELATIONS = [
+    {"from": "страус", "to": "птица", "type": "является"},
+    {"from": "канарейка", "to": "птица", "type": "является"},
+    {"from": "дрозд", "to": "птица", "type": "является"},
+    {"from": "пингвин", "to": "птица", "type": "является"},
+    {"from": "птица", "to": "животные", "type": "является"},
+    {"from": "страус", "to": "ходить", "type": "умеет"},
+    {"from": "птица", "to": "оперенье", "type": "имеет"},
+    {"from": "пингвин", "to": "черный", "type": "имеет цвет"},
+    {"from": "пингвин", "to": "ходить", "type": "умеет"},
+    {"from": "канарейка", "to": "желтый", "type": "имеет цвет"},
+    {"from": "дрозд", "to": "коричневый", "type": "имеет цвет"},
+    {"from": "дрозд", "to": "петь", "type": "умеет"},
+    {"from": "канарейка", "to": "петь", "type": "умеет"},
+    {"from": "дрозд", "to": "летать", "type": "умеет"},
+    {"from": "канарейка", "to": "летать", "type": "умеет"},
+]
+
+EXAMPLE_FRAMES = {
+    "Фрейм: Птица": {
+        "type": "class_frame",
+        "x": 300,
+        "y": 200,
+        "slots": {
+            "Класс": "Птица",
+            "Наследует": "Животные",
+            "Имеет": "Оперенье",
+            "Умеет": "Летать, Петь",
+            "Примеры": "Страус, Канарейка, Дрозд, Пингвин"
+        }
+    },
+    "Фрейм: Канарейка": {
+        "type": "object_frame",
+        "x": 600,
+        "y": 200,
+        "slots": {
+            "Объект": "Канарейка",
+            "Тип": "Птица",
+            "Цвет": "Желтый",
+            "Умеет": "Летать, Петь",
+            "Особенности": "Маленькая, Певчая"
+        }
+    },
+    "Фрейм: Пингвин": {
+        "type": "object_frame",
+        "x": 900,
+        "y": 200,
+        "slots": {
+            "Объект": "Пингвин",
+            "Тип": "Птица",
+            "Цвет": "Черный",
+            "Умеет": "Ходить, Плавать",
+            "Особенности": "Не летает, Живет в Антарктиде"
+        }
+    },
+    "Фрейм: Страус": {
+        "type": "object_frame",
+        "x": 300,
+        "y": 400,
+        "slots": {
+            "Объект": "Страус",
+            "Тип": "Птица",
+            "Цвет": "Коричневый",
+            "Умеет": "Ходить, Бегать",
+            "Особенности": "Не летает, Самая большая птица"
+        }
+    }
+}
+
+
+def load_example(graph, frame_store=None):
+    """Загрузка примера в сеть и (при наличии) в хранилище фреймов"""
+    graph.load(EXAMPLE_NODES, EXAMPLE_RELATIONS)
+    if frame_store is not None:
+        frame_store.load(EXAMPLE_FRAMES)
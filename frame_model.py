@@ -0,0 +1,101 @@
+from contextlib import contextmanager
+
+
+class FrameStore:
+    """Хранилище фреймов с оповещением подписчиков об изменениях"""
+
+    def __init__(self):
+        self.frames = {}
+        self._listeners = []
+        # Подписчики, получающие события и во время массового изменения
+        self._bulk_listeners = []
+        self._bulk_depth = 0
+
+    def subscribe(self, listener, during_bulk=False):
+        """Подписка на изменения фреймов: listener(event, *args)"""
+        self._listeners.append(listener)
+        if during_bulk:
+            self._bulk_listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        """Отмена подписки на изменения фреймов"""
+        self._listeners.remove(listener)
+        if listener in self._bulk_listeners:
+            self._bulk_listeners.remove(listener)
+
+    def _notify(self, event, *args):
+        """Оповещение подписчиков об изменении"""
+        for listener in self._bulk_listeners if self._bulk_depth else self._listeners:
+            listener(event, *args)
+
+    @contextmanager
+    def bulk(self):
+        """Массовое изменение: одно событие "reset" в конце"""
+        self._bulk_depth += 1
+        try:
+            yield self
+        finally:
+            self._bulk_depth -= 1
+            if not self._bulk_depth:
+                self._notify("reset")
+
+    def __contains__(self, name):
+        return name in self.frames
+
+    def __len__(self):
+        return len(self.frames)
+
+    def create_frame(self, name, frame_type, x, y, slots=None):
+        """Создание фрейма"""
+        if name in self.frames:
+            raise ValueError(f"Фрейм '{name}' уже существует")
+        frame = {"type": frame_type, "x": x, "y": y, "slots": dict(slots or {})}
+        self.frames[name] = frame
+        self._notify("frame_added", name)
+        return frame
+
+    def delete_frame(self, name):
+        """Удаление фрейма"""
+        frame = self.frames.pop(name)
+        self._notify("frame_removed", name, frame)
+        return frame
+
+    def set_slot(self, name, slot_name, value):
+        """Установка значения слота"""
+        slots = self.frames[name]["slots"]
+        old_value = slots.get(slot_name)
+        if old_value != value:
+            slots[slot_name] = value
+            self._notify("slot_changed", name, slot_name, old_value)
+
+    def remove_slot(self, name, slot_name):
+        """Удаление слота"""
+        old_value = self.frames[name]["slots"].pop(slot_name)
+        self._notify("slot_changed", name, slot_name, old_value)
+
+    def move_frame(self, name, x, y):
+        """Перемещение фрейма"""
+        frame = self.frames[name]
+        if frame["x"] != x or frame["y"] != y:
+            old_x, old_y = frame["x"], frame["y"]
+            frame["x"] = x
+            frame["y"] = y
+            self._notify("frame_moved", name, old_x, old_y)
+
+    def clear(self):
+        """Удаление всех фреймов; подписчики получают прежний словарь фреймов"""
+        frames, self.frames = self.frames, {}
+        self._notify("cleared", frames)
+
+    def restore(self, frames):
+        """Возврат словаря фреймов, переданного подписчикам событием "cleared" """
+        self.clear()
+        self.frames = frames
+        self._notify("reset")
+
+    def load(self, frames):
+        """Замена содержимого копией переданных фреймов"""
+        with self.bulk():
+            self.clear()
+            for name, data in frames.items():
+                self.create_frame(name, data["type"], data["x"], data["y"], data["slots"])
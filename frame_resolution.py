@@ -0,0 +1,193 @@
+FRAME_PREFIX = "фрейм:"
+# Слоты, задающие родителей фрейма (в порядке приоритета)
+LINK_SLOTS = ("Наследует", "Тип")
+# Слоты, по значениям которых на фрейм ссылаются другие фреймы
+IDENTITY_SLOTS = ("Класс", "Объект")
+# Слоты, описывающие сам фрейм и потому не наследуемые
+NON_INHERITED_SLOTS = frozenset(LINK_SLOTS + IDENTITY_SLOTS + ("Примеры",))
+
+
+def normalize_name(name):
+    """Приведение имени класса/фрейма к виду для сравнения"""
+    name = name.strip().casefold()
+    if name.startswith(FRAME_PREFIX):
+        name = name[len(FRAME_PREFIX):].strip()
+    return name.replace("ё", "е")
+
+
+def split_values(value):
+    """Значения слота-ссылки, перечисленные через запятую"""
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+class SlotResolver:
+    """Вычисление действующих значений слотов с учетом наследования
+
+    Значение слота ищется в самом фрейме (переопределение), а затем у
+    родителей по слотам "Наследует" и "Тип" в порядке удаленности
+    (значения предков - умолчания). Результаты кэшируются по паре
+    (фрейм, слот); для каждой записи запоминается, какие слоты каких
+    фреймов и какие имена родителей были прочитаны, и при изменении
+    фрейма сбрасываются только зависящие от него записи.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._cache = {}
+        # Обратные зависимости записей кэша
+        self._slot_readers = {}
+        self._link_readers = {}
+        self._identity_readers = {}
+        # Имя класса/фрейма -> имена фреймов с этим именем
+        self._identities = {}
+        self._rebuild_identities()
+        store.subscribe(self.on_frames_event)
+
+    def _frame_identities(self, name, slots):
+        """Имена, по которым на фрейм можно сослаться"""
+        identities = {normalize_name(name)}
+        for slot_name in IDENTITY_SLOTS:
+            if slots.get(slot_name):
+                identities.add(normalize_name(slots[slot_name]))
+        return identities
+
+    def _rebuild_identities(self):
+        """Построение индекса имен фреймов"""
+        self._identities = {}
+        for name, frame in self.store.frames.items():
+            for identity in self._frame_identities(name, frame["slots"]):
+                self._identities.setdefault(identity, set()).add(name)
+
+    def _invalidate(self, readers):
+        """Сброс записей кэша из множества зависимостей"""
+        if readers:
+            for key in readers:
+                self._cache.pop(key, None)
+            readers.clear()
+
+    def _invalidate_identities(self, identities):
+        """Сброс записей, которые искали фреймы по этим именам"""
+        for identity in identities:
+            self._invalidate(self._identity_readers.get(identity))
+
+    def reset(self):
+        """Полный сброс кэша"""
+        self._cache.clear()
+        self._slot_readers.clear()
+        self._link_readers.clear()
+        self._identity_readers.clear()
+        self._rebuild_identities()
+
+    def on_frames_event(self, event, *args):
+        """Точечный сброс кэша при изменении фреймов"""
+        if event in ("cleared", "reset"):
+            self.reset()
+        elif event == "frame_added":
+            name = args[0]
+            identities = self._frame_identities(name, self.store.frames[name]["slots"])
+            for identity in identities:
+                self._identities.setdefault(identity, set()).add(name)
+            self._invalidate_identities(identities)
+        elif event == "frame_removed":
+            name, frame = args
+            identities = self._frame_identities(name, frame["slots"])
+            for identity in identities:
+                self._identities.get(identity, set()).discard(name)
+            self._invalidate_identities(identities)
+            self._invalidate(self._link_readers.pop(name, None))
+            for slot_name in frame["slots"]:
+                self._invalidate(self._slot_readers.pop((name, slot_name), None))
+        elif event == "slot_changed":
+            name, slot_name, old_value = args
+            self._invalidate(self._slot_readers.get((name, slot_name)))
+            if slot_name in LINK_SLOTS:
+                self._invalidate(self._link_readers.get(name))
+            if slot_name in IDENTITY_SLOTS:
+                new_value = self.store.frames[name]["slots"].get(slot_name)
+                changed = set()
+                if old_value:
+                    old_identity = normalize_name(old_value)
+                    if old_identity not in self._frame_identities(name, self.store.frames[name]["slots"]):
+                        self._identities.get(old_identity, set()).discard(name)
+                    changed.add(old_identity)
+                if new_value:
+                    new_identity = normalize_name(new_value)
+                    self._identities.setdefault(new_identity, set()).add(name)
+                    changed.add(new_identity)
+                self._invalidate_identities(changed)
+
+    def parents(self, name, key=None):
+        """Родительские фреймы в порядке слотов "Наследует", "Тип" """
+        slots = self.store.frames[name]["slots"]
+        if key is not None:
+            self._link_readers.setdefault(name, set()).add(key)
+        result = []
+        for slot_name in LINK_SLOTS:
+            for value in split_values(slots.get(slot_name, "")):
+                identity = normalize_name(value)
+                if key is not None:
+                    self._identity_readers.setdefault(identity, set()).add(key)
+                for parent in sorted(self._identities.get(identity, ())):
+                    if parent != name and parent not in result:
+                        result.append(parent)
+        return result
+
+    def resolve(self, frame_name, slot_name):
+        """Действующее значение слота: (значение, фрейм-источник) или None"""
+        key = (frame_name, slot_name)
+        if key in self._cache:
+            return self._cache[key]
+
+        frames = self.store.frames
+        result = None
+        # Обход в ширину: ближайший предок переопределяет более дальних
+        queue = [frame_name]
+        visited = {frame_name}
+        position = 0
+        while position < len(queue):
+            current = queue[position]
+            position += 1
+            self._slot_readers.setdefault((current, slot_name), set()).add(key)
+            value = frames[current]["slots"].get(slot_name)
+            if value is not None and (current == frame_name or slot_name not in NON_INHERITED_SLOTS):
+                result = (value, current)
+                break
+            if slot_name in NON_INHERITED_SLOTS:
+                break
+            for parent in self.parents(current, key):
+                if parent not in visited:
+                    visited.add(parent)
+                    queue.append(parent)
+
+        self._cache[key] = result
+        return result
+
+    def ancestors(self, frame_name):
+        """Цепочка предков фрейма (без кэширования)"""
+        result = []
+        queue = [frame_name]
+        visited = {frame_name}
+        position = 0
+        while position < len(queue):
+            for parent in self.parents(queue[position]):
+                if parent not in visited:
+                    visited.add(parent)
+                    queue.append(parent)
+                    result.append(parent)
+            position += 1
+        return result
+
+    def resolved_slots(self, frame_name):
+        """Все действующие слоты фрейма: {слот: (значение, фрейм-источник)}"""
+        frames = self.store.frames
+        slot_names = list(frames[frame_name]["slots"])
+        for ancestor in self.ancestors(frame_name):
+            for slot_name in frames[ancestor]["slots"]:
+                if slot_name not in NON_INHERITED_SLOTS and slot_name not in slot_names:
+                    slot_names.append(slot_name)
+        result = {}
+        for slot_name in slot_names:
+            resolved = self.resolve(frame_name, slot_name)
+            if resolved is not None:
+                result[slot_name] = resolved
+        return result
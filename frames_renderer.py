@@ -0,0 +1,333 @@
+from network_renderer import HIGHLIGHT_COLOR, scaled_font
+from spatial_index import GridIndex
+
+# Цвета фреймов (как в легенде фреймов)
+CLASS_FRAME_COLOR = "#ffcc99"
+OBJECT_FRAME_COLOR = "#ccffcc"
+HEADER_COLOR = "#e6e6e6"
+FRAME_WIDTH = 200
+HEADER_HEIGHT = 30
+SLOT_HEIGHT = 20
+# Отступ первого слота от верха фрейма и свободное место под последним
+SLOTS_TOP = 35
+SLOTS_BOTTOM = 45
+SLOT_FONT = ("Arial", 8)
+TITLE_FONT = ("Arial", 10, "bold")
+SLOT_TEXT_WIDTH = FRAME_WIDTH - 20
+# Оценка ширины символа и высоты строки без Tk (как у SvgCanvas): доли размера шрифта в пикселях
+APPROX_CHAR_WIDTH = 0.55
+APPROX_LINE_HEIGHT = 1.2
+# Сколько измеренных строк слотов хранить
+MEASURE_CACHE_SIZE = 20000
+
+
+def frame_color(frame_type):
+    """Цвет заливки фрейма"""
+    return OBJECT_FRAME_COLOR if frame_type == "фрейм объекта" else CLASS_FRAME_COLOR
+
+
+def slot_text(slot_name, slot_value):
+    """Текст строки слота"""
+    return f"{slot_name}: {slot_value}"
+
+
+class TextMeasure:
+    """Число строк текста слота при переносе по ширине, как у текста Tk
+
+    Ширины берутся из шрифта Tk (tkinter.font.Font), а без него -
+    оцениваются по числу символов. Результат кэшируется по строке,
+    поэтому повторная раскладка фрейма не измеряет текст заново.
+    """
+
+    def __init__(self, font=None, width=SLOT_TEXT_WIDTH):
+        self.font = font
+        self.width = width
+        if font is not None:
+            self.line_height = font.metrics("linespace")
+        else:
+            self.line_height = SLOT_FONT[1] * 4 / 3 * APPROX_LINE_HEIGHT
+        self._lines = {}
+
+    def text_width(self, text):
+        """Ширина текста в пикселях"""
+        if self.font is not None:
+            return self.font.measure(text)
+        return len(text) * SLOT_FONT[1] * 4 / 3 * APPROX_CHAR_WIDTH
+
+    def line_count(self, text):
+        """Число строк после переноса по словам"""
+        lines = self._lines.get(text)
+        if lines is not None:
+            return lines
+        lines = 0
+        for paragraph in text.split("\n"):
+            lines += 1
+            line = ""
+            for word in paragraph.split(" "):
+                candidate = f"{line} {word}" if line else word
+                if self.text_width(candidate) <= self.width:
+                    line = candidate
+                    continue
+                if line:
+                    lines += 1
+                # Слово длиннее строки Tk переносит посимвольно
+                word_width = self.text_width(word)
+                if word_width > self.width:
+                    lines += int(word_width // self.width)
+                line = word
+        if len(self._lines) >= MEASURE_CACHE_SIZE:
+            self._lines.clear()
+        self._lines[text] = lines
+        return lines
+
+    def slot_height(self, text):
+        """Высота строки слота с учетом перенесенных строк"""
+        return SLOT_HEIGHT + (self.line_count(text) - 1) * self.line_height
+
+
+def slot_heights(frame_data, measure):
+    """Высоты всех слотов фрейма"""
+    return [measure.slot_height(slot_text(slot_name, slot_value))
+            for slot_name, slot_value in frame_data["slots"].items()]
+
+
+def frame_height(frame_data, measure=None, collapsed=False):
+    """Высота фрейма: заголовок или заголовок и слоты с учетом переноса строк"""
+    if collapsed:
+        return HEADER_HEIGHT
+    if measure is None:
+        measure = TextMeasure()
+    return SLOTS_TOP + SLOTS_BOTTOM + sum(slot_heights(frame_data, measure))
+
+
+def draw_frame(canvas, frame_name, frame_data, measure=None, collapsed=False, scale=1.0, offset=(0.0, 0.0),
+               highlighted=False):
+    """Отрисовка одного фрейма: рамка, заголовок и слоты; возвращает элементы canvas"""
+    if measure is None:
+        measure = TextMeasure()
+    heights = [] if collapsed else slot_heights(frame_data, measure)
+    height = HEADER_HEIGHT if collapsed else SLOTS_TOP + SLOTS_BOTTOM + sum(heights)
+
+    def point(x, y):
+        return x * scale + offset[0], y * scale + offset[1]
+
+    x1, y1 = point(frame_data["x"] - FRAME_WIDTH // 2, frame_data["y"] - height // 2)
+    x2, y2 = point(frame_data["x"] + FRAME_WIDTH // 2, frame_data["y"] + height // 2)
+    header_bottom = y1 + HEADER_HEIGHT * scale
+    title_x = (x1 + x2) / 2
+    # При мелком масштабе текст не рисуется
+    title_font = scaled_font(TITLE_FONT, scale)
+    slot_font = scaled_font(SLOT_FONT, scale)
+    outline, outline_width = (HIGHLIGHT_COLOR, 4) if highlighted else ("black", 2)
+    items = []
+
+    if collapsed:
+        # Свернутый фрейм - только заголовок
+        items.append(canvas.create_rectangle(x1, y1, x2, header_bottom, fill=frame_color(frame_data["type"]),
+                                             outline=outline, width=outline_width, tags=("frame",)))
+        if title_font is not None:
+            items.append(canvas.create_text(title_x, (y1 + header_bottom) / 2, text=f"▸ {frame_name}",
+                                            font=title_font, width=(FRAME_WIDTH - 10) * scale, tags=("frame",)))
+        return items
+
+    # Основной прямоугольник
+    items.append(canvas.create_rectangle(x1, y1, x2, y2, fill=frame_color(frame_data["type"]),
+                                         outline=outline, width=outline_width, tags=("frame",)))
+
+    # Заголовок фрейма
+    items.append(canvas.create_rectangle(x1, y1, x2, header_bottom, fill=HEADER_COLOR, outline="black",
+                                         width=1, tags=("frame",)))
+    if title_font is not None:
+        items.append(canvas.create_text(title_x, (y1 + header_bottom) / 2, text=frame_name,
+                                        font=title_font, width=(FRAME_WIDTH - 10) * scale, tags=("frame",)))
+    if slot_font is None:
+        return items
+
+    # Слоты фрейма: каждая строка по центру своей (возможно, многострочной) полосы
+    slot_top = frame_data["y"] - height // 2 + SLOTS_TOP
+    for (slot_name, slot_value), slot_height in zip(frame_data["slots"].items(), heights):
+        items.append(canvas.create_text(*point(frame_data["x"] - FRAME_WIDTH // 2 + 10, slot_top + slot_height / 2),
+                                        text=slot_text(slot_name, slot_value), font=slot_font, anchor="w",
+                                        width=SLOT_TEXT_WIDTH * scale, tags=("frame",)))
+        slot_top += slot_height
+    return items
+
+
+def draw_frames(canvas, frames, measure=None):
+    """Отрисовка всех фреймов на canvas (Tk или SvgCanvas)"""
+    if measure is None:
+        measure = TextMeasure()
+    for frame_name, frame_data in frames.items():
+        draw_frame(canvas, frame_name, frame_data, measure)
+
+
+class FramesRenderer:
+    """Инкрементальная отрисовка фреймов на canvas
+
+    Как и NetworkRenderer, помнит элементы canvas каждого фрейма и при
+    render() перерисовывает только фреймы, изменившиеся с прошлой
+    отрисовки. Высота фрейма считается по измеренному тексту слотов.
+    В режиме отсечения создаются только фреймы, попадающие в видимую
+    область. Свернутые фреймы рисуются одним заголовком; по умолчанию
+    свернуты все фреймы, если включен collapsed_by_default. Масштаб
+    задается преобразованием вида, шрифты подбираются под него.
+    """
+
+    def __init__(self, canvas, frame_store, measure=None):
+        self.canvas = canvas
+        self.frame_store = frame_store
+        self.measure = measure if measure is not None else TextMeasure()
+        # имя фрейма -> элементы canvas
+        self.frame_items = {}
+        self._dirty = set()
+        self._full_redraw = True
+        # Преобразование координат фреймов в координаты canvas: x * scale + offset
+        self.scale = 1.0
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+        self.culling = False
+        self.viewport = None
+        # Свернутые фреймы: по умолчанию все или ни одного, _toggled - исключения
+        self.collapsed_by_default = False
+        self._toggled = set()
+        # Подсвеченные фреймы (например, результаты поиска)
+        self.highlighted = set()
+        # Прямоугольники фреймов (с учетом свернутости) в координатах фреймов
+        self.index = GridIndex(cell_size=250)
+        self._rebuild_index()
+        frame_store.subscribe(self.on_frames_event)
+
+    def _rebuild_index(self):
+        """Построение индекса прямоугольников по всем фреймам"""
+        self.index.clear()
+        for name in self.frame_store.frames:
+            self._index_frame(name)
+
+    def _index_frame(self, name):
+        """Обновление прямоугольника фрейма в индексе"""
+        frame_data = self.frame_store.frames[name]
+        height = frame_height(frame_data, self.measure, self.is_collapsed(name))
+        self.index.insert(name, frame_data["x"] - FRAME_WIDTH // 2, frame_data["y"] - height // 2,
+                          frame_data["x"] + FRAME_WIDTH // 2, frame_data["y"] + height // 2)
+
+    def on_frames_event(self, event, *args):
+        """Учет изменения фреймов до следующей отрисовки"""
+        if event in ("cleared", "reset"):
+            self._toggled.intersection_update(self.frame_store.frames)
+            self._rebuild_index()
+            self._full_redraw = True
+        elif event == "frame_removed":
+            self.index.discard(args[0])
+            self._toggled.discard(args[0])
+            self._dirty.add(args[0])
+        elif event in ("frame_added", "frame_moved", "slot_changed"):
+            self._index_frame(args[0])
+            self._dirty.add(args[0])
+
+    def is_collapsed(self, name):
+        return self.collapsed_by_default != (name in self._toggled)
+
+    def toggle(self, name):
+        """Свернуть или развернуть фрейм"""
+        self._toggled ^= {name}
+        if name in self.frame_store:
+            self._index_frame(name)
+        self._dirty.add(name)
+
+    def set_collapsed_by_default(self, collapsed):
+        """Свернуть или развернуть все фреймы"""
+        if collapsed != self.collapsed_by_default:
+            self.collapsed_by_default = collapsed
+            self._toggled.clear()
+            self._rebuild_index()
+            self._full_redraw = True
+
+    def set_highlight(self, names):
+        """Подсветка фреймов; перерисовываются только фреймы, сменившие состояние"""
+        names = set(names)
+        self._dirty.update(names ^ self.highlighted)
+        self.highlighted = names
+
+    def scale_view(self, x, y, factor):
+        """Масштабирование вида в factor раз относительно точки canvas (x, y); затем нужна полная перерисовка"""
+        self.scale *= factor
+        self.offset_x = x + (self.offset_x - x) * factor
+        self.offset_y = y + (self.offset_y - y) * factor
+
+    def to_canvas(self, x, y):
+        """Перевод координат фреймов в координаты canvas"""
+        return x * self.scale + self.offset_x, y * self.scale + self.offset_y
+
+    def to_world(self, x, y):
+        """Перевод координат canvas в координаты фреймов"""
+        return (x - self.offset_x) / self.scale, (y - self.offset_y) / self.scale
+
+    def set_culling(self, enabled):
+        """Включение/выключение отрисовки только видимой области"""
+        if enabled != self.culling:
+            self.culling = enabled
+            self._full_redraw = True
+
+    def set_viewport(self, x1, y1, x2, y2):
+        """Видимая область canvas (в координатах canvas)"""
+        self.viewport = (x1, y1, x2, y2)
+
+    def invalidate(self):
+        """Пометить все фреймы для полной перерисовки"""
+        self._full_redraw = True
+
+    def frame_at(self, x, y):
+        """Имя фрейма под точкой canvas или None (верхний из нарисованных)"""
+        wx, wy = self.to_world(x, y)
+        found = [name for name in self.index.query_rect(wx, wy, wx, wy) if name in self.frame_items]
+        if not found:
+            return None
+        # Фрейм, нарисованный последним, лежит сверху
+        return max(found, key=lambda name: self.frame_items[name][0])
+
+    def world_bounds(self):
+        """Границы фреймов в координатах canvas (для области прокрутки)"""
+        bounds = self.index.bounds()
+        if bounds is None:
+            return None
+        return (bounds[0] * self.scale + self.offset_x, bounds[1] * self.scale + self.offset_y,
+                bounds[2] * self.scale + self.offset_x, bounds[3] * self.scale + self.offset_y)
+
+    def render(self):
+        """Применение накопленных изменений к canvas"""
+        full = self._full_redraw
+        if full:
+            self.canvas.delete("all")
+            self.frame_items.clear()
+            self._full_redraw = False
+        if self.culling:
+            # Удаляем фреймы, ушедшие из видимой области, и рисуем появившиеся и измененные
+            visible = self._visible()
+            for name in [name for name in self.frame_items if name not in visible]:
+                self.canvas.delete(*self.frame_items.pop(name))
+            names = [name for name in visible if name not in self.frame_items or name in self._dirty]
+        else:
+            names = list(self.frame_store.frames if full else self._dirty)
+        for name in names:
+            self._sync_frame(name)
+        self._dirty.clear()
+
+    def _visible(self):
+        """Фреймы, пересекающие видимую область"""
+        if self.viewport is None:
+            return set()
+        x1, y1, x2, y2 = self.viewport
+        wx1, wy1 = self.to_world(x1, y1)
+        wx2, wy2 = self.to_world(x2, y2)
+        return self.index.query_rect(wx1, wy1, wx2, wy2)
+
+    def _sync_frame(self, name):
+        """Пересоздание элементов одного фрейма (или их удаление)"""
+        items = self.frame_items.pop(name, None)
+        if items:
+            self.canvas.delete(*items)
+        frame_data = self.frame_store.frames.get(name)
+        if frame_data is None:
+            return
+        self.frame_items[name] = draw_frame(self.canvas, name, frame_data, self.measure, self.is_collapsed(name),
+                                            self.scale, (self.offset_x, self.offset_y), name in self.highlighted)
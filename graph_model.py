@@ -0,0 +1,458 @@
+from array import array
+from collections import defaultdict
+from collections.abc import Mapping
+from contextlib import contextmanager
+from itertools import repeat
+
+RELATION_FIELDS = {"from": 0, "to": 1, "type": 2}
+NODE_FIELDS = ("type", "x", "y")
+
+
+class Relation(tuple):
+    """Связь - тройка (от, к, тип), доступная и как словарь по "from"/"to"/"type"
+
+    Связь одновременно служит своим ключом в индексах сети, поэтому
+    отдельные словарь и кортеж-ключ на каждую связь не нужны.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, from_node, to_node, relation_type):
+        return tuple.__new__(cls, (from_node, to_node, relation_type))
+
+    def __getitem__(self, key):
+        if key.__class__ is str:
+            key = RELATION_FIELDS[key]
+        return tuple.__getitem__(self, key)
+
+    def __repr__(self):
+        return f"Relation{tuple.__repr__(self)}"
+
+
+class NodeView(Mapping):
+    """Узел сети в виде словаря {"type", "x", "y"} (представление столбцов модели)"""
+
+    __slots__ = ("_graph", "_id")
+
+    def __init__(self, graph, node_id):
+        self._graph = graph
+        self._id = node_id
+
+    def __getitem__(self, key):
+        graph = self._graph
+        if key == "x":
+            return graph._xs[self._id]
+        if key == "y":
+            return graph._ys[self._id]
+        if key == "type":
+            return graph._type_names[graph._types[self._id]]
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(NODE_FIELDS)
+
+    def __len__(self):
+        return len(NODE_FIELDS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class NodesView(Mapping):
+    """Узлы сети в виде словаря имя -> NodeView"""
+
+    __slots__ = ("_graph",)
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __getitem__(self, name):
+        return NodeView(self._graph, self._graph._ids[name])
+
+    def __contains__(self, name):
+        return name in self._graph._ids
+
+    def __iter__(self):
+        return iter(self._graph._ids)
+
+    def __len__(self):
+        return len(self._graph._ids)
+
+
+class SemanticGraph:
+    """Модель семантической сети с индексами смежности
+
+    Узлы хранятся по столбцам: целочисленный номер узла индексирует
+    массивы координат (array('d')) и кодов типов (array('I')), а коды
+    типов интернированы. Связи - кортежи Relation, ссылающиеся на общие
+    объекты строк имен и типов. Привычный доступ graph.nodes[имя]["x"]
+    обеспечивает представление NodesView.
+    """
+
+    def __init__(self):
+        self._reset_storage()
+        self.nodes = NodesView(self)
+        self._listeners = []
+        # Подписчики, получающие события и во время массового изменения
+        self._bulk_listeners = []
+        self._bulk_depth = 0
+
+    def _reset_storage(self):
+        """Создание пустых столбцов и индексов"""
+        # Имя узла -> номер; номер -> имя (None у освобожденных номеров)
+        self._ids = {}
+        self._names = []
+        self._free_ids = []
+        self._types = array("I")
+        self._xs = array("d")
+        self._ys = array("d")
+        self._type_codes = {}
+        self._type_names = []
+        self._relation_types = {}
+        # Связь служит своим же ключом; порядок добавления сохраняется
+        self._relations = {}
+        self._outgoing = {}
+        self._incoming = {}
+        self._by_type = {}
+
+    def _state(self):
+        """Все контейнеры модели (для сохранения без копирования)"""
+        return (self._ids, self._names, self._free_ids, self._types, self._xs, self._ys,
+                self._type_codes, self._type_names, self._relation_types, self._relations,
+                self._outgoing, self._incoming, self._by_type)
+
+    def _type_code(self, node_type):
+        """Код типа узла (с добавлением нового типа)"""
+        code = self._type_codes.get(node_type)
+        if code is None:
+            code = len(self._type_names)
+            self._type_codes[node_type] = code
+            self._type_names.append(node_type)
+        return code
+
+    def node_id(self, name):
+        """Целочисленный номер узла"""
+        return self._ids[name]
+
+    def node_name(self, node_id):
+        """Имя узла по номеру"""
+        name = self._names[node_id]
+        if name is None:
+            raise KeyError(node_id)
+        return name
+
+    def node_type(self, name):
+        """Тип узла"""
+        return self._type_names[self._types[self._ids[name]]]
+
+    def position(self, name):
+        """Координаты узла (x, y)"""
+        node_id = self._ids[name]
+        return self._xs[node_id], self._ys[node_id]
+
+    def positions(self):
+        """Имена узлов и списки их координат в порядке добавления"""
+        names = list(self._ids)
+        ids = list(self._ids.values())
+        xs, ys = self._xs, self._ys
+        return names, [xs[i] for i in ids], [ys[i] for i in ids]
+
+    def subscribe(self, listener, during_bulk=False):
+        """Подписка на изменения сети: listener(event, *args)"""
+        self._listeners.append(listener)
+        if during_bulk:
+            self._bulk_listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        """Отмена подписки на изменения сети"""
+        self._listeners.remove(listener)
+        if listener in self._bulk_listeners:
+            self._bulk_listeners.remove(listener)
+
+    def _notify(self, event, *args):
+        """Оповещение подписчиков об изменении"""
+        for listener in self._bulk_listeners if self._bulk_depth else self._listeners:
+            listener(event, *args)
+
+    @contextmanager
+    def bulk(self):
+        """Массовое изменение: вместо оповещения о каждом элементе - одно событие "reset" в конце"""
+        self._bulk_depth += 1
+        try:
+            yield self
+        finally:
+            self._bulk_depth -= 1
+            if not self._bulk_depth:
+                self._notify("reset")
+
+    @property
+    def relations(self):
+        """Все связи сети в порядке добавления"""
+        return self._relations.values()
+
+    def has_node(self, name):
+        """Проверка наличия узла"""
+        return name in self.nodes
+
+    def has_relation(self, from_node, to_node, relation_type):
+        """Проверка наличия связи за O(1)"""
+        return (from_node, to_node, relation_type) in self._relations
+
+    def get_relation(self, from_node, to_node, relation_type):
+        """Связь по ключу или None"""
+        return self._relations.get((from_node, to_node, relation_type))
+
+    def add_node(self, name, node_type, x, y):
+        """Добавление узла; возвращает его номер"""
+        if name in self._ids:
+            raise ValueError(f"Узел '{name}' уже существует")
+        code = self._type_code(node_type)
+        if self._free_ids:
+            node_id = self._free_ids.pop()
+            self._names[node_id] = name
+            self._types[node_id] = code
+            self._xs[node_id] = x
+            self._ys[node_id] = y
+        else:
+            node_id = len(self._names)
+            self._names.append(name)
+            self._types.append(code)
+            self._xs.append(x)
+            self._ys.append(y)
+        self._ids[name] = node_id
+        self._notify("node_added", name)
+        return node_id
+
+    def remove_node(self, name):
+        """Удаление узла вместе со всеми его связями"""
+        for key in list(self._outgoing.pop(name, ())) + list(self._incoming.pop(name, ())):
+            if key in self._relations:
+                self.remove_relation(*key)
+        node_id = self._ids.pop(name)
+        # Подписчикам передается снимок узла: его номер может быть занят повторно
+        node = {"type": self._type_names[self._types[node_id]], "x": self._xs[node_id], "y": self._ys[node_id]}
+        self._names[node_id] = None
+        self._free_ids.append(node_id)
+        self._notify("node_removed", name, node)
+
+    def rename_node(self, name, new_name):
+        """Переименование узла с сохранением типа, позиции и связей
+
+        Выполняется удалением и повторным добавлением узла и его связей,
+        поэтому подписчики получают обычные события этих изменений.
+        """
+        if new_name in self._ids:
+            raise ValueError(f"Узел '{new_name}' уже существует")
+        node_type = self.node_type(name)
+        x, y = self.position(name)
+        relations = self.outgoing(name) + self.incoming(name)
+        self.remove_node(name)
+        self.add_node(new_name, node_type, x, y)
+        for from_node, to_node, relation_type in relations:
+            self.add_relation(new_name if from_node == name else from_node,
+                              new_name if to_node == name else to_node, relation_type)
+
+    def move_node(self, name, x, y):
+        """Перемещение узла"""
+        node_id = self._ids[name]
+        old_x, old_y = self._xs[node_id], self._ys[node_id]
+        if old_x != x or old_y != y:
+            self._xs[node_id] = x
+            self._ys[node_id] = y
+            self._notify("node_moved", name, old_x, old_y)
+
+    def set_node_type(self, name, node_type):
+        """Изменение типа узла"""
+        node_id = self._ids[name]
+        old_type = self._type_names[self._types[node_id]]
+        if old_type != node_type:
+            self._types[node_id] = self._type_code(node_type)
+            self._notify("node_changed", name, old_type)
+
+    def set_positions(self, names, xs, ys):
+        """Перемещение группы узлов (например, после авторазмещения)"""
+        for name, x, y in zip(names, xs, ys):
+            self.move_node(name, x, y)
+
+    def add_relation(self, from_node, to_node, relation_type):
+        """Добавление связи"""
+        ids = self._ids
+        if from_node not in ids or to_node not in ids:
+            raise KeyError(f"Узел '{from_node if from_node not in ids else to_node}' не существует")
+        if (from_node, to_node, relation_type) in self._relations:
+            raise ValueError("Такая связь уже существует")
+        # Общие объекты строк: имена - из модели, тип - интернированный
+        relation_type = self._relation_types.setdefault(relation_type, relation_type)
+        names = self._names
+        relation = Relation(names[ids[from_node]], names[ids[to_node]], relation_type)
+        self._relations[relation] = relation
+        # Словари смежности создаются только у узлов, имеющих связи
+        outgoing = self._outgoing.get(from_node)
+        if outgoing is None:
+            outgoing = self._outgoing[from_node] = {}
+        outgoing[relation] = relation
+        incoming = self._incoming.get(to_node)
+        if incoming is None:
+            incoming = self._incoming[to_node] = {}
+        incoming[relation] = relation
+        same_type = self._by_type.get(relation_type)
+        if same_type is None:
+            same_type = self._by_type[relation_type] = {}
+        same_type[relation] = relation
+        self._notify("relation_added", relation)
+        return relation
+
+    def remove_relation(self, from_node, to_node, relation_type):
+        """Удаление связи"""
+        key = (from_node, to_node, relation_type)
+        relation = self._relations.pop(key)
+        # У удаляемого узла словари смежности уже изъяты (см. remove_node)
+        self._outgoing.get(from_node, {}).pop(key, None)
+        self._incoming.get(to_node, {}).pop(key, None)
+        same_type = self._by_type[relation_type]
+        del same_type[key]
+        if not same_type:
+            del self._by_type[relation_type]
+        self._notify("relation_removed", relation)
+        return relation
+
+    def outgoing(self, name, relation_type=None):
+        """Исходящие связи узла, при необходимости только заданного типа"""
+        relations = self._outgoing.get(name, {}).values()
+        if relation_type is None:
+            return list(relations)
+        return [relation for relation in relations if relation["type"] == relation_type]
+
+    def incoming(self, name, relation_type=None):
+        """Входящие связи узла, при необходимости только заданного типа"""
+        relations = self._incoming.get(name, {}).values()
+        if relation_type is None:
+            return list(relations)
+        return [relation for relation in relations if relation["type"] == relation_type]
+
+    def relations_of_type(self, relation_type):
+        """Все связи заданного типа"""
+        return list(self._by_type.get(relation_type, {}).values())
+
+    def relation_types(self):
+        """Типы связей, присутствующие в сети"""
+        return list(self._by_type.keys())
+
+    def match(self, from_node=None, relation_type=None, to_node=None):
+        """Связи, подходящие под образец; None - любое значение. Использует наиболее узкий индекс"""
+        if from_node is not None and to_node is not None:
+            if relation_type is not None:
+                relation = self._relations.get((from_node, to_node, relation_type))
+                return [relation] if relation is not None else []
+            outgoing = self._outgoing.get(from_node, {})
+            incoming = self._incoming.get(to_node, {})
+            smaller = outgoing if len(outgoing) <= len(incoming) else incoming
+            return [relation for relation in smaller.values()
+                    if relation["from"] == from_node and relation["to"] == to_node]
+        if from_node is not None:
+            return self.outgoing(from_node, relation_type)
+        if to_node is not None:
+            return self.incoming(to_node, relation_type)
+        if relation_type is not None:
+            return self.relations_of_type(relation_type)
+        return list(self._relations.values())
+
+    def estimate(self, from_node=None, relation_type=None, to_node=None):
+        """Оценка числа связей, подходящих под образец (без перебора)"""
+        candidates = [len(self._relations)]
+        if from_node is not None:
+            candidates.append(len(self._outgoing.get(from_node, ())))
+        if to_node is not None:
+            candidates.append(len(self._incoming.get(to_node, ())))
+        if relation_type is not None:
+            candidates.append(len(self._by_type.get(relation_type, ())))
+        return min(candidates)
+
+    def neighbors(self, name):
+        """Соседние узлы (с повторами для кратных связей)"""
+        for from_node, to_node, _ in self._outgoing.get(name, {}):
+            yield to_node
+        for from_node, to_node, _ in self._incoming.get(name, {}):
+            yield from_node
+
+    def degree(self, name):
+        """Число связей, инцидентных узлу"""
+        return len(self._outgoing.get(name, ())) + len(self._incoming.get(name, ()))
+
+    def clear(self):
+        """Очистка сети; подписчики получают прежнее состояние (см. restore)"""
+        state = self._state()
+        # Контейнеры заменяются новыми, а не очищаются, поэтому прежнее
+        # состояние можно сохранить без копирования
+        self._reset_storage()
+        self._notify("cleared", state)
+
+    def restore(self, state):
+        """Возврат состояния, переданного подписчикам событием "cleared" """
+        self.clear()
+        (self._ids, self._names, self._free_ids, self._types, self._xs, self._ys,
+         self._type_codes, self._type_names, self._relation_types, self._relations,
+         self._outgoing, self._incoming, self._by_type) = state
+        self._notify("reset")
+
+    def load_columns(self, names, types, xs, ys, relation_from, relation_to, relation_types):
+        """Замена содержимого сети столбцами узлов и связей (быстрая загрузка файла)
+
+        Связи заданы тремя списками: имена начал и концов и типы. Все
+        проверки выполняются до очистки сети, поэтому при ошибке (ValueError)
+        сеть не меняется. Индексы строятся без вызова add_node/add_relation
+        для каждого элемента.
+        """
+        ids = dict(zip(names, range(len(names))))
+        if len(ids) != len(names):
+            raise ValueError("Повторяющиеся имена узлов")
+        if not ids.keys() >= set(relation_from) or not ids.keys() >= set(relation_to):
+            raise ValueError("Связь ссылается на несуществующий узел")
+        type_codes = {}
+        type_names = []
+        for node_type in dict.fromkeys(types):
+            type_codes[node_type] = len(type_names)
+            type_names.append(node_type)
+        # Кортежи связей создаются без вызова Relation.__new__ для каждой связи
+        relation_list = list(map(tuple.__new__, repeat(Relation), zip(relation_from, relation_to, relation_types)))
+        relations = dict(zip(relation_list, relation_list))
+        if len(relations) != len(relation_list):
+            raise ValueError("Повторяющиеся связи")
+        outgoing = defaultdict(dict)
+        incoming = defaultdict(dict)
+        by_type = defaultdict(dict)
+        for relation in relation_list:
+            from_node, to_node, relation_type = relation
+            outgoing[from_node][relation] = relation
+            incoming[to_node][relation] = relation
+            by_type[relation_type][relation] = relation
+
+        with self.bulk():
+            self.clear()
+            self._ids = ids
+            self._names = list(names)
+            self._types = array("I", map(type_codes.__getitem__, types))
+            self._xs = array("d", xs)
+            self._ys = array("d", ys)
+            self._type_codes = type_codes
+            self._type_names = type_names
+            self._relation_types = {relation_type: relation_type for relation_type in by_type}
+            self._relations = relations
+            self._outgoing = dict(outgoing)
+            self._incoming = dict(incoming)
+            self._by_type = dict(by_type)
+
+    def load(self, nodes, relations):
+        """Замена содержимого сети копией переданных узлов и связей"""
+        with self.bulk():
+            self.clear()
+            for name, data in nodes.items():
+                self.add_node(name, data["type"], data["x"], data["y"])
+            for relation in relations:
+                self.add_relation(relation["from"], relation["to"], relation["type"])
+
+
+def relation_key(relation):
+    """Ключ связи (от, к, тип)"""
+    return (relation["from"], relation["to"], relation["type"])
+
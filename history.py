@@ -0,0 +1,254 @@
+from array import array
+from collections import deque
+from contextlib import contextmanager
+
+# Записи, соседние экземпляры которых в одном шаге сливаются в одну
+GROUPED_RECORDS = ("nodes_added", "relations_added", "positions", "frames_added", "frame_positions")
+
+
+class _Step:
+    """Шаг истории: обратные изменения в порядке их появления"""
+
+    __slots__ = ("records", "merge_key", "sealed")
+
+    def __init__(self):
+        self.records = []
+        self.merge_key = None
+        # Модели, состояние которых в шаге уже сохранено целиком
+        self.sealed = set()
+
+
+class History:
+    """Отмена и повтор изменений сети и фреймов
+
+    Вместо копий всей сети хранятся только обратные изменения (дельты),
+    полученные из событий моделей. Перемещения узлов одного шага
+    записываются в компактные массивы координат, поэтому авторазмещение
+    большой сети - одна запись. Очистка и загрузка сети сохраняют прежние
+    контейнеры модели без копирования. Глубина истории ограничена depth.
+    """
+
+    def __init__(self, graph, frame_store, depth=100):
+        self.graph = graph
+        self.frame_store = frame_store
+        self._undo = deque(maxlen=depth)
+        self._redo = deque(maxlen=depth)
+        self._step = _Step()
+        # Вложенность блоков muted(): изменения внутри них не записываются
+        self._muted = 0
+        graph.subscribe(self.on_graph_event, during_bulk=True)
+        frame_store.subscribe(self.on_frames_event, during_bulk=True)
+
+    @property
+    def depth(self):
+        return self._undo.maxlen
+
+    def can_undo(self):
+        return bool(self._undo or self._step.records)
+
+    def can_redo(self):
+        return bool(self._redo) and not self._step.records
+
+    def clear(self):
+        """Забыть всю историю"""
+        self._undo.clear()
+        self._redo.clear()
+        self._step = _Step()
+
+    @contextmanager
+    def muted(self):
+        """Изменения, не попадающие в историю (например, данные, пересчитываемые по сети)"""
+        self._muted += 1
+        try:
+            yield self
+        finally:
+            self._muted -= 1
+
+    def _record(self, kind, *values):
+        """Добавление обратного изменения в текущий шаг"""
+        if self._muted:
+            return
+        records = self._step.records
+        if kind in GROUPED_RECORDS:
+            if records and records[-1][0] == kind:
+                last = records[-1]
+                for column, value in zip(last[1:], values):
+                    column.append(value)
+                return
+            if kind in ("positions", "frame_positions"):
+                records.append([kind, [values[0]], array("d", [values[1]]), array("d", [values[2]])])
+            else:
+                records.append([kind, [values[0]]])
+            return
+        records.append([kind, *values])
+
+    def on_graph_event(self, event, *args):
+        """Запись обратных изменений сети"""
+        if "graph" in self._step.sealed:
+            return  # например, добавление узлов при загрузке после очистки
+        if event == "node_added":
+            self._record("nodes_added", args[0])
+        elif event == "node_removed":
+            self._record("node_removed", *args)
+        elif event == "node_moved":
+            self._record("positions", *args)
+        elif event == "node_changed":
+            self._record("node_type", *args)
+        elif event == "relation_added":
+            relation = args[0]
+            self._record("relations_added", (relation["from"], relation["to"], relation["type"]))
+        elif event == "relation_removed":
+            self._record("relation_removed", args[0])
+        elif event == "cleared":
+            self._record("graph_state", args[0])
+            self._step.sealed.add("graph")
+
+    def on_frames_event(self, event, *args):
+        """Запись обратных изменений фреймов"""
+        if "frames" in self._step.sealed:
+            return
+        if event == "frame_added":
+            self._record("frames_added", args[0])
+        elif event == "frame_removed":
+            self._record("frame_removed", *args)
+        elif event == "frame_moved":
+            self._record("frame_positions", *args)
+        elif event == "slot_changed":
+            self._record("slot", *args)
+        elif event == "cleared":
+            self._record("frames_state", args[0])
+            self._step.sealed.add("frames")
+
+    def commit(self, merge_key=None):
+        """Завершение текущего шага
+
+        Шаги с одинаковым merge_key, состоящие только из перемещений узлов
+        (например, промежуточные результаты одного авторазмещения), сливаются
+        в один: для каждого узла сохраняется самая ранняя позиция.
+        """
+        step = self._step
+        if not step.records:
+            return
+        self._step = _Step()
+        step.merge_key = merge_key
+        self._redo.clear()
+        if merge_key is not None and self._undo and self._undo[-1].merge_key == merge_key:
+            last = self._undo[-1]
+            if _only_positions(last) and _only_positions(step):
+                _merge_positions(last.records[0], step.records)
+                return
+        self._undo.append(step)
+
+    def rollback(self):
+        """Отмена изменений незавершенного шага без возможности повтора
+
+        Используется, когда действие прервано ошибкой и его частичный
+        результат не должен ни остаться в моделях, ни попасть в историю.
+        """
+        step, self._step = self._step, _Step()
+        with self.muted():
+            for record in reversed(step.records):
+                self._apply(record)
+
+    def undo(self):
+        """Отмена последнего шага; False, если отменять нечего"""
+        self.commit()
+        if not self._undo:
+            return False
+        self._replay(self._undo.pop(), self._redo)
+        return True
+
+    def redo(self):
+        """Повтор отмененного шага; False, если повторять нечего"""
+        if self._step.records or not self._redo:
+            return False
+        self._replay(self._redo.pop(), self._undo)
+        return True
+
+    def _replay(self, step, target):
+        """Применение обратных изменений шага; их обратные изменения уходят в target"""
+        try:
+            for record in reversed(step.records):
+                self._apply(record)
+        finally:
+            reverse, self._step = self._step, _Step()
+            if reverse.records:
+                target.append(reverse)
+
+    def _apply(self, record):
+        """Применение одной обратной записи
+
+        Записи, уже не соответствующие моделям (например, слот, удаленный
+        изменением, которое не попадает в историю), пропускаются, чтобы
+        шаг не был применен наполовину.
+        """
+        graph = self.graph
+        frame_store = self.frame_store
+        kind = record[0]
+        if kind == "nodes_added":
+            for name in reversed(record[1]):
+                if graph.has_node(name):
+                    graph.remove_node(name)
+        elif kind == "node_removed":
+            _, name, node = record
+            if not graph.has_node(name):
+                graph.add_node(name, node["type"], node["x"], node["y"])
+        elif kind == "positions":
+            # Обратный порядок: для повторно сдвинутого узла побеждает самая ранняя позиция
+            _, names, xs, ys = record
+            for i in range(len(names) - 1, -1, -1):
+                if graph.has_node(names[i]):
+                    graph.move_node(names[i], xs[i], ys[i])
+        elif kind == "node_type":
+            if graph.has_node(record[1]):
+                graph.set_node_type(record[1], record[2])
+        elif kind == "relations_added":
+            for key in reversed(record[1]):
+                if graph.has_relation(*key):
+                    graph.remove_relation(*key)
+        elif kind == "relation_removed":
+            from_node, to_node, relation_type = record[1]
+            if (graph.has_node(from_node) and graph.has_node(to_node)
+                    and not graph.has_relation(from_node, to_node, relation_type)):
+                graph.add_relation(from_node, to_node, relation_type)
+        elif kind == "graph_state":
+            graph.restore(record[1])
+        elif kind == "frames_added":
+            for name in reversed(record[1]):
+                if name in frame_store:
+                    frame_store.delete_frame(name)
+        elif kind == "frame_removed":
+            _, name, frame = record
+            if name not in frame_store:
+                frame_store.create_frame(name, frame["type"], frame["x"], frame["y"], frame["slots"])
+        elif kind == "frame_positions":
+            _, names, xs, ys = record
+            for i in range(len(names) - 1, -1, -1):
+                if names[i] in frame_store:
+                    frame_store.move_frame(names[i], xs[i], ys[i])
+        elif kind == "slot":
+            _, name, slot_name, old_value = record
+            if name in frame_store:
+                if old_value is not None:
+                    frame_store.set_slot(name, slot_name, old_value)
+                elif slot_name in frame_store.frames[name]["slots"]:
+                    frame_store.remove_slot(name, slot_name)
+        elif kind == "frames_state":
+            frame_store.restore(record[1])
+
+
+def _only_positions(step):
+    """Шаг состоит из одной записи перемещений узлов"""
+    return len(step.records) == 1 and step.records[0][0] == "positions"
+
+
+def _merge_positions(target, records):
+    """Дополнение записи перемещений позициями узлов, которых в ней еще нет"""
+    known = set(target[1])
+    for _, names, xs, ys in records:
+        for name, x, y in zip(names, xs, ys):
+            if name not in known:
+                known.add(name)
+                target[1].append(name)
+                target[2].append(x)
+                target[3].append(y)
@@ -0,0 +1,119 @@
+IS_A = "является"
+# Связи, которые наследуются потомками от предков по цепочке "является"
+INHERITED_RELATIONS = ("имеет", "умеет")
+
+
+class InheritanceIndex:
+    """Транзитивное замыкание связей "является" с инкрементальным обновлением
+
+    Для каждого узла хранятся множества всех предков и всех потомков,
+    поэтому проверка "X является Y" выполняется за O(1), а перечисление
+    унаследованных свойств - за время, пропорциональное ответу. При
+    добавлении или удалении связи пересчитываются только затронутые узлы.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self._ancestors = {}
+        self._descendants = {}
+        self.rebuild()
+        graph.subscribe(self.on_graph_event)
+
+    def rebuild(self):
+        """Полное построение индекса по сети"""
+        self._ancestors = {}
+        self._descendants = {}
+        for relation in self.graph.relations_of_type(IS_A):
+            self._link(relation["from"], relation["to"])
+
+    def on_graph_event(self, event, *args):
+        """Поддержка индекса при изменениях сети"""
+        if event in ("cleared", "reset"):
+            self.rebuild()
+        elif event == "relation_added" and args[0]["type"] == IS_A:
+            self._link(args[0]["from"], args[0]["to"])
+        elif event == "relation_removed" and args[0]["type"] == IS_A:
+            self._unlink(args[0]["from"], args[0]["to"])
+        elif event == "node_removed":
+            # Связи узла к этому моменту уже удалены
+            self._ancestors.pop(args[0], None)
+            self._descendants.pop(args[0], None)
+
+    def _parents(self, name):
+        """Непосредственные предки узла"""
+        return [relation["to"] for relation in self.graph.outgoing(name, IS_A)]
+
+    def _link(self, child, parent):
+        """Добавление связи child -> parent в замыкание"""
+        new_ancestors = {parent} | self._ancestors.get(parent, set())
+        new_descendants = {child} | self._descendants.get(child, set())
+        for node in new_descendants:
+            self._ancestors.setdefault(node, set()).update(new_ancestors)
+        for node in new_ancestors:
+            self._descendants.setdefault(node, set()).update(new_descendants)
+
+    def _unlink(self, child, parent):
+        """Удаление связи child -> parent: пересчет предков child и его потомков"""
+        affected = {child} | self._descendants.get(child, set())
+        old_ancestors = {node: self._ancestors.get(node, set()) for node in affected}
+
+        # Пересчет в топологическом порядке: сначала узлы, чьи предки вне affected
+        pending = {node: sum(1 for p in self._parents(node) if p in affected) for node in affected}
+        ready = [node for node, count in pending.items() if count == 0]
+        recomputed = set()
+        while ready:
+            node = ready.pop()
+            recomputed.add(node)
+            ancestors = set()
+            for p in self._parents(node):
+                ancestors.add(p)
+                ancestors |= self._ancestors.get(p, set())
+            self._ancestors[node] = ancestors
+            for relation in self.graph.incoming(node, IS_A):
+                other = relation["from"]
+                if other in pending and other not in recomputed:
+                    pending[other] -= 1
+                    if pending[other] == 0:
+                        ready.append(other)
+        if len(recomputed) != len(affected):
+            # Цикл в иерархии - пересчитываем индекс целиком
+            self.rebuild()
+            return
+
+        for node in affected:
+            lost = old_ancestors[node] - self._ancestors[node]
+            for ancestor in lost:
+                descendants = self._descendants.get(ancestor)
+                if descendants is not None:
+                    descendants.discard(node)
+
+    def is_a(self, name, class_name):
+        """Является ли name (транзитивно) подклассом или экземпляром class_name"""
+        return class_name in self._ancestors.get(name, ())
+
+    def ancestors(self, name):
+        """Все предки узла по цепочке "является" """
+        return set(self._ancestors.get(name, ()))
+
+    def descendants(self, name):
+        """Все потомки узла по цепочке "является" """
+        return set(self._descendants.get(name, ()))
+
+    def inherited(self, name, relation_types=INHERITED_RELATIONS):
+        """Свойства, унаследованные от предков: список (тип связи, значение, от кого)"""
+        result = []
+        for ancestor in self._ancestors.get(name, ()):
+            for relation in self.graph.outgoing(ancestor):
+                if relation["type"] in relation_types:
+                    result.append((relation["type"], relation["to"], ancestor))
+        return result
+
+    def properties(self, name, relation_types=INHERITED_RELATIONS):
+        """Собственные и унаследованные свойства: {тип связи: множество значений}"""
+        result = {}
+        for relation in self.graph.outgoing(name):
+            if relation["type"] in relation_types:
+                result.setdefault(relation["type"], set()).add(relation["to"])
+        for relation_type, value, _ in self.inherited(name, relation_types):
+            result.setdefault(relation_type, set()).add(value)
+        return result
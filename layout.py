@@ -0,0 +1,647 @@
+import math
+
+# Параметры силовой модели (совпадают с исходным алгоритмом редактора)
+REPULSION = 1000
+ATTRACTION = 0.1
+STEP = 0.1
+MAX_MOVE = 10
+MIN_DISTANCE = 0.1
+
+MODE_EXACT = "exact"
+MODE_BARNES_HUT = "barnes_hut"
+MODE_VECTORIZED = "numpy"
+MODE_GRID = "grid"
+# Иерархическое размещение - не силовой режим, итераций у него нет
+MODE_HIERARCHY = "hierarchy"
+# Связь, по которой строятся уровни иерархического размещения
+HIERARCHY_RELATION = "является"
+
+# До этого числа узлов автоматический режим использует точный алгоритм
+EXACT_MODE_LIMIT = 300
+# До этого числа узлов (при наличии NumPy) - векторизованный точный расчет сил
+VECTORIZED_MODE_LIMIT = 4000
+# Сколько строк матрицы попарных расстояний считается за один проход
+VECTORIZED_CHUNK = 1024
+# Ячеечное приближение: наименьшее среднее число точек в ячейке и число пар ближних
+# точек, обрабатываемых за один проход
+GRID_CELL_POINTS = 8
+GRID_PAIR_CHUNK = 1 << 20
+# Модуль NumPy после первой попытки импорта (False - попытки еще не было)
+_numpy_module = False
+
+
+def _numpy():
+    """Модуль NumPy или None, если он не установлен
+
+    NumPy импортируется при первом обращении, а не при импорте модуля:
+    небольшим сетям он не нужен, а его импорт - заметная часть времени
+    запуска консольной утилиты.
+    """
+    global _numpy_module
+    if _numpy_module is False:
+        try:
+            import numpy
+        except ImportError:  # векторизованные режимы доступны только с NumPy
+            numpy = None
+        _numpy_module = numpy
+    return _numpy_module
+
+
+def choose_mode(node_count):
+    """Выбор алгоритма размещения по размеру сети"""
+    if node_count <= EXACT_MODE_LIMIT:
+        return MODE_EXACT
+    if _numpy() is None:
+        return MODE_BARNES_HUT
+    if node_count <= VECTORIZED_MODE_LIMIT:
+        return MODE_VECTORIZED
+    return MODE_GRID
+
+
+def build_snapshot(graph):
+    """Снимок сети для алгоритмов размещения: имена, координаты и списки смежности"""
+    names, xs, ys = graph.positions()
+    index = {name: i for i, name in enumerate(names)}
+    adjacency = [[index[other] for other in graph.neighbors(name)] for name in names]
+    return names, xs, ys, adjacency
+
+
+def layered_positions(graph, width, height, margin=80):
+    """Начальная расстановка по типам: классы вверху, объекты посередине, свойства внизу
+
+    Возвращает имена и координаты только тех узлов, тип которых известен.
+    """
+    rows = (("класс", margin), ("объект", height / 2), ("свойство", height - margin))
+    names, xs, ys = [], [], []
+    for node_type, row_y in rows:
+        row = [name for name in graph.nodes if graph.node_type(name) == node_type]
+        spacing = width / (len(row) + 1)
+        for i, name in enumerate(row):
+            names.append(name)
+            xs.append(spacing * (i + 1))
+            ys.append(row_y)
+    return names, xs, ys
+
+
+def _rank_hierarchy(count, parents, children, roots):
+    """Уровни узлов иерархии: самый длинный путь от корня (циклы разрываются)"""
+    remaining = [len(node_parents) for node_parents in parents]
+    rank = [0] * count
+    processed = [False] * count
+    order = []
+
+    def visit(queue):
+        for node in queue:
+            if processed[node]:
+                continue
+            processed[node] = True
+            order.append(node)
+            for child in children[node]:
+                # Связь к уже размещенному узлу - обратная связь цикла, она не учитывается
+                if processed[child]:
+                    continue
+                rank[child] = max(rank[child], rank[node] + 1)
+                remaining[child] -= 1
+                if remaining[child] <= 0:
+                    queue.append(child)
+
+    def on_cycle(node):
+        """Узел цикла, из-за которого node не освобождается"""
+        seen = set()
+        while node not in seen:
+            seen.add(node)
+            node = next(parent for parent in parents[node] if not processed[parent])
+        return node
+
+    visit([node for node in roots if not remaining[node]])
+    # Узлы на циклах "является" (и ниже них) не освобождаются - цикл
+    # разрывается в одном из его узлов, и обход продолжается
+    for node in roots:
+        if not processed[node]:
+            visit([on_cycle(node)])
+    return rank, order
+
+
+def _barycenter_sort(layer, neighbors, position):
+    """Упорядочение слоя по среднему положению соседей в других слоях"""
+    def key(node):
+        adjacent = neighbors[node]
+        if not adjacent:
+            return position[node]
+        return sum(position[other] for other in adjacent) / len(adjacent)
+
+    layer.sort(key=key)
+    size = len(layer)
+    for k, node in enumerate(layer):
+        position[node] = (k + 0.5) / size
+
+
+def hierarchical_positions(graph, width, margin=80, node_gap=220, row_gap=70, layer_gap=160, sweeps=4):
+    """Послойное размещение иерархии "является": родители выше потомков
+
+    Уровень узла - длина самого длинного пути от корня иерархии. Порядок
+    в слоях подбирается барицентрическими проходами вниз и вверх, чтобы
+    уменьшить пересечения связей; слои шире области переносятся на
+    несколько строк. Узлы вне иерархии, на которые ссылаются узлы
+    иерархии (например, свойства), ставятся сразу за своим владельцем.
+    Каждый проход - O(E + V log V).
+    """
+    names = list(graph.nodes)
+    count = len(names)
+    if not count:
+        return [], [], []
+    index = {name: i for i, name in enumerate(names)}
+    parents = [[] for _ in range(count)]
+    children = [[] for _ in range(count)]
+    in_hierarchy = [False] * count
+    for relation in graph.relations_of_type(HIERARCHY_RELATION):
+        child, parent = index[relation["from"]], index[relation["to"]]
+        if child != parent:
+            parents[child].append(parent)
+            children[parent].append(child)
+            in_hierarchy[child] = in_hierarchy[parent] = True
+
+    # Узел вне иерархии прикрепляется к первому узлу иерархии, который на него ссылается
+    attached = {}
+    roots = []
+    for i in range(count):
+        if not in_hierarchy[i]:
+            owner = next((index[relation["from"]] for relation in graph.incoming(names[i])
+                          if in_hierarchy[index[relation["from"]]]), None)
+            if owner is not None:
+                attached.setdefault(owner, []).append(i)
+                continue
+        roots.append(i)
+
+    rank, order = _rank_hierarchy(count, parents, children, roots)
+    layers = [[] for _ in range(max(rank[node] for node in order) + 1)]
+    # Начальный порядок - порядок обхода, потомки рядом с родителями
+    for node in order:
+        layers[rank[node]].append(node)
+
+    position = [0.0] * count
+    for layer in layers:
+        for k, node in enumerate(layer):
+            position[node] = (k + 0.5) / len(layer)
+    for _ in range(sweeps):
+        for layer in layers[1:]:
+            _barycenter_sort(layer, parents, position)
+        for layer in reversed(layers[:-1]):
+            _barycenter_sort(layer, children, position)
+
+    # Перенос широких слоев на строки одинаковой ширины
+    columns = max(1, int((width - 2 * margin) // node_gap) + 1, math.ceil(math.sqrt(count)))
+    rows = []
+    for layer in layers:
+        sequence = []
+        for node in layer:
+            sequence.append(node)
+            sequence.extend(attached.get(node, ()))
+        rows.append([sequence[start:start + columns] for start in range(0, len(sequence), columns)])
+    widest = max(len(row) for layer_rows in rows for row in layer_rows)
+
+    result_names, xs, ys = [], [], []
+    y = margin
+    for layer_rows in rows:
+        for row in layer_rows:
+            x = margin + (widest - len(row)) * node_gap / 2
+            for node in row:
+                result_names.append(names[node])
+                xs.append(x)
+                ys.append(y)
+                x += node_gap
+            y += row_gap
+        y += layer_gap - row_gap
+    return result_names, xs, ys
+
+
+def _clamp_move(fx, fy):
+    """Ограничение перемещения узла за одну итерацию"""
+    move_x = min(max(fx * STEP, -MAX_MOVE), MAX_MOVE)
+    move_y = min(max(fy * STEP, -MAX_MOVE), MAX_MOVE)
+    return move_x, move_y
+
+
+def _attraction(i, xs, ys, adjacency):
+    """Суммарная сила притяжения узла к связанным узлам"""
+    fx, fy = 0.0, 0.0
+    x, y = xs[i], ys[i]
+    for j in adjacency[i]:
+        dx = xs[j] - x
+        dy = ys[j] - y
+        distance = max(math.sqrt(dx*dx + dy*dy), MIN_DISTANCE)
+        force = distance * ATTRACTION
+        fx += force * dx / distance
+        fy += force * dy / distance
+    return fx, fy
+
+
+def exact_step(xs, ys, adjacency, bounds):
+    """Одна итерация исходного O(N²) алгоритма; узлы сдвигаются сразу по мере обхода"""
+    min_x, min_y, max_x, max_y = bounds
+    count = len(xs)
+    total_move = 0.0
+    for i in range(count):
+        fx, fy = 0.0, 0.0
+        x, y = xs[i], ys[i]
+
+        # Отталкивание от всех остальных узлов
+        for j in range(count):
+            if i != j:
+                dx = x - xs[j]
+                dy = y - ys[j]
+                distance = max(math.sqrt(dx*dx + dy*dy), MIN_DISTANCE)
+                force = REPULSION / (distance * distance)
+                fx += force * dx / distance
+                fy += force * dy / distance
+
+        ax, ay = _attraction(i, xs, ys, adjacency)
+        move_x, move_y = _clamp_move(fx + ax, fy + ay)
+
+        new_x = max(min_x, min(max_x, x + move_x))
+        new_y = max(min_y, min(max_y, y + move_y))
+        total_move += abs(new_x - x) + abs(new_y - y)
+        xs[i] = new_x
+        ys[i] = new_y
+    return total_move
+
+
+class QuadTree:
+    """Квадродерево с центрами масс для приближения Barnes–Hut
+
+    Вершины хранятся в параллельных списках и строятся обходом со стеком,
+    без рекурсии. Точки листа сгруппированы по координатам: совпадающие
+    точки (например, прижатые к углу области) - одна группа, поэтому их
+    взаимодействие не растет квадратично с числом точек.
+    """
+
+    def __init__(self, xs, ys, leaf_size=8, min_half_size=MIN_DISTANCE):
+        self.xs = xs
+        self.ys = ys
+        self.leaf_size = leaf_size
+        self.min_half_size = min_half_size
+        # Параллельные списки вершин дерева; у листа groups - список (x, y, номера точек)
+        self.center_x = []
+        self.center_y = []
+        self.mass = []
+        self.half_size = []
+        self.box_x = []
+        self.box_y = []
+        self.children = []
+        self.groups = []
+
+        if not xs:
+            return
+        min_x, max_x = min(xs), max(xs)
+        min_y, max_y = min(ys), max(ys)
+        half = max(max_x - min_x, max_y - min_y, 1.0) / 2
+        self._build(list(range(len(xs))), (min_x + max_x) / 2, (min_y + max_y) / 2, half)
+
+    def _add(self, indices, box_x, box_y, half):
+        """Новая вершина по списку точек (пока без разбиения)"""
+        node = len(self.mass)
+        mass = len(indices)
+        self.center_x.append(sum(map(self.xs.__getitem__, indices)) / mass)
+        self.center_y.append(sum(map(self.ys.__getitem__, indices)) / mass)
+        self.mass.append(mass)
+        self.half_size.append(half)
+        self.box_x.append(box_x)
+        self.box_y.append(box_y)
+        self.children.append(None)
+        self.groups.append(indices)
+        return node
+
+    def _build(self, indices, box_x, box_y, half):
+        """Построение дерева: вершины разбиваются на квадранты, пока точек в них больше leaf_size"""
+        xs, ys = self.xs, self.ys
+        stack = [self._add(indices, box_x, box_y, half)]
+        while stack:
+            node = stack.pop()
+            indices = self.groups[node]
+            half = self.half_size[node]
+            if len(indices) <= self.leaf_size or half <= self.min_half_size:
+                groups = {}
+                for i in indices:
+                    groups.setdefault((xs[i], ys[i]), []).append(i)
+                self.groups[node] = [(x, y, members) for (x, y), members in groups.items()]
+                continue
+            box_x, box_y = self.box_x[node], self.box_y[node]
+            quadrants = ([], [], [], [])
+            for i in indices:
+                quadrants[(xs[i] >= box_x) + 2 * (ys[i] >= box_y)].append(i)
+            quarter = half / 2
+            children = []
+            for q, part in enumerate(quadrants):
+                if part:
+                    child_x = box_x + (quarter if q & 1 else -quarter)
+                    child_y = box_y + (quarter if q & 2 else -quarter)
+                    children.append(self._add(part, child_x, child_y, quarter))
+            self.children[node] = children
+            self.groups[node] = None
+            stack.extend(children)
+
+    def interaction_lists(self, theta):
+        """Для каждого листа: его группы точек, далёкие вершины (по центру масс) и близкие листья"""
+        result = []
+        if not self.mass:
+            return result
+        children, groups = self.children, self.groups
+        leaves = [node for node, node_groups in enumerate(groups) if node_groups is not None]
+        for leaf in leaves:
+            leaf_x, leaf_y = self.box_x[leaf], self.box_y[leaf]
+            # Радиус листа учитывается, чтобы решение было верным для всех его точек
+            leaf_radius = self.half_size[leaf] * 1.4143
+            far = []
+            near = []
+            stack = [0]
+            while stack:
+                node = stack.pop()
+                if node == leaf:
+                    near.append(node)
+                    continue
+                dx = self.center_x[node] - leaf_x
+                dy = self.center_y[node] - leaf_y
+                distance = math.sqrt(dx*dx + dy*dy) - leaf_radius
+                if distance > 0 and 2 * self.half_size[node] < theta * distance:
+                    far.append(node)
+                elif groups[node] is not None:
+                    near.append(node)
+                else:
+                    stack.extend(children[node])
+            result.append((groups[leaf], far, near))
+        return result
+
+
+def barnes_hut_forces(xs, ys, adjacency, theta=0.8):
+    """Суммарные силы (отталкивание по квадродереву и притяжение) для всех узлов"""
+    tree = QuadTree(xs, ys)
+    center_x, center_y, mass, groups = tree.center_x, tree.center_y, tree.mass, tree.groups
+    forces = [None] * len(xs)
+    min_distance_sq = MIN_DISTANCE * MIN_DISTANCE
+    sqrt = math.sqrt
+
+    for leaf_groups, far, near in tree.interaction_lists(theta):
+        # Далёкие вершины - по центру масс, близкие точки - группами совпадающих
+        cells = [(center_x[node], center_y[node], mass[node]) for node in far]
+        for node in near:
+            cells.extend((x, y, len(members)) for x, y, members in groups[node])
+        for x, y, members in leaf_groups:
+            fx, fy = 0.0, 0.0
+            for cx, cy, m in cells:
+                dx = x - cx
+                dy = y - cy
+                # Для совпадающих точек dx = dy = 0, и вклад нулевой (как в точном режиме)
+                distance_sq = dx*dx + dy*dy
+                if distance_sq < min_distance_sq:
+                    distance_sq = min_distance_sq
+                force = m * REPULSION / (distance_sq * sqrt(distance_sq))
+                fx += force * dx
+                fy += force * dy
+            for i in members:
+                # Притяжение (distance * ATTRACTION) * dx / distance = ATTRACTION * dx
+                adjacent = adjacency[i]
+                forces[i] = (fx + ATTRACTION * (sum(map(xs.__getitem__, adjacent)) - x * len(adjacent)),
+                             fy + ATTRACTION * (sum(map(ys.__getitem__, adjacent)) - y * len(adjacent)))
+    return forces
+
+
+def barnes_hut_step(xs, ys, adjacency, bounds, theta=0.8):
+    """Одна итерация с приближённым отталкиванием по квадродереву, O(N log N)"""
+    min_x, min_y, max_x, max_y = bounds
+    # Все узлы сдвигаются одновременно после расчета сил
+    total_move = 0.0
+    for i, (fx, fy) in enumerate(barnes_hut_forces(xs, ys, adjacency, theta)):
+        move_x, move_y = _clamp_move(fx, fy)
+        new_x = max(min_x, min(max_x, xs[i] + move_x))
+        new_y = max(min_y, min(max_y, ys[i] + move_y))
+        total_move += abs(new_x - xs[i]) + abs(new_y - ys[i])
+        xs[i] = new_x
+        ys[i] = new_y
+    return total_move
+
+
+def pack_edges(adjacency):
+    """Списки смежности в виде массивов индексов (узел, сосед)"""
+    np = _numpy()
+    counts = [len(neighbors) for neighbors in adjacency]
+    owners = np.repeat(np.arange(len(adjacency), dtype=np.intp), counts)
+    others = np.fromiter((j for neighbors in adjacency for j in neighbors), dtype=np.intp, count=sum(counts))
+    return owners, others
+
+
+def _move_nodes(x, y, fx, fy, owners, others, bounds):
+    """Добавление притяжения к силам отталкивания и сдвиг всех узлов; x, y изменяются на месте"""
+    np = _numpy()
+    min_x, min_y, max_x, max_y = bounds
+    count = len(x)
+    # Притяжение: (distance * ATTRACTION) * dx / distance = ATTRACTION * dx
+    fx += np.bincount(owners, weights=ATTRACTION * (x[others] - x[owners]), minlength=count)
+    fy += np.bincount(owners, weights=ATTRACTION * (y[others] - y[owners]), minlength=count)
+
+    new_x = np.clip(x + np.clip(fx * STEP, -MAX_MOVE, MAX_MOVE), min_x, max_x)
+    new_y = np.clip(y + np.clip(fy * STEP, -MAX_MOVE, MAX_MOVE), min_y, max_y)
+    total_move = float(np.abs(new_x - x).sum() + np.abs(new_y - y).sum())
+    x[:] = new_x
+    y[:] = new_y
+    return total_move
+
+
+def vectorized_forces(x, y):
+    """Точные силы отталкивания на массивах NumPy"""
+    np = _numpy()
+    count = len(x)
+    fx = np.empty(count)
+    fy = np.empty(count)
+    # Попарные расстояния считаются блоками строк, чтобы ограничить память
+    for start in range(0, count, VECTORIZED_CHUNK):
+        stop = min(start + VECTORIZED_CHUNK, count)
+        dx = x[start:stop, None] - x[None, :]
+        dy = y[start:stop, None] - y[None, :]
+        distance = np.maximum(np.sqrt(dx*dx + dy*dy), MIN_DISTANCE)
+        # Для самого узла dx = dy = 0, поэтому вклад диагонали нулевой
+        force = REPULSION / (distance * distance * distance)
+        fx[start:stop] = (force * dx).sum(axis=1)
+        fy[start:stop] = (force * dy).sum(axis=1)
+    return fx, fy
+
+
+def vectorized_step(x, y, owners, others, bounds):
+    """Одна итерация точного расчета сил на массивах NumPy; x, y изменяются на месте"""
+    fx, fy = vectorized_forces(x, y)
+    return _move_nodes(x, y, fx, fy, owners, others, bounds)
+
+
+def _near_pairs(entry_points, entry_starts, entry_counts, order):
+    """Пары (точка, ближняя точка) блоками не больше GRID_PAIR_CHUNK пар
+
+    Запись - точка и отрезок [start, start + count) списка order с точками
+    одной из соседних ячеек.
+    """
+    np = _numpy()
+    ends = np.cumsum(entry_counts)
+    first = 0
+    while first < len(ends):
+        done = ends[first - 1] if first else 0
+        last = max(int(np.searchsorted(ends, done + GRID_PAIR_CHUNK, side="right")), first + 1)
+        counts = entry_counts[first:last]
+        rows = np.repeat(entry_points[first:last], counts)
+        offsets = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+        yield rows, order[np.repeat(entry_starts[first:last], counts) + offsets]
+        first = last
+
+
+def grid_forces(x, y):
+    """Силы отталкивания в ячеечном приближении на массивах NumPy
+
+    Совпадающие точки объединяются в одну с массой. Область делится на
+    квадратные ячейки; точки своей и соседних ячеек (3×3) отталкиваются
+    точно, а дальние ячейки действуют через центр масс: сила и ее
+    производные считаются для пар ячеек и переносятся на точки ячейки
+    по первому порядку разложения. Размер ячейки подбирается так, чтобы
+    ближних пар и пар ячеек было примерно поровну.
+    """
+    np = _numpy()
+    positions, inverse, mass = np.unique(x + 1j * y, return_inverse=True, return_counts=True)
+    px, py = positions.real, positions.imag
+    count = len(positions)
+    min_x, min_y = px.min(), py.min()
+    width, height = px.max() - min_x, py.max() - min_y
+    cell_points = max(GRID_CELL_POINTS, (count / 9) ** (1 / 3))
+    size = max(math.sqrt(width * height * cell_points / count), max(width, height) * cell_points / count,
+               MIN_DISTANCE)
+    column = ((px - min_x) // size).astype(np.intp)
+    row = ((py - min_y) // size).astype(np.intp)
+    columns = int(column.max()) + 1
+    cell = row * columns + column
+    order = np.argsort(cell, kind="stable")
+    occupied, starts, counts = np.unique(cell[order], return_index=True, return_counts=True)
+    rank = np.searchsorted(occupied, cell)
+
+    # Дальнее поле: ячейка на ячейку, кроме соседних
+    cell_mass = np.bincount(rank, weights=mass)
+    cell_x = np.bincount(rank, weights=mass * px) / cell_mass
+    cell_y = np.bincount(rank, weights=mass * py) / cell_mass
+    cell_column = occupied % columns
+    cell_row = occupied // columns
+    field = np.empty((5, len(occupied)))
+    chunk = max(1, GRID_PAIR_CHUNK // len(occupied))
+    for start in range(0, len(occupied), chunk):
+        stop = min(start + chunk, len(occupied))
+        dx = cell_x[start:stop, None] - cell_x[None, :]
+        dy = cell_y[start:stop, None] - cell_y[None, :]
+        distance_sq = np.maximum(dx*dx + dy*dy, MIN_DISTANCE * MIN_DISTANCE)
+        near = ((np.abs(cell_column[start:stop, None] - cell_column[None, :]) <= 1)
+                & (np.abs(cell_row[start:stop, None] - cell_row[None, :]) <= 1))
+        force = np.where(near, 0.0, cell_mass[None, :] * REPULSION / (distance_sq * np.sqrt(distance_sq)))
+        gradient = 3 * force / distance_sq
+        field[0, start:stop] = (force * dx).sum(axis=1)
+        field[1, start:stop] = (force * dy).sum(axis=1)
+        field[2, start:stop] = (force - gradient * dx * dx).sum(axis=1)
+        field[3, start:stop] = (-gradient * dx * dy).sum(axis=1)
+        field[4, start:stop] = (force - gradient * dy * dy).sum(axis=1)
+    shift_x = px - cell_x[rank]
+    shift_y = py - cell_y[rank]
+    fx = field[0, rank] + field[2, rank] * shift_x + field[3, rank] * shift_y
+    fy = field[1, rank] + field[3, rank] * shift_x + field[4, rank] * shift_y
+
+    # Ближнее поле: точно для точек своей и восьми соседних ячеек
+    entries = ([], [], [])
+    points = np.arange(count)
+    for column_offset in (-1, 0, 1):
+        for row_offset in (-1, 0, 1):
+            neighbor_column = column + column_offset
+            neighbor = cell + row_offset * columns + column_offset
+            found = np.searchsorted(occupied, neighbor)
+            found[found == len(occupied)] = 0
+            valid = ((occupied[found] == neighbor) & (neighbor_column >= 0) & (neighbor_column < columns))
+            entries[0].append(points[valid])
+            entries[1].append(starts[found[valid]])
+            entries[2].append(counts[found[valid]])
+    entry_points, entry_starts, entry_counts = (np.concatenate(part) for part in entries)
+    for rows, others in _near_pairs(entry_points, entry_starts, entry_counts, order):
+        dx = px[rows] - px[others]
+        dy = py[rows] - py[others]
+        # Для самой точки dx = dy = 0, поэтому ее вклад нулевой
+        distance = np.maximum(np.sqrt(dx*dx + dy*dy), MIN_DISTANCE)
+        force = mass[others] * REPULSION / (distance * distance * distance)
+        fx += np.bincount(rows, weights=force * dx, minlength=count)
+        fy += np.bincount(rows, weights=force * dy, minlength=count)
+    return fx[inverse], fy[inverse]
+
+
+def grid_step(x, y, owners, others, bounds):
+    """Одна итерация с ячеечным приближением отталкивания на массивах NumPy; x, y изменяются на месте"""
+    fx, fy = grid_forces(x, y)
+    return _move_nodes(x, y, fx, fy, owners, others, bounds)
+
+
+def vectorized_layout(xs, ys, adjacency, bounds, iterations, mode=MODE_VECTORIZED):
+    """Векторизованное размещение: координаты упаковываются в массивы и записываются обратно один раз"""
+    np = _numpy()
+    if np is None:
+        raise RuntimeError("Для векторизованного размещения требуется NumPy")
+    step = VECTORIZED_STEPS[mode]
+    x = np.array(xs, dtype=float)
+    y = np.array(ys, dtype=float)
+    owners, others = pack_edges(adjacency)
+    for _ in range(iterations):
+        step(x, y, owners, others, bounds)
+    xs[:] = x.tolist()
+    ys[:] = y.tolist()
+
+
+LAYOUT_STEPS = {
+    MODE_EXACT: exact_step,
+    MODE_BARNES_HUT: barnes_hut_step,
+}
+# Режимы, работающие с массивами NumPy
+VECTORIZED_STEPS = {
+    MODE_VECTORIZED: vectorized_step,
+    MODE_GRID: grid_step,
+}
+
+
+def available_modes():
+    """Режимы размещения, доступные в текущем окружении"""
+    modes = [MODE_EXACT, MODE_BARNES_HUT]
+    if _numpy() is not None:
+        modes.extend(VECTORIZED_STEPS)
+    return modes
+
+
+def iterate_layout(xs, ys, adjacency, bounds, mode=None):
+    """Пошаговое силовое размещение: после каждой итерации возвращает суммарное перемещение узлов
+
+    Координаты xs, ys обновляются на месте перед каждым возвратом значения.
+    """
+    if mode is None:
+        mode = choose_mode(len(xs))
+    if mode in VECTORIZED_STEPS:
+        np = _numpy()
+        if np is None:
+            raise RuntimeError("Для векторизованного размещения требуется NumPy")
+        step = VECTORIZED_STEPS[mode]
+        x = np.array(xs, dtype=float)
+        y = np.array(ys, dtype=float)
+        owners, others = pack_edges(adjacency)
+        while True:
+            total_move = step(x, y, owners, others, bounds)
+            xs[:] = x.tolist()
+            ys[:] = y.tolist()
+            yield total_move
+    step = LAYOUT_STEPS[mode]
+    while True:
+        yield step(xs, ys, adjacency, bounds)
+
+
+def force_directed_layout(xs, ys, adjacency, bounds, iterations=50, mode=None):
+    """Силовое размещение узлов; координаты xs, ys изменяются на месте"""
+    if mode is None:
+        mode = choose_mode(len(xs))
+    if mode in VECTORIZED_STEPS:
+        vectorized_layout(xs, ys, adjacency, bounds, iterations, mode)
+        return xs, ys
+    step = LAYOUT_STEPS[mode]
+    for _ in range(iterations):
+        step(xs, ys, adjacency, bounds)
+    return xs, ys
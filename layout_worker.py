@@ -0,0 +1,105 @@
+import threading
+import time
+
+import layout
+from profiling import Profiler
+
+
+class LayoutWorker:
+    """Фоновый расчет силового размещения над снимком сети
+
+    Расчет идет в отдельном потоке; главный поток периодически забирает
+    последние промежуточные координаты методом poll(), поэтому окно не
+    блокируется и сеть анимируется по мере сходимости. Расчет прекращается
+    досрочно, когда среднее перемещение узла за итерацию падает ниже tolerance.
+    После cancel() координаты больше не публикуются, а неполученные сбрасываются.
+    Итерации замеряются профилировщиком profiler, если он передан и включен.
+    """
+
+    def __init__(self, names, xs, ys, adjacency, bounds, mode=None,
+                 max_iterations=50, tolerance=0.5, publish_interval=0.05, profiler=None):
+        self.names = names
+        self._xs = list(xs)
+        self._ys = list(ys)
+        self.adjacency = adjacency
+        self.bounds = bounds
+        self.mode = mode
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+        self.publish_interval = publish_interval
+        self.profiler = profiler if profiler is not None else Profiler()
+
+        self.iteration = 0
+        self.converged = False
+        self.error = None
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+        self._latest = None
+        self._thread = threading.Thread(target=self._run, name="layout-worker", daemon=True)
+
+    @classmethod
+    def from_graph(cls, graph, bounds, **options):
+        """Создание задачи размещения по снимку текущей сети"""
+        names, xs, ys, adjacency = layout.build_snapshot(graph)
+        return cls(names, xs, ys, adjacency, bounds, **options)
+
+    def start(self):
+        """Запуск расчета в фоновом потоке"""
+        self._thread.start()
+
+    def cancel(self):
+        """Запрос на досрочную остановку; неполученные координаты отбрасываются"""
+        with self._lock:
+            self._cancel.set()
+            self._latest = None
+
+    def join(self, timeout=None):
+        """Ожидание завершения фонового потока; True, если он завершился"""
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def _publish(self, iteration):
+        """Сохранение копии текущих координат для главного потока"""
+        with self._lock:
+            if not self._cancel.is_set():
+                self._latest = (iteration, list(self._xs), list(self._ys))
+
+    def _run(self):
+        """Тело фонового потока"""
+        count = max(len(self._xs), 1)
+        last_publish = time.monotonic()
+        try:
+            steps = layout.iterate_layout(self._xs, self._ys, self.adjacency, self.bounds, self.mode)
+            for iteration in range(1, self.max_iterations + 1):
+                if self._cancel.is_set():
+                    break
+                with self.profiler.span("layout.iteration", nodes=len(self._xs)):
+                    total_move = next(steps)
+                self.iteration = iteration
+                if total_move / count < self.tolerance:
+                    self.converged = True
+                    break
+                now = time.monotonic()
+                if now - last_publish >= self.publish_interval:
+                    self._publish(iteration)
+                    last_publish = now
+            self._publish(self.iteration)
+        except Exception as error:
+            self.error = error
+        finally:
+            self._done.set()
+
+    def poll(self):
+        """Последние ещё не забранные координаты: (итерация, xs, ys) или None"""
+        with self._lock:
+            latest, self._latest = self._latest, None
+        return latest
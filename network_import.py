@@ -0,0 +1,194 @@
+import csv
+import json
+import math
+import os
+
+# Допустимые типы узлов; английские названия приводятся к русским
+NODE_TYPES = {
+    "класс": "класс",
+    "объект": "объект",
+    "свойство": "свойство",
+    "class": "класс",
+    "object": "объект",
+    "property": "свойство",
+}
+# Типы для узлов, которые упоминаются только в связях
+DEFAULT_SOURCE_TYPE = "объект"
+DEFAULT_TARGET_TYPES = {"является": "класс"}
+DEFAULT_TARGET_TYPE = "свойство"
+
+HEADER_NAMES = {"from", "от"}
+PROGRESS_EVERY = 10000
+MAX_REPORTED_ERRORS = 100
+
+
+class ImportReport:
+    """Итоги импорта: счетчики и первые ошибки разбора"""
+
+    def __init__(self):
+        self.lines = 0
+        self.nodes_added = 0
+        self.relations_added = 0
+        self.duplicates = 0
+        self.error_count = 0
+        self.errors = []
+
+    def add_error(self, line_number, message):
+        """Учет ошибки в строке файла"""
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"Строка {line_number}: {message}")
+
+    def summary(self):
+        """Краткое текстовое описание итогов"""
+        text = (f"Строк: {self.lines}, добавлено узлов: {self.nodes_added}, "
+                f"связей: {self.relations_added}, повторов: {self.duplicates}, ошибок: {self.error_count}")
+        if self.errors:
+            text += "\n" + "\n".join(self.errors[:10])
+        return text
+
+
+def _decoded_lines(stream, counter, report):
+    """Построчное чтение бинарного потока с подсчетом прочитанных байт
+
+    Строка не в UTF-8 учитывается как ошибка и заменяется пустой, чтобы
+    нумерация остальных строк не сбилась.
+    """
+    for line_number, raw in enumerate(stream, 1):
+        counter[0] += len(raw)
+        try:
+            line = raw.decode("utf-8-sig" if line_number == 1 else "utf-8")
+        except UnicodeDecodeError as error:
+            report.add_error(line_number, f"неверная кодировка ({error.reason})")
+            line = "\n"
+        yield line
+
+
+def _tabular_records(lines, delimiter):
+    """Записи CSV/TSV: «от,тип,к» - связь, «имя,тип_узла» - объявление узла"""
+    for line_number, row in enumerate(csv.reader(lines, delimiter=delimiter), 1):
+        fields = [field.strip() for field in row]
+        if not fields or not any(fields) or fields[0].startswith("#"):
+            continue
+        if line_number == 1 and fields[0].lower() in HEADER_NAMES:
+            continue
+        if len(fields) == 3:
+            yield line_number, ("relation", fields[0], fields[1], fields[2])
+        elif len(fields) == 2:
+            yield line_number, ("node", fields[0], fields[1])
+        else:
+            yield line_number, ("error", f"ожидалось 2 или 3 поля, получено {len(fields)}")
+
+
+def _json_lines_records(lines):
+    """Записи JSON Lines: {"from", "type", "to"} - связь, {"node", "type"} - узел"""
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError as error:
+            yield line_number, ("error", f"некорректный JSON ({error})")
+            continue
+        if not isinstance(item, dict):
+            yield line_number, ("error", "ожидался объект JSON")
+        elif "from" in item or "to" in item:
+            yield line_number, ("relation", str(item.get("from", "")).strip(),
+                                str(item.get("type", "")).strip(), str(item.get("to", "")).strip())
+        elif "node" in item or "name" in item:
+            yield line_number, ("node", str(item.get("node", item.get("name"))).strip(),
+                                str(item.get("type", "")).strip())
+        else:
+            yield line_number, ("error", "нет полей from/to или node")
+
+
+def iter_records(path, lines):
+    """Разбор строк файла в зависимости от его формата"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".jsonl", ".ndjson"):
+        return _json_lines_records(lines)
+    return _tabular_records(lines, "\t" if extension == ".tsv" else ",")
+
+
+def _checked(records, report):
+    """Записи файла; ошибка разбора CSV (например, слишком длинное поле) - ValueError"""
+    try:
+        yield from records
+    except csv.Error as error:
+        raise ValueError(f"Строка {report.lines + 1}: {error}") from error
+
+
+def import_network(graph, path, origin=(0, 0), spacing=132, progress=None):
+    """Потоковый импорт узлов и связей из файла в сеть
+
+    Файл читается построчно, элементы добавляются в сеть без оповещения
+    подписчиков (одно событие "reset" в конце). Новые узлы получают
+    координаты на квадратной решетке начиная с origin; дальнейшее размещение -
+    забота вызывающего кода. progress(строк, байт, всего байт) вызывается
+    каждые PROGRESS_EVERY строк. Строки с ошибками пропускаются и
+    попадают в отчет; если чтение прервано (OSError, ValueError),
+    добавленное до ошибки остается в сети - откат за вызывающим кодом.
+    """
+    report = ImportReport()
+    total_bytes = os.path.getsize(path)
+    counter = [0]
+    new_nodes = []
+    # Узлы, тип которых назначен по умолчанию и может быть уточнен объявлением
+    implicit = set()
+
+    def ensure_node(name, node_type):
+        if name not in graph.nodes:
+            graph.add_node(name, node_type, 0, 0)
+            new_nodes.append(name)
+            implicit.add(name)
+
+    with open(path, "rb") as stream, graph.bulk():
+        lines = _decoded_lines(stream, counter, report)
+        for line_number, record in _checked(iter_records(path, lines), report):
+            report.lines = line_number
+            if progress is not None and line_number % PROGRESS_EVERY == 0:
+                progress(line_number, counter[0], total_bytes)
+
+            kind = record[0]
+            if kind == "error":
+                report.add_error(line_number, record[1])
+            elif kind == "node":
+                _, name, node_type = record
+                node_type = NODE_TYPES.get(node_type.lower())
+                if not name:
+                    report.add_error(line_number, "пустое имя узла")
+                elif node_type is None:
+                    report.add_error(line_number, f"неизвестный тип узла '{record[2]}'")
+                elif name not in graph.nodes:
+                    graph.add_node(name, node_type, 0, 0)
+                    new_nodes.append(name)
+                elif name in implicit:
+                    graph.set_node_type(name, node_type)
+                    implicit.discard(name)
+                else:
+                    report.duplicates += 1
+            else:
+                _, from_node, relation_type, to_node = record
+                if not from_node or not to_node or not relation_type:
+                    report.add_error(line_number, "пустое поле связи")
+                elif from_node == to_node:
+                    report.add_error(line_number, "связь узла с самим собой")
+                else:
+                    ensure_node(from_node, DEFAULT_SOURCE_TYPE)
+                    ensure_node(to_node, DEFAULT_TARGET_TYPES.get(relation_type, DEFAULT_TARGET_TYPE))
+                    if graph.has_relation(from_node, to_node, relation_type):
+                        report.duplicates += 1
+                    else:
+                        graph.add_relation(from_node, to_node, relation_type)
+                        report.relations_added += 1
+
+        # Новые узлы раскладываются по решетке, чтобы не лежать в одной точке
+        columns = max(1, math.ceil(math.sqrt(len(new_nodes))))
+        for i, name in enumerate(new_nodes):
+            graph.move_node(name, origin[0] + (i % columns) * spacing, origin[1] + (i // columns) * spacing)
+        report.nodes_added = len(new_nodes)
+
+    if progress is not None:
+        progress(report.lines, counter[0], total_bytes)
+    return report
@@ -0,0 +1,540 @@
+from spatial_index import GridIndex
+
+# Цвета для разных типов связей и узлов (как в легенде сети)
+RELATION_COLORS = {
+    "является": "blue",
+    "имеет": "green",
+    "умеет": "red",
+    "имеет цвет": "black",
+}
+DEFAULT_RELATION_COLOR = "black"
+# Цвет ребра, объединяющего связи разных типов
+MIXED_EDGE_COLOR = "gray30"
+
+NODE_COLORS = {
+    "объект": "lightgreen",
+    "свойство": "lightyellow",
+}
+DEFAULT_NODE_COLOR = "lightblue"
+
+# Ниже этого масштаба узлы рисуются точками, а связи - линиями без подписей
+LOD_SCALE = 0.5
+LOD_DOT_RADIUS = 3
+HIGHLIGHT_COLOR = "red"
+NODE_HALF_HEIGHT = 20
+NODE_FONT = ("Arial", 10, "bold")
+LABEL_FONT = ("Arial", 9, "bold")
+# Подписи, которые при текущем масштабе мельче этого размера (пт), не рисуются
+MIN_FONT_SIZE = 5
+# Подпись ребра: высота, минимальная ширина и ширина символа (в координатах сети)
+LABEL_HEIGHT = 20
+LABEL_MIN_WIDTH = 60
+LABEL_CHAR_WIDTH = 7
+# Доли длины ребра, в которых по очереди пробуется поставить подпись
+LABEL_POSITIONS = (0.5, 0.3, 0.7)
+# Сколько непоставленных подписей пробуется заново за одну отрисовку (остальные - при следующих)
+LABEL_RETRY_LIMIT = 200
+
+
+def relation_color(relation_type):
+    """Цвет линии и подписи связи"""
+    return RELATION_COLORS.get(relation_type, DEFAULT_RELATION_COLOR)
+
+
+def node_color(node_type):
+    """Цвет заливки узла"""
+    return NODE_COLORS.get(node_type, DEFAULT_NODE_COLOR)
+
+
+def edge_key(from_node, to_node):
+    """Ключ ребра - неупорядоченной пары узлов"""
+    return (from_node, to_node) if from_node <= to_node else (to_node, from_node)
+
+
+def scaled_font(font, scale):
+    """Шрифт для масштаба scale или None, если текст получится слишком мелким"""
+    size = round(font[1] * scale)
+    if size < MIN_FONT_SIZE:
+        return None
+    return (font[0], size) + tuple(font[2:])
+
+
+class NetworkRenderer:
+    """Инкрементальная отрисовка семантической сети на canvas
+
+    Хранит соответствие элементов модели и идентификаторов элементов canvas
+    и при каждом вызове render() создает, перемещает или удаляет только
+    элементы, затронутые изменениями сети с прошлой отрисовки.
+
+    В режиме отсечения (culling) создаются только элементы, попадающие в
+    видимую область canvas, а при мелком масштабе - упрощенные точки и линии.
+    Масштаб задается преобразованием вида (scale_view): элементы создаются
+    сразу в нужном размере, а шрифт подписей подбирается под масштаб.
+
+    Все связи между одной парой узлов рисуются одним ребром с общей
+    подписью (стрелки в обе стороны для встречных связей). Подписи
+    ставятся в свободное место вдоль ребра по индексу уже поставленных
+    подписей и узлов; подпись, которой места нет, не рисуется. Подписи,
+    на которые передвинут узел, ставятся заново, а непоставленные
+    пробуются снова, когда освобождается одно из мест, где их пробовали
+    поставить (не больше LABEL_RETRY_LIMIT за отрисовку).
+    """
+
+    def __init__(self, canvas, graph, node_radius):
+        self.canvas = canvas
+        self.graph = graph
+        self.node_radius = node_radius
+        # имя узла -> (овал, текст); пара узлов -> (линия, фон подписи, подпись) или (линия,)
+        self.node_items = {}
+        self.edge_items = {}
+        # пара узлов -> связи между ними; пара -> (подпись, цвет, стрелка) нарисованного ребра
+        self._edge_relations = {}
+        self._edge_styles = {}
+        self._dirty_nodes = set()
+        self._dirty_edges = set()
+        self._full_redraw = True
+        # Преобразование координат сети в координаты canvas: x * scale + offset
+        self.scale = 1.0
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+        # Отсечение по видимой области и упрощенная отрисовка
+        self.culling = False
+        self.viewport = None
+        self._drawn_lod = None
+        # Подсвеченные узлы (например, результаты запроса)
+        self.highlighted = set()
+        self.node_index = GridIndex()
+        self.edge_index = GridIndex()
+        # Прямоугольники нарисованных подписей ребер (в координатах сети)
+        self.label_index = GridIndex(cell_size=100)
+        # Нарисованные ребра, подписи которых не хватило места, и индекс мест, где их пробовали
+        # поставить (ключ - пара узлов и номер места); освободившиеся места и ребра, ждущие повтора
+        self._unlabeled = set()
+        self.unlabeled_index = GridIndex(cell_size=100)
+        self._freed_areas = []
+        self._retry_pending = set()
+        self._rebuild_indexes()
+        graph.subscribe(self.on_graph_event)
+
+    def _rebuild_indexes(self):
+        """Построение пространственных индексов по всей сети"""
+        self.node_index.clear()
+        self.edge_index.clear()
+        self._edge_relations.clear()
+        for name in self.graph.nodes:
+            self._index_node(name)
+        edge_relations = self._edge_relations
+        for relation in self.graph.relations:
+            pair = edge_key(relation["from"], relation["to"])
+            edge_relations[pair] = edge_relations.get(pair, ()) + (relation,)
+        for pair in edge_relations:
+            self._index_edge(pair)
+
+    def scale_view(self, x, y, factor):
+        """Масштабирование вида в factor раз относительно точки canvas (x, y)
+
+        Уже нарисованные элементы не меняются - после смены масштаба нужна
+        полная перерисовка (invalidate и render).
+        """
+        self.scale *= factor
+        self.offset_x = x + (self.offset_x - x) * factor
+        self.offset_y = y + (self.offset_y - y) * factor
+
+    def to_canvas(self, x, y):
+        """Перевод координат сети в координаты canvas"""
+        return x * self.scale + self.offset_x, y * self.scale + self.offset_y
+
+    def to_world(self, x, y):
+        """Перевод координат canvas в координаты сети"""
+        return (x - self.offset_x) / self.scale, (y - self.offset_y) / self.scale
+
+    def set_culling(self, enabled):
+        """Включение/выключение отрисовки только видимой области"""
+        if enabled != self.culling:
+            self.culling = enabled
+            self._full_redraw = True
+
+    def set_viewport(self, x1, y1, x2, y2):
+        """Видимая область canvas (в координатах canvas)"""
+        self.viewport = (x1, y1, x2, y2)
+
+    @property
+    def low_detail(self):
+        """Упрощенная отрисовка при мелком масштабе"""
+        return self.culling and self.scale < LOD_SCALE
+
+    def _node_box(self, node):
+        """Прямоугольник овала узла в координатах canvas"""
+        x, y = self.to_canvas(node["x"], node["y"])
+        if self.low_detail:
+            return x - LOD_DOT_RADIUS, y - LOD_DOT_RADIUS, x + LOD_DOT_RADIUS, y + LOD_DOT_RADIUS
+        rx = self.node_radius * self.scale
+        ry = NODE_HALF_HEIGHT * self.scale
+        return x - rx, y - ry, x + rx, y + ry
+
+    def _node_rect(self, x, y):
+        """Прямоугольник узла с центром (x, y) в координатах сети"""
+        return x - self.node_radius, y - NODE_HALF_HEIGHT, x + self.node_radius, y + NODE_HALF_HEIGHT
+
+    def _index_node(self, name):
+        """Обновление узла в пространственном индексе"""
+        self.node_index.insert(name, *self._node_rect(*self.graph.position(name)))
+
+    def _place_node(self, name):
+        """Учет нового места узла: подписи, которые он закрыл, ставятся заново"""
+        self._index_node(name)
+        self._dirty_edges.update(self.label_index.query_rect(*self.node_index.box(name)))
+
+    def _index_edge(self, pair):
+        """Обновление ребра в пространственном индексе (по охватывающему прямоугольнику)"""
+        x1, y1 = self.graph.position(pair[0])
+        x2, y2 = self.graph.position(pair[1])
+        self.edge_index.insert(pair, min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+
+    def on_graph_event(self, event, *args):
+        """Учет изменения сети до следующей отрисовки"""
+        if event == "cleared":
+            self.node_index.clear()
+            self.edge_index.clear()
+            self._edge_relations.clear()
+            self._full_redraw = True
+        elif event == "reset":
+            self._rebuild_indexes()
+            self._full_redraw = True
+        elif event == "node_changed":
+            self._dirty_nodes.add(args[0])
+        elif event == "node_added":
+            self._place_node(args[0])
+            self._dirty_nodes.add(args[0])
+        elif event == "node_removed":
+            self.node_index.discard(args[0])
+            self._dirty_nodes.add(args[0])
+            self._freed_areas.append(self._node_rect(args[1]["x"], args[1]["y"]))
+        elif event == "node_moved":
+            name = args[0]
+            self._freed_areas.append(self._node_rect(args[1], args[2]))
+            self._place_node(name)
+            self._dirty_nodes.add(name)
+            pairs = {edge_key(relation["from"], relation["to"])
+                     for relation in self.graph.outgoing(name) + self.graph.incoming(name)}
+            for pair in pairs:
+                self._index_edge(pair)
+            self._dirty_edges.update(pairs)
+        elif event == "relation_added":
+            relation = args[0]
+            pair = edge_key(relation["from"], relation["to"])
+            if pair not in self._edge_relations:
+                self._index_edge(pair)
+            self._edge_relations[pair] = self._edge_relations.get(pair, ()) + (relation,)
+            self._dirty_edges.add(pair)
+        elif event == "relation_removed":
+            relation = args[0]
+            pair = edge_key(relation["from"], relation["to"])
+            remaining = tuple(other for other in self._edge_relations.get(pair, ()) if other != relation)
+            if remaining:
+                self._edge_relations[pair] = remaining
+            else:
+                self._edge_relations.pop(pair, None)
+                self.edge_index.discard(pair)
+            self._dirty_edges.add(pair)
+
+    def set_highlight(self, names):
+        """Подсветка узлов; перерисовываются только узлы, сменившие состояние"""
+        names = set(names)
+        self._dirty_nodes.update(names ^ self.highlighted)
+        self.highlighted = names
+
+    def _node_outline(self, name):
+        """Цвет и толщина контура узла"""
+        if name in self.highlighted:
+            return HIGHLIGHT_COLOR, 4
+        return "black", 1 if self.low_detail else 2
+
+    def invalidate(self):
+        """Пометить всю сеть для полной перерисовки"""
+        self._full_redraw = True
+
+    def render(self):
+        """Применение накопленных изменений к canvas"""
+        if self.culling:
+            self._render_visible()
+            return
+        if self._full_redraw:
+            self._redraw_all()
+            return
+
+        edges_created = False
+        for pair in self._dirty_edges:
+            edges_created |= self._sync_edge(pair)
+        for name in self._dirty_nodes:
+            self._sync_node(name)
+        edges_created |= self._retry_labels()
+        # Новые линии и подписи не должны перекрывать уже нарисованные узлы
+        if edges_created and self.node_items:
+            self.canvas.tag_raise("node")
+        self._dirty_edges.clear()
+        self._dirty_nodes.clear()
+
+    def _redraw_all(self):
+        """Полная перерисовка сети"""
+        self._clear_items()
+        for pair in self._edge_relations:
+            self._create_edge(pair)
+        for name in self.graph.nodes:
+            self._create_node(name)
+        self._full_redraw = False
+
+    def _clear_items(self):
+        """Удаление всех элементов сети с canvas"""
+        self.canvas.delete("all")
+        self.node_items.clear()
+        self.edge_items.clear()
+        self._edge_styles.clear()
+        self.label_index.clear()
+        self._unlabeled.clear()
+        self.unlabeled_index.clear()
+        self._freed_areas.clear()
+        self._retry_pending.clear()
+        self._dirty_edges.clear()
+        self._dirty_nodes.clear()
+        self._drawn_lod = self.low_detail
+
+    def visible_world_rect(self):
+        """Видимая область в координатах сети"""
+        x1, y1, x2, y2 = self.viewport
+        wx1, wy1 = self.to_world(x1, y1)
+        wx2, wy2 = self.to_world(x2, y2)
+        return wx1, wy1, wx2, wy2
+
+    def _render_visible(self):
+        """Отрисовка только элементов, пересекающих видимую область"""
+        if self.viewport is None:
+            return
+        if self._full_redraw or self._drawn_lod != self.low_detail:
+            self._clear_items()
+            self._full_redraw = False
+
+        rect = self.visible_world_rect()
+        visible_nodes = self.node_index.query_rect(*rect)
+        visible_edges = self.edge_index.query_rect(*rect)
+
+        # Удаляем элементы, ушедшие из видимой области
+        for pair in [pair for pair in self.edge_items if pair not in visible_edges]:
+            self._delete_edge(pair)
+        for name in [name for name in self.node_items if name not in visible_nodes]:
+            self.canvas.delete(*self.node_items.pop(name))
+
+        # Создаем появившиеся и обновляем измененные элементы
+        edges_created = False
+        for pair in visible_edges:
+            if pair not in self.edge_items:
+                self._create_edge(pair)
+                edges_created = True
+            elif pair in self._dirty_edges:
+                edges_created |= self._sync_edge(pair)
+        for name in visible_nodes:
+            if name not in self.node_items:
+                self._create_node(name)
+            elif name in self._dirty_nodes:
+                self._sync_node(name)
+        edges_created |= self._retry_labels()
+        if edges_created and self.node_items:
+            self.canvas.tag_raise("node")
+        self._dirty_edges.clear()
+        self._dirty_nodes.clear()
+
+    def world_bounds(self):
+        """Границы сети в координатах canvas (для области прокрутки)"""
+        bounds = self.node_index.bounds()
+        if bounds is None:
+            return None
+        x1, y1 = self.to_canvas(bounds[0], bounds[1])
+        x2, y2 = self.to_canvas(bounds[2], bounds[3])
+        return x1, y1, x2, y2
+
+    def _edge_style(self, pair):
+        """Подпись, цвет и стрелка ребра по всем связям между парой узлов"""
+        relations = self._edge_relations[pair]
+        if len(relations) == 1:
+            relation = relations[0]
+            arrow = "last" if relation["from"] == pair[0] else "first"
+            return relation["type"], relation_color(relation["type"]), arrow
+        types = sorted({relation["type"] for relation in relations})
+        color = relation_color(types[0]) if len(types) == 1 else MIXED_EDGE_COLOR
+        forward = any(relation["from"] == pair[0] for relation in relations)
+        backward = any(relation["from"] == pair[1] for relation in relations)
+        arrow = "both" if forward and backward else "last" if forward else "first"
+        return ", ".join(types), color, arrow
+
+    def _edge_coords(self, pair):
+        """Координаты линии ребра на canvas (от первого узла пары ко второму)"""
+        x1, y1 = self.to_canvas(*self.graph.position(pair[0]))
+        x2, y2 = self.to_canvas(*self.graph.position(pair[1]))
+        return x1, y1, x2, y2
+
+    def _label_boxes(self, pair, text):
+        """Места, где пробуется поставить подпись ребра (в координатах сети)"""
+        x1, y1 = self.graph.position(pair[0])
+        x2, y2 = self.graph.position(pair[1])
+        half_width = max(LABEL_MIN_WIDTH, len(text) * LABEL_CHAR_WIDTH + 10) / 2
+        half_height = LABEL_HEIGHT / 2
+        boxes = []
+        for share in LABEL_POSITIONS:
+            x = x1 + (x2 - x1) * share
+            y = y1 + (y2 - y1) * share
+            boxes.append((x - half_width, y - half_height, x + half_width, y + half_height))
+        return boxes
+
+    def _place_label(self, pair, boxes):
+        """Первое свободное из мест boxes, занятое под подпись ребра, или None
+
+        Место занято, если пересекается с уже поставленной подписью или узлом.
+        """
+        for box in boxes:
+            if not self.label_index.intersects(*box) and not self.node_index.intersects(*box):
+                self.label_index.insert(pair, *box)
+                return box
+        return None
+
+    def _label_items(self, pair, text, color, items=()):
+        """Подпись ребра: перемещение имеющихся фона и текста, создание или удаление
+
+        Возвращает элементы подписи - (фон, текст) или (), если ее не видно.
+        """
+        self._forget_label(pair)
+        font = None if self.low_detail else scaled_font(LABEL_FONT, self.scale)
+        boxes = self._label_boxes(pair, text) if font is not None else ()
+        box = self._place_label(pair, boxes)
+        if box is None:
+            if boxes:
+                self._unlabeled.add(pair)
+                for i, candidate in enumerate(boxes):
+                    self.unlabeled_index.insert((pair, i), *candidate)
+            if items:
+                self.canvas.delete(*items)
+            return ()
+        x1, y1 = self.to_canvas(box[0], box[1])
+        x2, y2 = self.to_canvas(box[2], box[3])
+        if items:
+            self.canvas.coords(items[0], x1, y1, x2, y2)
+            self.canvas.coords(items[1], (x1 + x2) / 2, (y1 + y2) / 2)
+            return items
+        # Фон для текста для лучшей читаемости
+        text_bg = self.canvas.create_rectangle(x1, y1, x2, y2, fill="white", outline="white", tags=("relation",))
+        self.canvas.tag_lower(text_bg)  # Перемещаем фон под текст
+        label = self.canvas.create_text((x1 + x2) / 2, (y1 + y2) / 2, text=text, fill=color, font=font,
+                                        tags=("relation",))
+        return text_bg, label
+
+    def _create_edge(self, pair):
+        """Создание линии и подписи ребра"""
+        text, color, arrow = style = self._edge_style(pair)
+        if self.low_detail:
+            line = self.canvas.create_line(*self._edge_coords(pair), fill=color, width=1, tags=("relation",))
+        else:
+            line = self.canvas.create_line(*self._edge_coords(pair), fill=color, width=2, arrow=arrow,
+                                           smooth=True, tags=("relation",))
+        self.edge_items[pair] = (line,) + self._label_items(pair, text, color)
+        self._edge_styles[pair] = style
+
+    def _forget_label(self, pair):
+        """Снятие подписи ребра с учета; ее место считается освободившимся"""
+        if pair in self._unlabeled:
+            self._unlabeled.remove(pair)
+            for i in range(len(LABEL_POSITIONS)):
+                self.unlabeled_index.discard((pair, i))
+        if pair in self.label_index:
+            self._freed_areas.append(self.label_index.box(pair))
+            self.label_index.remove(pair)
+
+    def _retry_labels(self):
+        """Повторная попытка поставить подписи, места которых освободились; True, если подпись создана
+
+        Кандидаты ищутся по индексу мест непоставленных подписей, а за одну
+        отрисовку пробуется не больше LABEL_RETRY_LIMIT из них - остальные
+        ждут следующей отрисовки.
+        """
+        pending = self._retry_pending
+        freed_areas, self._freed_areas = self._freed_areas, []
+        if self._unlabeled:
+            for area in freed_areas:
+                pending.update(pair for pair, _ in self.unlabeled_index.query_rect(*area))
+        created = False
+        retries = 0
+        while pending and retries < LABEL_RETRY_LIMIT:
+            pair = pending.pop()
+            if pair not in self._unlabeled:
+                # Подпись уже поставлена или ребро удалено
+                continue
+            retries += 1
+            items = self.edge_items[pair]
+            text, color, _ = self._edge_styles[pair]
+            label_items = self._label_items(pair, text, color)
+            self.edge_items[pair] = items + label_items
+            created |= bool(label_items)
+        return created
+
+    def _delete_edge(self, pair):
+        """Удаление элементов ребра с canvas"""
+        self.canvas.delete(*self.edge_items.pop(pair))
+        self._edge_styles.pop(pair, None)
+        self._forget_label(pair)
+
+    def _sync_edge(self, pair):
+        """Создание, перемещение или удаление ребра; True, если создана новая линия"""
+        items = self.edge_items.get(pair)
+        if pair not in self._edge_relations:
+            if items:
+                self._delete_edge(pair)
+            return False
+        style = self._edge_style(pair)
+        if items is not None and style != self._edge_styles[pair]:
+            # Изменился набор связей - ребро рисуется заново
+            self._delete_edge(pair)
+            items = None
+        if items is None:
+            self._create_edge(pair)
+            return True
+        self.canvas.coords(items[0], *self._edge_coords(pair))
+        self.edge_items[pair] = items[:1] + self._label_items(pair, style[0], style[1], items[1:])
+        return False
+
+    def _create_node(self, name):
+        """Создание овала и подписи узла"""
+        node = self.graph.nodes[name]
+        outline, width = self._node_outline(name)
+        oval = self.canvas.create_oval(
+            *self._node_box(node),
+            fill=node_color(node["type"]), outline=outline, width=width,
+            tags=("node",)
+        )
+        font = scaled_font(NODE_FONT, self.scale)
+        if self.low_detail or font is None:
+            self.node_items[name] = (oval,)
+            return
+        text = self.canvas.create_text(
+            *self.to_canvas(node["x"], node["y"]),
+            text=name,
+            font=font,
+            width=self.node_radius * 1.8 * self.scale,  # Ограничение ширины текста
+            tags=("node",)
+        )
+        self.node_items[name] = (oval, text)
+
+    def _sync_node(self, name):
+        """Создание, перемещение или удаление элементов одного узла"""
+        items = self.node_items.get(name)
+        node = self.graph.nodes.get(name)
+        if node is None:
+            if items:
+                self.canvas.delete(*items)
+                del self.node_items[name]
+            return
+        if items is None:
+            self._create_node(name)
+            return
+        self.canvas.coords(items[0], *self._node_box(node))
+        outline, width = self._node_outline(name)
+        self.canvas.itemconfigure(items[0], fill=node_color(node["type"]), outline=outline, width=width)
+        if len(items) == 2:
+            self.canvas.coords(items[1], *self.to_canvas(node["x"], node["y"]))
@@ -0,0 +1,259 @@
+import gc
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+# Формат файла сети (.snet):
+#   заголовок (HEADER), затем секции, каждая выровнена на 8 байт:
+#   смещения строк (u64, string_count + 1), байты строк (UTF-8),
+#   имена узлов (u32, номер строки), типы узлов (u32, номер строки),
+#   x и y узлов (f64), начала и концы связей (u32, номер узла),
+#   типы связей (u32, номер строки), фреймы (JSON).
+MAGIC = b"SNET"
+VERSION = 1
+HEADER = struct.Struct("<4sIB3xIIIQ")
+BYTE_ORDERS = {"little": 0, "big": 1}
+
+
+def _align(offset):
+    """Выравнивание смещения на 8 байт"""
+    return (offset + 7) & ~7
+
+
+class StringTable:
+    """Таблица интернированных строк: строка -> номер"""
+
+    def __init__(self):
+        self.ids = {}
+        self.strings = []
+
+    def intern(self, value):
+        """Номер строки в таблице (с добавлением при необходимости)"""
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.ids[value] = string_id
+            self.strings.append(value)
+        return string_id
+
+
+def save_network(path, graph, frames=None):
+    """Сохранение сети и фреймов в компактный двоичный файл"""
+    strings = StringTable()
+    names, xs, ys = graph.positions()
+    node_index = {name: i for i, name in enumerate(names)}
+
+    node_names = array("I", (strings.intern(name) for name in names))
+    node_types = array("I", (strings.intern(graph.node_type(name)) for name in names))
+    node_x = array("d", xs)
+    node_y = array("d", ys)
+
+    relations = list(graph.relations)
+    relation_from = array("I", (node_index[relation["from"]] for relation in relations))
+    relation_to = array("I", (node_index[relation["to"]] for relation in relations))
+    relation_types = array("I", (strings.intern(relation["type"]) for relation in relations))
+
+    encoded = [value.encode("utf-8") for value in strings.strings]
+    offsets = array("Q", [0])
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    frames_json = json.dumps(frames or {}, ensure_ascii=False).encode("utf-8")
+
+    sections = [offsets.tobytes(), b"".join(encoded), node_names.tobytes(), node_types.tobytes(),
+                node_x.tobytes(), node_y.tobytes(), relation_from.tobytes(), relation_to.tobytes(),
+                relation_types.tobytes(), frames_json]
+
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, "wb") as stream:
+            stream.write(HEADER.pack(MAGIC, VERSION, BYTE_ORDERS[sys.byteorder],
+                                     len(strings.strings), len(names), len(relations), len(frames_json)))
+            position = HEADER.size
+            for section in sections:
+                padding = _align(position) - position
+                stream.write(b"\0" * padding)
+                stream.write(section)
+                position += padding + len(section)
+        os.replace(temp_path, path)
+    except BaseException:
+        # Недописанный временный файл не оставляем
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _is_frame(frame):
+    """Фрейм из файла имеет вид {"type": строка, "x": число, "y": число, "slots": словарь}"""
+    return (isinstance(frame, dict) and isinstance(frame.get("type"), str)
+            and all(isinstance(frame.get(key), (int, float)) and not isinstance(frame[key], bool)
+                    for key in ("x", "y"))
+            and isinstance(frame.get("slots"), dict))
+
+
+class NetworkFile:
+    """Файл сети, открытый через mmap
+
+    Массивы координат и связей читаются прямо из отображенной памяти,
+    строки декодируются по требованию, поэтому открытие файла не зависит
+    от числа записей.
+    """
+
+    def __init__(self, path):
+        self._stream = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._stream.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._stream.close()
+            raise ValueError("Файл сети пуст")
+        try:
+            self._open_sections()
+        except Exception:
+            self.close()
+            raise
+
+    def _open_sections(self):
+        """Разбор заголовка и создание представлений секций"""
+        if len(self._map) < HEADER.size:
+            raise ValueError("Файл не является файлом сети")
+        magic, version, byte_order, string_count, node_count, relation_count, frames_length = \
+            HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError("Файл не является файлом сети")
+        if version != VERSION:
+            raise ValueError(f"Неподдерживаемая версия файла сети: {version}")
+        self.node_count = node_count
+        self.relation_count = relation_count
+        self._swap = byte_order != BYTE_ORDERS[sys.byteorder]
+
+        view = memoryview(self._map)
+        self._views = [view]
+        position = HEADER.size
+
+        def section(length):
+            nonlocal position
+            start = _align(position)
+            position = start + length
+            if position > len(self._map):
+                raise ValueError("Файл сети поврежден")
+            return view[start:position]
+
+        def typed(code, count):
+            item_size = array(code).itemsize
+            raw = section(count * item_size)
+            if self._swap:
+                # Файл записан с другим порядком байт - нужна копия с перестановкой
+                values = array(code, raw.tobytes())
+                values.byteswap()
+                return values
+            cast = raw.cast(code)
+            self._views.append(cast)
+            return cast
+
+        self._offsets = typed("Q", string_count + 1)
+        self._strings = section(self._offsets[string_count] if string_count else 0)
+        self.node_names = typed("I", node_count)
+        self.node_types = typed("I", node_count)
+        self.node_x = typed("d", node_count)
+        self.node_y = typed("d", node_count)
+        self.relation_from = typed("I", relation_count)
+        self.relation_to = typed("I", relation_count)
+        self.relation_types = typed("I", relation_count)
+        self._frames = section(frames_length)
+        self._views.extend([self._strings, self._frames])
+        self._string_cache = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Освобождение отображения и файла"""
+        if self._map is None:
+            return
+        for view in reversed(getattr(self, "_views", [])):
+            view.release()
+        self._map.close()
+        self._map = None
+        self._stream.close()
+
+    def string(self, string_id):
+        """Строка таблицы по номеру"""
+        value = self._string_cache.get(string_id)
+        if value is None:
+            start, end = self._offsets[string_id], self._offsets[string_id + 1]
+            value = str(self._strings[start:end], "utf-8")
+            self._string_cache[string_id] = value
+        return value
+
+    def node(self, index):
+        """Узел по номеру: (имя, тип, x, y)"""
+        return (self.string(self.node_names[index]), self.string(self.node_types[index]),
+                self.node_x[index], self.node_y[index])
+
+    def relation(self, index):
+        """Связь по номеру: (от, к, тип)"""
+        return (self.string(self.node_names[self.relation_from[index]]),
+                self.string(self.node_names[self.relation_to[index]]),
+                self.string(self.relation_types[index]))
+
+    def frames(self):
+        """Фреймы, сохраненные вместе с сетью (ошибки формата - ValueError)"""
+        frames = json.loads(str(self._frames, "utf-8"))
+        if not isinstance(frames, dict) or not all(map(_is_frame, frames.values())):
+            raise ValueError("Файл сети поврежден: неверный раздел фреймов")
+        return frames
+
+    def _decoded_strings(self):
+        """Все строки таблицы (ошибки формата - ValueError)"""
+        strings = self._strings
+        offsets = self._offsets
+        count = len(offsets) - 1
+        if count and (offsets[0] != 0 or any(offsets[i] > offsets[i + 1] for i in range(count))):
+            raise ValueError("Файл сети поврежден: неверная таблица строк")
+        return [str(strings[offsets[i]:offsets[i + 1]], "utf-8") for i in range(count)]
+
+    def load_into(self, graph):
+        """Заполнение сети содержимым файла (одно событие "reset")
+
+        Файл проверяется целиком до изменения сети: при ошибке формата
+        (ValueError) сеть остается прежней. В отличие от открытия файла,
+        загрузка линейна по числу связей: каждая связь попадает в индексы
+        смежности и типов сети.
+        """
+        # Все строки декодируются один раз, дальше используются по номерам
+        decoded = self._decoded_strings()
+        string_count = len(decoded)
+        for ids in (self.node_names, self.node_types, self.relation_types):
+            if len(ids) and max(ids) >= string_count:
+                raise ValueError("Файл сети поврежден: неверный номер строки")
+        for ids in (self.relation_from, self.relation_to):
+            if len(ids) and max(ids) >= self.node_count:
+                raise ValueError("Файл сети поврежден: неверный номер узла")
+        names = list(map(decoded.__getitem__, self.node_names))
+        # Сборщик мусора на время массового создания объектов отключается:
+        # циклов здесь не возникает, а его проходы удваивают время загрузки
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            graph.load_columns(names, list(map(decoded.__getitem__, self.node_types)),
+                               self.node_x, self.node_y,
+                               list(map(names.__getitem__, self.relation_from)),
+                               list(map(names.__getitem__, self.relation_to)),
+                               list(map(decoded.__getitem__, self.relation_types)))
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+
+def load_network(path, graph):
+    """Загрузка сети из файла; возвращает сохраненные фреймы"""
+    with NetworkFile(path) as network_file:
+        # Фреймы читаются первыми: поврежденный файл не должен менять сеть
+        frames = network_file.frames()
+        network_file.load_into(graph)
+        return frames
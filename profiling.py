@@ -0,0 +1,129 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+class _NullSpan:
+    """Участок без замера (профилирование выключено)"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def __setitem__(self, key, value):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Замер одного участка; span["items"] = n добавляет счетчик к записи"""
+
+    __slots__ = ("profiler", "name", "args", "start")
+
+    def __init__(self, profiler, name, args):
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler._finish(self.name, self.start, time.perf_counter_ns(), self.args)
+        return False
+
+    def __setitem__(self, key, value):
+        self.args[key] = value
+
+
+class Profiler:
+    """Замеры длительности основных операций редактора
+
+    Включается явно (enabled); выключенный профилировщик возвращает пустой
+    участок и ничего не записывает. Для каждого имени участка хранятся
+    последние window длительностей и счетчиков (скользящая статистика),
+    а все записи - в ограниченном журнале, который сохраняется в формате
+    Chrome trace event (chrome://tracing, Perfetto).
+    """
+
+    def __init__(self, enabled=False, window=100, max_events=100000):
+        self.enabled = enabled
+        self.window = window
+        self._origin = time.perf_counter_ns()
+        # имя -> deque((длительность в с, счетчики))
+        self._recent = {}
+        self._events = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+
+    def span(self, name, **args):
+        """Участок для замера: with profiler.span("draw_network") as span: ..."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def _finish(self, name, start, end, args):
+        """Запись завершенного участка (может вызываться из фоновых потоков)"""
+        with self._lock:
+            recent = self._recent.get(name)
+            if recent is None:
+                recent = self._recent[name] = deque(maxlen=self.window)
+            recent.append(((end - start) / 1e9, args))
+            self._events.append((name, start, end, threading.get_ident(), args))
+
+    def clear(self):
+        """Удаление всех записей"""
+        with self._lock:
+            self._recent.clear()
+            self._events.clear()
+
+    def stats(self):
+        """Скользящая статистика: имя -> словарь count, last, mean, max (в с) и последние счетчики"""
+        with self._lock:
+            snapshot = {name: list(recent) for name, recent in self._recent.items()}
+        result = {}
+        for name, records in snapshot.items():
+            durations = [duration for duration, _ in records]
+            result[name] = {
+                "count": len(durations),
+                "last": durations[-1],
+                "mean": sum(durations) / len(durations),
+                "max": max(durations),
+                "args": records[-1][1],
+            }
+        return result
+
+    def format_stats(self):
+        """Статистика в виде строк для информационной панели"""
+        lines = []
+        for name, stat in sorted(self.stats().items()):
+            line = (f"{name}: {stat['last'] * 1000:.1f} мс (сред. {stat['mean'] * 1000:.1f}, "
+                    f"макс. {stat['max'] * 1000:.1f}, n={stat['count']})")
+            if stat["args"]:
+                line += " " + ", ".join(f"{key}={value}" for key, value in stat["args"].items())
+            lines.append(line)
+        return "\n".join(lines)
+
+    def trace_events(self):
+        """Записи в формате Chrome trace event (полные события "X", время в мкс)"""
+        with self._lock:
+            events = list(self._events)
+        pid = os.getpid()
+        return [{"name": name, "cat": name.split(".")[0], "ph": "X", "pid": pid, "tid": tid,
+                 "ts": (start - self._origin) / 1000, "dur": (end - start) / 1000, "args": args}
+                for name, start, end, tid, args in events]
+
+    def write_trace(self, path):
+        """Сохранение журнала в JSON-файл для chrome://tracing или Perfetto"""
+        with open(path, "w", encoding="utf-8") as stream:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"},
+                      stream, ensure_ascii=False)
@@ -0,0 +1,121 @@
+import shlex
+
+
+class QueryError(ValueError):
+    """Ошибка разбора запроса"""
+
+
+def is_variable(term):
+    """Переменные запроса начинаются с '?'"""
+    return term.startswith("?")
+
+
+def parse_query(text):
+    """Разбор запроса: тройки «субъект связь объект», разделенные ';' или переводом строки
+
+    Тип связи может состоять из нескольких слов («имеет цвет»); имена с
+    пробелами записываются в кавычках. Пример:
+        ?x умеет летать; ?x имеет цвет желтый
+    """
+    patterns = []
+    for part in text.replace("\n", ";").split(";"):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            terms = shlex.split(part)
+        except ValueError as error:
+            raise QueryError(f"Ошибка в образце '{part}': {error}")
+        if len(terms) < 3:
+            raise QueryError(f"Образец '{part}' должен содержать субъект, связь и объект")
+        patterns.append((terms[0], " ".join(terms[1:-1]), terms[-1]))
+    if not patterns:
+        raise QueryError("Пустой запрос")
+    return patterns
+
+
+class TripleQuery:
+    """Конъюнктивный запрос по тройкам (от, тип, к) с переменными
+
+    Порядок соединения выбирается жадно: следующим берется образец с
+    наименьшей оценкой числа совпадений с учетом уже связанных переменных
+    (предпочтительно связанный с ними, чтобы избежать декартовых произведений).
+    Результаты выдаются генератором по одному.
+    """
+
+    def __init__(self, graph, patterns):
+        self.graph = graph
+        self.patterns = patterns
+        self.variables = []
+        for pattern in patterns:
+            for term in pattern:
+                if is_variable(term) and term not in self.variables:
+                    self.variables.append(term)
+
+    @classmethod
+    def parse(cls, graph, text):
+        """Создание запроса из текста"""
+        return cls(graph, parse_query(text))
+
+    def _estimate(self, pattern, bound):
+        """Оценка числа совпадений образца при уже связанных переменных bound"""
+        terms = [None if is_variable(term) else term for term in pattern]
+        estimate = self.graph.estimate(*terms)
+        node_count = max(len(self.graph.nodes), 1)
+        # Связанная на момент выполнения переменная сужает выборку до средней степени узла
+        for term in (pattern[0], pattern[2]):
+            if is_variable(term) and term in bound:
+                estimate = min(estimate, max(1, self.graph.estimate() // node_count))
+        if is_variable(pattern[1]) and pattern[1] in bound:
+            estimate = max(1, estimate // max(len(self.graph.relation_types()), 1))
+        return estimate
+
+    def plan(self):
+        """Порядок выполнения образцов"""
+        remaining = list(self.patterns)
+        bound = set()
+        order = []
+        while remaining:
+            connected = [pattern for pattern in remaining
+                         if any(term in bound for term in pattern if is_variable(term))]
+            candidates = connected if bound and connected else remaining
+            best = min(candidates, key=lambda pattern: self._estimate(pattern, bound))
+            remaining.remove(best)
+            order.append(best)
+            bound.update(term for term in best if is_variable(term))
+        return order
+
+    def _solve(self, order, position, binding):
+        """Рекурсивный перебор совпадений для образцов начиная с position"""
+        if position == len(order):
+            yield dict(binding)
+            return
+        pattern = order[position]
+        terms = [binding.get(term) if is_variable(term) else term for term in pattern]
+        for relation in self.graph.match(*terms):
+            values = (relation["from"], relation["type"], relation["to"])
+            added = []
+            consistent = True
+            for term, value in zip(pattern, values):
+                if not is_variable(term):
+                    continue
+                current = binding.get(term)
+                if current is None:
+                    binding[term] = value
+                    added.append(term)
+                elif current != value:
+                    consistent = False
+                    break
+            if consistent:
+                yield from self._solve(order, position + 1, binding)
+            for term in added:
+                del binding[term]
+
+    def results(self):
+        """Генератор решений: словари {переменная: значение}"""
+        return self._solve(self.plan(), 0, {})
+
+
+def run_query(graph, text):
+    """Разбор и выполнение запроса; возвращает генератор решений"""
+    return TripleQuery.parse(graph, text).results()
@@ -0,0 +1,228 @@
+import re
+from bisect import bisect_left
+from itertools import islice
+
+from autocomplete import normalize
+
+TOKEN_PATTERN = re.compile(r"\w+")
+# Символ больше любого другого: верхняя граница слов с заданным началом
+MAX_CHAR = chr(0x10FFFF)
+# Порядок видов найденных документов в выдаче
+KIND_ORDER = {"node": 0, "frame": 1, "slot": 2, "relation_type": 3}
+
+
+def tokenize(text):
+    """Слова текста в нормализованном виде (без учета регистра и ё/е)"""
+    return TOKEN_PATTERN.findall(normalize(str(text)))
+
+
+class SearchIndex:
+    """Инвертированный индекс слов для полнотекстового поиска
+
+    Документ - любой хешируемый ключ с текстом; для каждого слова хранится
+    множество документов, где оно встречается, а сами слова - в
+    отсортированном списке для поиска по началу слова. Каждое слово
+    запроса ищется как начало слова, результаты по словам пересекаются.
+    """
+
+    def __init__(self):
+        self._postings = {}
+        self._doc_tokens = {}
+        self._tokens = []
+
+    def __len__(self):
+        return len(self._doc_tokens)
+
+    def __contains__(self, doc):
+        return doc in self._doc_tokens
+
+    def clear(self):
+        """Удаление всех документов"""
+        self._postings = {}
+        self._doc_tokens = {}
+        self._tokens = []
+
+    def add(self, doc, text):
+        """Добавление (или замена) документа"""
+        if doc in self._doc_tokens:
+            self.remove(doc)
+        tokens = tuple(set(tokenize(text)))
+        self._doc_tokens[doc] = tokens
+        postings = self._postings
+        new_tokens = []
+        for token in tokens:
+            docs = postings.get(token)
+            if docs is None:
+                docs = postings[token] = set()
+                new_tokens.append(token)
+            docs.add(doc)
+        if len(new_tokens) > 16:
+            self._tokens = sorted(postings)
+        else:
+            for token in new_tokens:
+                self._tokens.insert(bisect_left(self._tokens, token), token)
+
+    def remove(self, doc):
+        """Удаление документа"""
+        for token in self._doc_tokens.pop(doc):
+            docs = self._postings[token]
+            docs.discard(doc)
+            if not docs:
+                del self._postings[token]
+                del self._tokens[bisect_left(self._tokens, token)]
+
+    def discard(self, doc):
+        """Удаление документа, если он есть"""
+        if doc in self._doc_tokens:
+            self.remove(doc)
+
+    def rebuild(self, documents):
+        """Построение индекса заново по парам (документ, текст)"""
+        self.clear()
+        postings = self._postings
+        for doc, text in documents:
+            tokens = tuple(set(tokenize(text)))
+            self._doc_tokens[doc] = tokens
+            for token in tokens:
+                docs = postings.get(token)
+                if docs is None:
+                    docs = postings[token] = set()
+                docs.add(doc)
+        self._tokens = sorted(postings)
+
+    def _prefix_tokens(self, prefix):
+        """Слова индекса, начинающиеся с prefix, в алфавитном порядке"""
+        tokens = self._tokens
+        return tokens[bisect_left(tokens, prefix):bisect_left(tokens, prefix + MAX_CHAR)]
+
+    def _most_selective(self, terms):
+        """Номер слова запроса с наименьшим общим числом документов по его словам индекса"""
+        postings = self._postings
+        best, best_size = 0, None
+        for i in sorted(range(len(terms)), key=lambda i: len(terms[i])):
+            # В каждом слове индекса есть хотя бы один документ: дальше суммы не меньше
+            if best_size is not None and len(terms[i]) >= best_size:
+                break
+            size = sum(map(len, map(postings.__getitem__, terms[i])))
+            if best_size is None or size < best_size:
+                best, best_size = i, size
+        return best
+
+    def _matches(self, terms):
+        """Документы со всеми словами запроса, по порядку слов первого из них"""
+        # Слов индекса намного меньше, чем документов: для остальных слов
+        # запроса заранее собираются подходящие слова индекса
+        rest = [set(words).isdisjoint for words in terms[1:]]
+        doc_tokens = self._doc_tokens
+        seen = set()
+        for token in terms[0]:
+            docs = self._postings[token]
+            if seen:
+                docs = docs - seen
+            seen.update(docs)
+            for doc in docs:
+                tokens = doc_tokens[doc]
+                for isdisjoint in rest:
+                    if isdisjoint(tokens):
+                        break
+                else:
+                    yield doc
+
+    def search(self, query, limit=100, key=None):
+        """Не более limit документов, содержащих все слова запроса (как начала слов)
+
+        Документы перебираются по алфавиту слов индекса, совпавших с самым
+        избирательным словом запроса (с наименьшим общим числом документов),
+        и перебор прекращается после limit найденных, поэтому время запроса
+        почти не зависит от размера индекса. Найденное упорядочивается по key.
+        """
+        terms = [self._prefix_tokens(term) for term in set(tokenize(query))]
+        if not terms or not all(terms):
+            return []
+        if len(terms) > 1:
+            terms.insert(0, terms.pop(self._most_selective(terms)))
+        result = list(islice(self._matches(terms), limit))
+        if key is not None:
+            result.sort(key=key)
+        return result
+
+
+def hit_order(doc):
+    """Порядок найденного документа: узлы, фреймы, слоты, типы связей; затем по имени"""
+    return KIND_ORDER[doc[0]], doc[1:]
+
+
+class KnowledgeSearch:
+    """Поиск по сети и фреймам с обновлением индекса по событиям моделей
+
+    Документы: ("node", имя), ("relation_type", тип), ("frame", имя) и
+    ("slot", фрейм, слот) - текст слота составляют его имя и значение.
+    """
+
+    def __init__(self, graph, frame_store):
+        self.graph = graph
+        self.frame_store = frame_store
+        self.index = SearchIndex()
+        self.rebuild()
+        graph.subscribe(self.on_graph_event)
+        frame_store.subscribe(self.on_frames_event)
+
+    def _graph_documents(self):
+        for name in self.graph.nodes:
+            yield ("node", name), name
+        for relation_type in self.graph.relation_types():
+            yield ("relation_type", relation_type), relation_type
+
+    def _frame_documents(self, name, frame):
+        yield ("frame", name), name
+        for slot_name, value in frame["slots"].items():
+            yield ("slot", name, slot_name), f"{slot_name} {value}"
+
+    def rebuild(self):
+        """Построение индекса по всей сети и всем фреймам"""
+        documents = list(self._graph_documents())
+        for name, frame in self.frame_store.frames.items():
+            documents.extend(self._frame_documents(name, frame))
+        self.index.rebuild(documents)
+
+    def on_graph_event(self, event, *args):
+        """Учет изменения сети"""
+        if event == "node_added":
+            self.index.add(("node", args[0]), args[0])
+        elif event == "node_removed":
+            self.index.discard(("node", args[0]))
+        elif event == "relation_added":
+            relation_type = args[0]["type"]
+            if ("relation_type", relation_type) not in self.index:
+                self.index.add(("relation_type", relation_type), relation_type)
+        elif event == "relation_removed":
+            relation_type = args[0]["type"]
+            if not self.graph.estimate(relation_type=relation_type):
+                self.index.discard(("relation_type", relation_type))
+        elif event in ("cleared", "reset"):
+            # После массового изменения индекс дешевле построить заново
+            self.rebuild()
+
+    def on_frames_event(self, event, *args):
+        """Учет изменения фреймов"""
+        if event == "frame_added":
+            name = args[0]
+            for doc, text in self._frame_documents(name, self.frame_store.frames[name]):
+                self.index.add(doc, text)
+        elif event == "frame_removed":
+            name, frame = args
+            for doc, _ in self._frame_documents(name, frame):
+                self.index.discard(doc)
+        elif event == "slot_changed":
+            name, slot_name = args[0], args[1]
+            slots = self.frame_store.frames[name]["slots"]
+            if slot_name in slots:
+                self.index.add(("slot", name, slot_name), f"{slot_name} {slots[slot_name]}")
+            else:
+                self.index.discard(("slot", name, slot_name))
+        elif event in ("cleared", "reset"):
+            self.rebuild()
+
+    def search(self, query, limit=100):
+        """Найденные документы в порядке hit_order"""
+        return self.index.search(query, limit, key=hit_order)
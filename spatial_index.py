@@ -0,0 +1,214 @@
+import math
+
+
+class GridIndex:
+    """Равномерная сетка для поиска элементов по прямоугольной области
+
+    Каждый элемент задается прямоугольником (точка - вырожденный прямоугольник)
+    и регистрируется во всех ячейках, которые он покрывает. Элементы, покрывающие
+    слишком много ячеек (длинные связи), хранятся отдельным списком и проверяются
+    при каждом запросе.
+    """
+
+    def __init__(self, cell_size=200, max_cells=64):
+        self.cell_size = cell_size
+        self.max_cells = max_cells
+        self._cells = {}
+        self._boxes = {}
+        self._key_cells = {}
+        self._overflow = set()
+        # Внешние границы всех когда-либо добавленных элементов (при удалении не сужаются)
+        self._outer = None
+
+    def __len__(self):
+        return len(self._boxes)
+
+    def __contains__(self, key):
+        return key in self._boxes
+
+    def _cell_range(self, x1, y1, x2, y2):
+        """Диапазон индексов ячеек, покрываемых прямоугольником"""
+        size = self.cell_size
+        return (math.floor(x1 / size), math.floor(y1 / size),
+                math.floor(x2 / size), math.floor(y2 / size))
+
+    def insert(self, key, x1, y1, x2=None, y2=None):
+        """Добавление (или перемещение) элемента"""
+        if x2 is None:
+            x2, y2 = x1, y1
+        if key in self._boxes:
+            self.remove(key)
+        self._boxes[key] = (x1, y1, x2, y2)
+        outer = self._outer
+        if outer is None:
+            self._outer = (x1, y1, x2, y2)
+        elif x1 < outer[0] or y1 < outer[1] or x2 > outer[2] or y2 > outer[3]:
+            self._outer = (min(x1, outer[0]), min(y1, outer[1]), max(x2, outer[2]), max(y2, outer[3]))
+        cx1, cy1, cx2, cy2 = self._cell_range(x1, y1, x2, y2)
+        if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > self.max_cells:
+            self._overflow.add(key)
+            self._key_cells[key] = None
+            return
+        cells = []
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                cell = (cx, cy)
+                self._cells.setdefault(cell, set()).add(key)
+                cells.append(cell)
+        self._key_cells[key] = cells
+
+    def move(self, key, x1, y1, x2=None, y2=None):
+        """Перемещение элемента"""
+        self.insert(key, x1, y1, x2, y2)
+
+    def remove(self, key):
+        """Удаление элемента"""
+        del self._boxes[key]
+        cells = self._key_cells.pop(key)
+        if cells is None:
+            self._overflow.discard(key)
+            return
+        for cell in cells:
+            bucket = self._cells[cell]
+            bucket.discard(key)
+            if not bucket:
+                del self._cells[cell]
+
+    def discard(self, key):
+        """Удаление элемента, если он есть"""
+        if key in self._boxes:
+            self.remove(key)
+
+    def clear(self):
+        """Очистка индекса"""
+        self._cells.clear()
+        self._boxes.clear()
+        self._key_cells.clear()
+        self._overflow.clear()
+        self._outer = None
+
+    def box(self, key):
+        """Прямоугольник элемента"""
+        return self._boxes[key]
+
+    def query_rect(self, x1, y1, x2, y2):
+        """Элементы, пересекающиеся с прямоугольником"""
+        cx1, cy1, cx2, cy2 = self._cell_range(x1, y1, x2, y2)
+        candidates = set(self._overflow)
+        if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > len(self._cells):
+            # Область больше занятой части сетки - обходим только занятые ячейки
+            for (cx, cy), bucket in self._cells.items():
+                if cx1 <= cx <= cx2 and cy1 <= cy <= cy2:
+                    candidates.update(bucket)
+        else:
+            for cx in range(cx1, cx2 + 1):
+                for cy in range(cy1, cy2 + 1):
+                    bucket = self._cells.get((cx, cy))
+                    if bucket:
+                        candidates.update(bucket)
+        boxes = self._boxes
+        return {key for key in candidates
+                if boxes[key][0] <= x2 and boxes[key][2] >= x1
+                and boxes[key][1] <= y2 and boxes[key][3] >= y1}
+
+    def intersects(self, x1, y1, x2, y2):
+        """Пересекается ли прямоугольник хотя бы с одним элементом (без сбора всех совпадений)"""
+        boxes = self._boxes
+        for key in self._overflow:
+            box = boxes[key]
+            if box[0] <= x2 and box[2] >= x1 and box[1] <= y2 and box[3] >= y1:
+                return True
+        size = self.cell_size
+        cx1, cy1, cx2, cy2 = int(x1 // size), int(y1 // size), int(x2 // size), int(y2 // size)
+        if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > len(self._cells):
+            return bool(self.query_rect(x1, y1, x2, y2))
+        cells = self._cells
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                for key in cells.get((cx, cy), ()):
+                    box = boxes[key]
+                    if box[0] <= x2 and box[2] >= x1 and box[1] <= y2 and box[3] >= y1:
+                        return True
+        return False
+
+    def bounds(self):
+        """Приблизительные границы всех элементов (с точностью до ячейки)"""
+        if not self._boxes:
+            return None
+        if self._overflow or not self._cells:
+            boxes = self._boxes.values()
+            return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+                    max(b[2] for b in boxes), max(b[3] for b in boxes))
+        size = self.cell_size
+        xs = [cx for cx, _ in self._cells]
+        ys = [cy for _, cy in self._cells]
+        return min(xs) * size, min(ys) * size, (max(xs) + 1) * size, (max(ys) + 1) * size
+
+    def outer_bounds(self):
+        """Прямоугольник, охватывающий все элементы, за O(1) (может быть шире точных границ)"""
+        return self._outer
+
+    def any_within(self, x, y, radius):
+        """Есть ли элемент, центр которого ближе radius к точке"""
+        radius_sq = radius * radius
+        for key in self.query_rect(x - radius, y - radius, x + radius, y + radius):
+            x1, y1, x2, y2 = self._boxes[key]
+            dx = (x1 + x2) / 2 - x
+            dy = (y1 + y2) / 2 - y
+            if dx*dx + dy*dy < radius_sq:
+                return True
+        return False
+
+
+def _ring(center_x, center_y, step, ring):
+    """Точки решетки на квадратном кольце номер ring вокруг центра"""
+    if ring == 0:
+        yield center_x, center_y
+        return
+    for i in range(-ring, ring + 1):
+        yield center_x + i * step, center_y - ring * step
+        yield center_x + i * step, center_y + ring * step
+    for i in range(-ring + 1, ring):
+        yield center_x - ring * step, center_y + i * step
+        yield center_x + ring * step, center_y + i * step
+
+
+def find_free_position(index, center_x, center_y, min_distance, bounds, spiral_step, max_attempts=100):
+    """Поиск позиции, удаленной от всех элементов индекса не менее чем на min_distance
+
+    Сначала перебираются кандидаты по спирали вокруг центра, затем - точки
+    решетки кольцами вокруг центра внутри границ. Если внутри границ места
+    нет, позиция ищется в столбце решетки справа от всех элементов индекса,
+    поэтому она находится всегда. Число проверяемых кандидатов зависит
+    только от размеров границ, а не от числа элементов; проверка каждого
+    кандидата затрагивает только соседние ячейки индекса.
+    """
+    min_x, min_y, max_x, max_y = bounds
+    for attempt in range(max_attempts):
+        radius = spiral_step * (attempt // 10 + 1)
+        angle = attempt * 0.5
+        x = center_x + radius * math.cos(angle)
+        y = center_y + radius * math.sin(angle)
+        if x < min_x or x > max_x or y < min_y or y > max_y:
+            continue
+        if not index.any_within(x, y, min_distance):
+            return x, y
+
+    # Кольца с номером больше inner_rings целиком лежат за границами
+    step = min_distance
+    inner_rings = int(max(center_x - min_x, max_x - center_x, center_y - min_y, max_y - center_y) // step)
+    for ring in range(inner_rings + 1):
+        for x, y in _ring(center_x, center_y, step, ring):
+            if min_x <= x <= max_x and min_y <= y <= max_y and not index.any_within(x, y, min_distance):
+                return x, y
+
+    # Внутри границ места нет - дозаполняем крайний правый столбец за границами,
+    # а заполненный столбец сменяется новым справа от него
+    outer = index.outer_bounds()
+    column_x = outer[2] if outer is not None else max_x
+    if column_x > max_x:
+        for row in range(int((max_y - min_y) // step) + 1):
+            y = min_y + row * step
+            if not index.any_within(column_x, y, min_distance):
+                return column_x, y
+    return max(column_x, max_x) + step, min_y
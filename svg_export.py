@@ -0,0 +1,229 @@
+from frames_renderer import draw_frames
+from network_renderer import NetworkRenderer
+
+# Пункты шрифта Tk -> пиксели SVG (96 точек на дюйм)
+POINT_TO_PIXEL = 4 / 3
+# Средняя ширина символа относительно размера шрифта (для переноса строк)
+CHAR_WIDTH = 0.55
+LINE_HEIGHT = 1.2
+DEFAULT_FONT = ("Arial", 10)
+
+
+def _escape(text):
+    """Экранирование текста для XML"""
+    return (str(text).replace("&", "&amp;").replace("<", "&lt;")
+            .replace(">", "&gt;").replace('"', "&quot;"))
+
+
+def _font(options):
+    """Семейство, размер в пикселях и насыщенность шрифта из параметра font"""
+    font = options.get("font", DEFAULT_FONT)
+    family = font[0]
+    size = abs(font[1]) * (POINT_TO_PIXEL if font[1] > 0 else 1)
+    weight = "bold" if "bold" in font[2:] else "normal"
+    return family, size, weight
+
+
+def wrap_text(text, width, font_size):
+    """Перенос текста по словам так же, как параметр width у текста Tk"""
+    if not width:
+        return str(text).split("\n")
+    max_chars = max(1, int(width / (font_size * CHAR_WIDTH)))
+    lines = []
+    for paragraph in str(text).split("\n"):
+        line = ""
+        for word in paragraph.split(" "):
+            candidate = f"{line} {word}" if line else word
+            if len(candidate) <= max_chars or not line:
+                line = candidate
+            else:
+                lines.append(line)
+                line = word
+        lines.append(line)
+    return lines
+
+
+class SvgCanvas:
+    """Холст с подмножеством API tkinter.Canvas, собирающий рисунок для SVG
+
+    Поддерживает то, чем пользуются NetworkRenderer и draw_frames:
+    создание линий, овалов, прямоугольников и текста, coords, itemconfigure,
+    delete, tag_raise/tag_lower и bbox. Порядок отрисовки задается
+    глубиной элемента, как в стеке элементов Tk.
+    """
+
+    def __init__(self, background="white"):
+        self.background = background
+        # номер -> [вид, координаты, параметры, теги]
+        self._items = {}
+        self._next_id = 1
+        # Порядок отрисовки: номер -> глубина; tag_raise/tag_lower меняют только глубину
+        self._depth = {}
+        self._top = 0
+        self._bottom = 0
+
+    def _create(self, kind, coords, options):
+        if len(coords) == 1:
+            coords = coords[0]
+        tags = options.pop("tags", ())
+        if isinstance(tags, str):
+            tags = (tags,)
+        item = self._next_id
+        self._next_id += 1
+        self._items[item] = [kind, [float(value) for value in coords], options, tuple(tags)]
+        self._top += 1
+        self._depth[item] = self._top
+        return item
+
+    def create_line(self, *coords, **options):
+        return self._create("line", coords, options)
+
+    def create_oval(self, *coords, **options):
+        return self._create("oval", coords, options)
+
+    def create_rectangle(self, *coords, **options):
+        return self._create("rectangle", coords, options)
+
+    def create_text(self, *coords, **options):
+        return self._create("text", coords, options)
+
+    def find_withtag(self, tag_or_id):
+        """Номера элементов с тегом (или один элемент по номеру)"""
+        if tag_or_id == "all":
+            return list(self._items)
+        if isinstance(tag_or_id, int):
+            return [tag_or_id] if tag_or_id in self._items else []
+        return [item for item, data in self._items.items() if tag_or_id in data[3]]
+
+    def coords(self, item, *coords):
+        if not coords:
+            return list(self._items[item][1])
+        if len(coords) == 1:
+            coords = coords[0]
+        self._items[item][1] = [float(value) for value in coords]
+
+    def itemconfigure(self, item, **options):
+        for found in self.find_withtag(item):
+            self._items[found][2].update(options)
+
+    itemconfig = itemconfigure
+
+    def delete(self, *items):
+        for tag_or_id in items:
+            if tag_or_id == "all":
+                self._items.clear()
+                self._depth.clear()
+                return
+            for item in self.find_withtag(tag_or_id):
+                del self._items[item]
+                del self._depth[item]
+
+    def tag_raise(self, tag_or_id):
+        """Перенос элементов поверх остальных (с сохранением их взаимного порядка)"""
+        for item in sorted(self.find_withtag(tag_or_id), key=self._depth.__getitem__):
+            self._top += 1
+            self._depth[item] = self._top
+
+    def tag_lower(self, tag_or_id):
+        """Перенос элементов под остальные (с сохранением их взаимного порядка)"""
+        for item in sorted(self.find_withtag(tag_or_id), key=self._depth.__getitem__, reverse=True):
+            self._bottom -= 1
+            self._depth[item] = self._bottom
+
+    def _item_bbox(self, kind, coords, options):
+        """Охватывающий прямоугольник элемента"""
+        if kind != "text":
+            xs, ys = coords[0::2], coords[1::2]
+            pad = options.get("width", 1) / 2
+            return min(xs) - pad, min(ys) - pad, max(xs) + pad, max(ys) + pad
+        _, size, _ = _font(options)
+        lines = wrap_text(options.get("text", ""), options.get("width"), size)
+        width = max(len(line) for line in lines) * size * CHAR_WIDTH
+        height = len(lines) * size * LINE_HEIGHT
+        x, y = coords
+        left = x if options.get("anchor") == "w" else x - width / 2
+        return left, y - height / 2, left + width, y + height / 2
+
+    def bbox(self, tag_or_id="all"):
+        boxes = [self._item_bbox(*self._items[item][:3]) for item in self.find_withtag(tag_or_id)]
+        if not boxes:
+            return None
+        return (min(box[0] for box in boxes), min(box[1] for box in boxes),
+                max(box[2] for box in boxes), max(box[3] for box in boxes))
+
+    def _element(self, kind, coords, options, markers):
+        """Элемент SVG для одного элемента холста"""
+        fill = options.get("fill", "black" if kind in ("line", "text") else "") or "none"
+        if kind == "line":
+            width = options.get("width", 1)
+            marker = ""
+            if options.get("arrow") in ("last", "both"):
+                markers.add(fill)
+                marker = f' marker-end="url(#arrow-{_escape(fill)})"'
+            if options.get("arrow") in ("first", "both"):
+                markers.add(fill)
+                marker += f' marker-start="url(#arrow-{_escape(fill)})"'
+            points = " ".join(f"{value:.1f}" for value in coords)
+            return (f'<polyline points="{points}" fill="none" stroke="{_escape(fill)}" '
+                    f'stroke-width="{width}"{marker}/>')
+        if kind in ("oval", "rectangle"):
+            x1, y1, x2, y2 = coords
+            outline = options.get("outline", "black") or "none"
+            style = f'fill="{_escape(fill)}" stroke="{_escape(outline)}" stroke-width="{options.get("width", 1)}"'
+            if kind == "oval":
+                return (f'<ellipse cx="{(x1 + x2) / 2:.1f}" cy="{(y1 + y2) / 2:.1f}" '
+                        f'rx="{abs(x2 - x1) / 2:.1f}" ry="{abs(y2 - y1) / 2:.1f}" {style}/>')
+            return (f'<rect x="{min(x1, x2):.1f}" y="{min(y1, y2):.1f}" width="{abs(x2 - x1):.1f}" '
+                    f'height="{abs(y2 - y1):.1f}" {style}/>')
+        family, size, weight = _font(options)
+        lines = wrap_text(options.get("text", ""), options.get("width"), size)
+        x, y = coords
+        anchor = "start" if options.get("anchor") == "w" else "middle"
+        first = y - (len(lines) - 1) * size * LINE_HEIGHT / 2
+        spans = "".join(
+            f'<tspan x="{x:.1f}" y="{first + i * size * LINE_HEIGHT:.1f}">{_escape(line)}</tspan>'
+            for i, line in enumerate(lines))
+        return (f'<text font-family="{_escape(family)}" font-size="{size:.1f}" font-weight="{weight}" '
+                f'fill="{_escape(fill)}" text-anchor="{anchor}" dominant-baseline="central">{spans}</text>')
+
+    def to_svg(self, margin=20):
+        """Текст SVG-документа с рисунком"""
+        bounds = self.bbox("all") or (0, 0, 0, 0)
+        x1, y1 = bounds[0] - margin, bounds[1] - margin
+        width, height = bounds[2] - bounds[0] + 2 * margin, bounds[3] - bounds[1] + 2 * margin
+        markers = set()
+        body = [self._element(*self._items[item][:3], markers)
+                for item in sorted(self._items, key=self._depth.__getitem__)]
+        defs = "".join(
+            f'<marker id="arrow-{_escape(color)}" viewBox="0 0 10 10" refX="10" refY="5" '
+            f'markerWidth="8" markerHeight="8" orient="auto-start-reverse">'
+            f'<path d="M0,0 L10,5 L0,10 z" fill="{_escape(color)}"/></marker>'
+            for color in sorted(markers))
+        return "\n".join([
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="{x1:.1f} {y1:.1f} {width:.1f} {height:.1f}" '
+            f'width="{width:.0f}" height="{height:.0f}">',
+            f"<defs>{defs}</defs>",
+            f'<rect x="{x1:.1f}" y="{y1:.1f}" width="{width:.1f}" height="{height:.1f}" fill="{self.background}"/>',
+            *body,
+            "</svg>",
+            "",
+        ])
+
+
+def render_network_svg(graph, node_radius=60, margin=20):
+    """SVG семантической сети в стиле редактора"""
+    canvas = SvgCanvas()
+    renderer = NetworkRenderer(canvas, graph, node_radius)
+    try:
+        renderer.render()
+    finally:
+        graph.unsubscribe(renderer.on_graph_event)
+    return canvas.to_svg(margin)
+
+
+def render_frames_svg(frames, margin=20):
+    """SVG фреймов в стиле редактора"""
+    canvas = SvgCanvas()
+    draw_frames(canvas, frames)
+    return canvas.to_svg(margin)
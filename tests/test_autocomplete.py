@@ -0,0 +1,35 @@
+from autocomplete import PrefixIndex, normalize
+
+
+def test_normalize_casefolds_and_merges_yo():
+    assert normalize("ЁЛКА") == normalize("елка") == "елка"
+    assert normalize("Straße") == normalize("STRASSE")
+
+
+def test_cyrillic_prefixes_ignore_case_and_yo():
+    index = PrefixIndex(["Ёж", "ежевика", "Енот", "Ель", "Кот", "Straße"])
+    assert index.complete("ЕЖ") == ["Ёж", "ежевика"]
+    assert index.complete("ёж") == ["Ёж", "ежевика"]
+    assert index.complete("  е") == ["Ёж", "ежевика", "Ель", "Енот"]
+    assert index.complete("strass") == ["Straße"]
+    assert index.complete("е", limit=2) == ["Ёж", "ежевика"]
+    assert index.complete("я") == []
+    assert index.complete("") == ["Straße", "Ёж", "ежевика", "Ель", "Енот", "Кот"]
+
+
+def test_discard_and_rename():
+    index = PrefixIndex(["Кот", "Котенок", "Кит"])
+    index.discard("котенок")  # другое написание - другое имя
+    assert len(index) == 3
+    index.discard("Котенок")
+    index.discard("Котенок")
+    assert index.complete("кот") == ["Кот"] and len(index) == 2
+    # Переименование - удаление старого имени и добавление нового
+    index.discard("Кит")
+    index.add("Ёрш")
+    assert index.complete("ки") == [] and index.complete("ер") == ["Ёрш"]
+    # Имена, отличающиеся только регистром, хранятся оба
+    index.add("кот")
+    assert sorted(index.complete("КОТ")) == ["Кот", "кот"]
+    index.clear()
+    assert index.complete("к") == [] and len(index) == 0
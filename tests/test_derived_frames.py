@@ -0,0 +1,95 @@
+from derived_frames import CLASS_FRAME, OBJECT_FRAME, DerivedFrames
+from frame_model import FrameStore
+from graph_model import SemanticGraph
+from history import History
+
+
+def _models():
+    graph = SemanticGraph()
+    frame_store = FrameStore()
+    history = History(graph, frame_store)
+    for name, node_type in (("птица", "класс"), ("канарейка", "объект"), ("летать", "свойство")):
+        graph.add_node(name, node_type, 10, 20)
+    graph.add_relation("канарейка", "птица", "является")
+    graph.add_relation("птица", "летать", "умеет")
+    derived = DerivedFrames(graph, frame_store, history)
+    derived.enable()
+    history.clear()
+    return graph, frame_store, history, derived
+
+
+def test_frames_built_from_network():
+    graph, frame_store, _, derived = _models()
+    bird = frame_store.frames["Фрейм: Птица"]
+    assert bird["type"] == CLASS_FRAME
+    assert bird["slots"] == {"Класс": "Птица", "Умеет": "Летать", "Примеры": "Канарейка"}
+    canary = frame_store.frames["Фрейм: Канарейка"]
+    assert canary["type"] == OBJECT_FRAME and canary["slots"]["Тип"] == "Птица"
+    assert (canary["x"], canary["y"]) == (10, 20)
+    assert "Фрейм: Летать" not in frame_store
+    assert derived.is_derived("Фрейм: Птица") and derived.is_derived_slot("Фрейм: Птица", "Умеет")
+
+
+def test_relation_changes_update_slots():
+    graph, frame_store, _, _ = _models()
+    graph.add_node("петь", "свойство", 0, 0)
+    graph.add_relation("птица", "петь", "умеет")
+    assert frame_store.frames["Фрейм: Птица"]["slots"]["Умеет"] == "Летать, Петь"
+    graph.remove_relation("канарейка", "птица", "является")
+    assert "Примеры" not in frame_store.frames["Фрейм: Птица"]["slots"]
+    assert "Тип" not in frame_store.frames["Фрейм: Канарейка"]["slots"]
+
+
+def test_user_slots_survive_node_removal_and_undo():
+    graph, frame_store, history, derived = _models()
+    frame_store.set_slot("Фрейм: Канарейка", "Особенности", "Поет")
+    history.commit()
+    graph.remove_node("канарейка")
+    history.commit()
+    # Построенные слоты убраны, слот пользователя остался в обычном фрейме
+    assert frame_store.frames["Фрейм: Канарейка"]["slots"] == {"Особенности": "Поет"}
+    assert not derived.is_derived("Фрейм: Канарейка")
+
+    assert history.undo()
+    slots = frame_store.frames["Фрейм: Канарейка"]["slots"]
+    assert slots["Особенности"] == "Поет" and slots["Тип"] == "Птица"
+    assert history.undo()
+    assert "Особенности" not in frame_store.frames["Фрейм: Канарейка"]["slots"]
+    assert history.redo() and history.redo()
+    assert frame_store.frames["Фрейм: Канарейка"]["slots"] == {"Особенности": "Поет"}
+
+
+def test_frame_without_user_slots_is_removed_with_node():
+    graph, frame_store, history, _ = _models()
+    graph.remove_node("канарейка")
+    assert "Фрейм: Канарейка" not in frame_store
+    history.commit()
+    history.undo()
+    assert frame_store.frames["Фрейм: Канарейка"]["slots"]["Тип"] == "Птица"
+
+
+def test_retype_keeps_user_slots():
+    graph, frame_store, _, _ = _models()
+    frame_store.set_slot("Фрейм: Канарейка", "Особенности", "Поет")
+    graph.set_node_type("канарейка", "класс")
+    frame = frame_store.frames["Фрейм: Канарейка"]
+    assert frame["type"] == CLASS_FRAME
+    assert frame["slots"]["Особенности"] == "Поет" and frame["slots"]["Наследует"] == "Птица"
+    graph.set_node_type("канарейка", "свойство")
+    assert frame_store.frames["Фрейм: Канарейка"]["slots"] == {"Особенности": "Поет"}
+
+
+def test_history_skips_records_that_no_longer_match():
+    graph, frame_store, history, _ = _models()
+    frame_store.set_slot("Фрейм: Птица", "Цвет", "Разный")
+    history.commit()
+    frame_store.remove_slot("Фрейм: Птица", "Цвет")
+    with history.muted():
+        frame_store.set_slot("Фрейм: Птица", "Цвет", "Другой")
+    frame_store.delete_frame("Фрейм: Птица")
+    with history.muted():
+        frame_store.create_frame("Фрейм: Птица", CLASS_FRAME, 0, 0)
+    history.commit()
+    assert history.undo()
+    assert history.undo()
+    assert "Цвет" not in frame_store.frames["Фрейм: Птица"]["slots"]
@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+
+import pytest
+
+tk = pytest.importorskip("tkinter")
+
+from Python_File import SemanticNetworkEditor
+
+
+@pytest.fixture
+def editor():
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("Tk недоступен без дисплея")
+    root.withdraw()
+    editor = SemanticNetworkEditor(root, interactive=False)
+    yield editor
+    root.destroy()
+
+
+def test_batch_refreshes_once_and_records_one_history_step(editor):
+    refreshes = []
+    refresh_views = editor.refresh_views
+    editor.refresh_views = lambda views: refreshes.append(set(views)) or refresh_views(views)
+    editor.history.clear()
+    nodes_before = set(editor.nodes)
+    with editor.batch():
+        for i in range(100):
+            editor.add_node(f"узел {i}", "объект", i * 10, 50)
+        for i in range(1, 100):
+            editor.add_relation(f"узел {i}", f"узел {i - 1}", "имеет")
+        with editor.batch():
+            editor.create_frame("Фрейм: Узел", "фрейм объекта")
+            editor.add_slot("Фрейм: Узел", "Тип", "Объект")
+        assert refreshes == []
+    assert len(refreshes) == 1 and {"network", "comboboxes"} <= refreshes[0]
+    assert "узел 99" in editor.network_renderer.node_items
+    assert "Тип" in editor.frames["Фрейм: Узел"]["slots"]
+    # Весь пакет отменяется одним шагом
+    editor.history.undo()
+    assert set(editor.nodes) == nodes_before and "Фрейм: Узел" not in editor.frames
+    assert not editor.history.can_undo()
+
+
+def test_completion_follows_renamed_node(editor):
+    editor.add_node("Ёжик", "объект", 100, 100)
+    assert editor.node_completion.complete("еж") == ["Ёжик"]
+    editor.graph.rename_node("Ёжик", "Енот")
+    assert editor.node_completion.complete("еж") == []
+    assert editor.node_completion.complete("ЕНО") == ["Енот"]
+
+
+def test_frames_collapse_above_threshold(editor):
+    limit = editor.FRAMES_COLLAPSE_AUTO_LIMIT
+    with editor.batch():
+        for i in range(limit - len(editor.frames)):
+            editor.frame_store.create_frame(f"Фрейм {i}", "фрейм объекта", 300, 300 + i * 10)
+    editor.draw_frames()
+    assert len(editor.frames) == limit
+    assert not editor.frames_renderer.collapsed_by_default
+    editor.frame_store.create_frame("Еще фрейм", "фрейм объекта", 300, 0)
+    editor.draw_frames()
+    assert editor.frames_renderer.collapsed_by_default
+    assert editor.frames_renderer.is_collapsed("Еще фрейм")
+
+
+def test_zoom_network_keeps_point_under_cursor(editor):
+    renderer = editor.network_renderer
+    canvas = editor.network_canvas
+    event = SimpleNamespace(x=300, y=200, delta=120)
+    cursor = canvas.canvasx(event.x), canvas.canvasy(event.y)
+    world = renderer.to_world(*cursor)
+    for delta in (120, 120, -120, 120):
+        event.delta = delta
+        editor.zoom_network(event)
+        x, y = renderer.to_canvas(*world)
+        assert abs(x - cursor[0]) < 1e-9 and abs(y - cursor[1]) < 1e-9
+    assert abs(editor.network_zoom_level - editor.ZOOM_STEP ** 2) < 1e-9
+    assert abs(renderer.scale - editor.network_zoom_level) < 1e-9
+    # Масштаб ограничен сверху; у предела колесо ничего не меняет
+    for _ in range(100):
+        editor.zoom_network(event)
+    assert abs(editor.network_zoom_level - editor.ZOOM_MAX) < 1e-9
+    x, y = renderer.to_canvas(*world)
+    assert abs(x - cursor[0]) < 1e-6 and abs(y - cursor[1]) < 1e-6
@@ -0,0 +1,52 @@
+from frame_model import FrameStore
+from frame_resolution import SlotResolver, normalize_name, split_values
+
+
+def _store():
+    store = FrameStore()
+    store.create_frame("Фрейм: Животное", "фрейм класса", 0, 0,
+                       {"Класс": "Животное", "Имеет": "Кожа", "Умеет": "Дышать"})
+    store.create_frame("Фрейм: Птица", "фрейм класса", 0, 0,
+                       {"Класс": "Птица", "Наследует": "Животное", "Умеет": "Летать"})
+    store.create_frame("Фрейм: Канарейка", "фрейм объекта", 0, 0,
+                       {"Объект": "Канарейка", "Тип": "Птица", "Цвет": "Желтый"})
+    return store
+
+
+def test_helpers():
+    assert normalize_name("  Фрейм: Ёж ") == "еж"
+    assert split_values("Птица, ,Рыба") == ["Птица", "Рыба"]
+
+
+def test_resolve_nearest_value_and_source():
+    resolver = SlotResolver(_store())
+    assert resolver.resolve("Фрейм: Канарейка", "Умеет") == ("Летать", "Фрейм: Птица")
+    assert resolver.resolve("Фрейм: Канарейка", "Имеет") == ("Кожа", "Фрейм: Животное")
+    assert resolver.resolve("Фрейм: Канарейка", "Класс") is None
+    assert resolver.ancestors("Фрейм: Канарейка") == ["Фрейм: Птица", "Фрейм: Животное"]
+    slots = resolver.resolved_slots("Фрейм: Канарейка")
+    assert slots["Цвет"] == ("Желтый", "Фрейм: Канарейка") and "Класс" not in slots
+
+
+def test_cache_is_invalidated_by_changes():
+    store = _store()
+    resolver = SlotResolver(store)
+    assert resolver.resolve("Фрейм: Канарейка", "Умеет")[0] == "Летать"
+    store.set_slot("Фрейм: Канарейка", "Умеет", "Петь")
+    assert resolver.resolve("Фрейм: Канарейка", "Умеет") == ("Петь", "Фрейм: Канарейка")
+    store.remove_slot("Фрейм: Канарейка", "Умеет")
+    store.remove_slot("Фрейм: Птица", "Умеет")
+    assert resolver.resolve("Фрейм: Канарейка", "Умеет") == ("Дышать", "Фрейм: Животное")
+    store.delete_frame("Фрейм: Птица")
+    assert resolver.resolve("Фрейм: Канарейка", "Имеет") is None
+    store.create_frame("Пернатые", "фрейм класса", 0, 0, {"Класс": "Птица", "Имеет": "Перья"})
+    assert resolver.resolve("Фрейм: Канарейка", "Имеет") == ("Перья", "Пернатые")
+
+
+def test_cycle_terminates():
+    store = FrameStore()
+    store.create_frame("А", "фрейм класса", 0, 0, {"Наследует": "Б"})
+    store.create_frame("Б", "фрейм класса", 0, 0, {"Наследует": "А"})
+    resolver = SlotResolver(store)
+    assert resolver.resolve("А", "Цвет") is None
+    assert resolver.ancestors("А") == ["Б"]
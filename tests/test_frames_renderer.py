@@ -0,0 +1,74 @@
+from frame_model import FrameStore
+from frames_renderer import (HEADER_HEIGHT, SLOT_HEIGHT, SLOTS_BOTTOM, SLOTS_TOP, FramesRenderer, TextMeasure,
+                             frame_height)
+from svg_export import SvgCanvas
+
+
+class CountingFont:
+    """Шрифт с фиксированной шириной символа, считающий измерения"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def measure(self, text):
+        self.calls += 1
+        return len(text) * 10
+
+    def metrics(self, option):
+        return 15
+
+
+def _frame(*slots):
+    return {"type": "фрейм объекта", "x": 300, "y": 300, "slots": dict(slots)}
+
+
+def test_collapsed_and_expanded_heights():
+    measure = TextMeasure(CountingFont(), width=120)
+    frame = _frame(("Тип", "Птица"), ("Цвет", "желтый очень яркий"))
+    # По 12 символов в строке: "Цвет: желтый" и "очень яркий"
+    assert measure.line_count("Цвет: желтый очень яркий") == 2
+    expanded = frame_height(frame, measure)
+    assert expanded == SLOTS_TOP + SLOTS_BOTTOM + SLOT_HEIGHT + (SLOT_HEIGHT + 15)
+    assert frame_height(frame, measure, collapsed=True) == HEADER_HEIGHT
+    assert frame_height(_frame(), measure) == SLOTS_TOP + SLOTS_BOTTOM
+    # Слово длиннее строки переносится посимвольно
+    assert measure.line_count("а" * 25) == 3
+
+
+def test_slot_measurement_is_cached():
+    font = CountingFont()
+    measure = TextMeasure(font, width=100)
+    frame = _frame(("Тип", "Птица"), ("Цвет", "желтый очень яркий"))
+    first = frame_height(frame, measure)
+    calls = font.calls
+    assert calls > 0
+    assert frame_height(frame, measure) == first and font.calls == calls
+    # Измеряется только новая строка
+    frame["slots"]["Умеет"] = "петь"
+    frame_height(frame, measure)
+    alone = CountingFont()
+    TextMeasure(alone, width=100).line_count("Умеет: петь")
+    assert font.calls - calls == alone.calls
+
+
+def test_renderer_collapses_frames_and_updates_index():
+    store = FrameStore()
+    store.create_frame("Фрейм: Птица", "фрейм класса", 300, 300)
+    store.set_slot("Фрейм: Птица", "Умеет", "летать")
+    store.set_slot("Фрейм: Птица", "Имеет", "перья")
+    renderer = FramesRenderer(SvgCanvas(), store)
+    renderer.render()
+    x1, y1, x2, y2 = renderer.index.box("Фрейм: Птица")
+    assert y2 - y1 > HEADER_HEIGHT and len(renderer.frame_items["Фрейм: Птица"]) == 5
+    renderer.toggle("Фрейм: Птица")
+    renderer.render()
+    x1, y1, x2, y2 = renderer.index.box("Фрейм: Птица")
+    assert y2 - y1 == HEADER_HEIGHT and len(renderer.frame_items["Фрейм: Птица"]) == 2
+    text = renderer.canvas._items[renderer.frame_items["Фрейм: Птица"][1]][2]["text"]
+    assert text == "▸ Фрейм: Птица"
+    # Сворачивание всех фреймов сбрасывает исключения
+    renderer.set_collapsed_by_default(True)
+    renderer.render()
+    assert renderer.is_collapsed("Фрейм: Птица")
+    renderer.toggle("Фрейм: Птица")
+    assert not renderer.is_collapsed("Фрейм: Птица")
@@ -0,0 +1,114 @@
+import pytest
+
+from graph_model import SemanticGraph
+
+
+def _graph():
+    graph = SemanticGraph()
+    graph.add_node("птица", "класс", 0, 0)
+    graph.add_node("канарейка", "объект", 10, 20)
+    graph.add_node("летать", "свойство", 30, 40)
+    graph.add_relation("канарейка", "птица", "является")
+    graph.add_relation("птица", "летать", "умеет")
+    graph.add_relation("канарейка", "летать", "умеет")
+    return graph
+
+
+def test_indexes_after_add_relation():
+    graph = _graph()
+    assert graph.outgoing("канарейка") == [("канарейка", "птица", "является"), ("канарейка", "летать", "умеет")]
+    assert graph.outgoing("канарейка", "умеет") == [("канарейка", "летать", "умеет")]
+    assert sorted(graph.incoming("летать")) == [("канарейка", "летать", "умеет"), ("птица", "летать", "умеет")]
+    assert graph.incoming("канарейка") == []
+    assert graph.relations_of_type("является") == [("канарейка", "птица", "является")]
+    assert sorted(graph.relation_types()) == ["умеет", "является"]
+    assert graph.match(to_node="летать", relation_type="умеет") == graph.incoming("летать")
+    assert graph.match("канарейка", None, "летать") == [("канарейка", "летать", "умеет")]
+    assert graph.estimate(relation_type="является") == 1 and graph.estimate(to_node="летать") == 2
+    assert graph.degree("канарейка") == 2
+    assert sorted(graph.neighbors("летать")) == ["канарейка", "птица"]
+    relation = graph.get_relation("птица", "летать", "умеет")
+    assert (relation["from"], relation["to"], relation["type"]) == ("птица", "летать", "умеет")
+
+
+def test_duplicates_and_missing_nodes_are_rejected():
+    graph = _graph()
+    with pytest.raises(ValueError):
+        graph.add_relation("канарейка", "птица", "является")
+    with pytest.raises(KeyError):
+        graph.add_relation("канарейка", "рыба", "является")
+    with pytest.raises(ValueError):
+        graph.add_node("птица", "класс", 0, 0)
+    # Связь того же направления, но другого типа - не повтор
+    graph.add_relation("канарейка", "птица", "умеет")
+    assert len(graph.match("канарейка", None, "птица")) == 2
+
+
+def test_remove_node_cleans_every_index():
+    graph = _graph()
+    events = []
+    graph.subscribe(lambda event, *args: events.append((event, args)))
+    node_id = graph.node_id("птица")
+    graph.remove_node("птица")
+    assert not graph.has_node("птица")
+    assert graph.relations_of_type("является") == [] and "является" not in graph.relation_types()
+    assert graph.outgoing("канарейка") == [("канарейка", "летать", "умеет")]
+    assert graph.incoming("летать") == [("канарейка", "летать", "умеет")]
+    assert not graph.has_relation("птица", "летать", "умеет")
+    assert [event for event, _ in events] == ["relation_removed", "relation_removed", "node_removed"]
+    assert events[-1][1] == ("птица", {"type": "класс", "x": 0, "y": 0})
+    # Освободившийся номер занимает новый узел
+    assert graph.add_node("рыба", "класс", 5, 5) == node_id
+    assert graph.nodes["рыба"] == {"type": "класс", "x": 5, "y": 5}
+
+
+def test_rename_keeps_type_position_and_relations():
+    graph = _graph()
+    graph.rename_node("птица", "пернатые")
+    assert not graph.has_node("птица")
+    assert graph.node_type("пернатые") == "класс" and graph.position("пернатые") == (0, 0)
+    assert graph.outgoing("канарейка", "является") == [("канарейка", "пернатые", "является")]
+    assert graph.outgoing("пернатые") == [("пернатые", "летать", "умеет")]
+    assert sorted(graph.neighbors("летать")) == ["канарейка", "пернатые"]
+    with pytest.raises(ValueError):
+        graph.rename_node("пернатые", "канарейка")
+    with pytest.raises(KeyError):
+        graph.rename_node("птица", "рыба")
+
+
+def test_bulk_sends_one_reset():
+    graph = SemanticGraph()
+    events, bulk_events = [], []
+    graph.subscribe(lambda event, *args: events.append(event))
+    graph.subscribe(lambda event, *args: bulk_events.append(event), during_bulk=True)
+    with graph.bulk():
+        graph.add_node("а", "объект", 0, 0)
+        with graph.bulk():
+            graph.add_node("б", "объект", 0, 0)
+        graph.add_relation("а", "б", "имеет")
+    assert events == ["reset"]
+    assert bulk_events == ["node_added", "node_added", "relation_added", "reset"]
+
+
+def test_clear_restore_and_load_columns():
+    graph = _graph()
+    events = []
+    graph.subscribe(lambda event, *args: events.append((event, args)))
+    graph.clear()
+    assert len(graph.nodes) == 0 and not list(graph.relations)
+    event, (state,) = events[-1]
+    assert event == "cleared"
+    graph.restore(state)
+    assert events[-1] == ("reset", ())
+    assert graph.has_relation("канарейка", "птица", "является") and graph.position("канарейка") == (10, 20)
+
+    with pytest.raises(ValueError):
+        graph.load_columns(["а", "а"], ["объект"] * 2, [0, 0], [0, 0], [], [], [])
+    with pytest.raises(ValueError):
+        graph.load_columns(["а"], ["объект"], [0], [0], ["а"], ["б"], ["имеет"])
+    assert len(graph.nodes) == 3
+    events.clear()
+    graph.load_columns(["а", "б"], ["объект", "класс"], [1, 2], [3, 4], ["а"], ["б"], ["является"])
+    assert [event for event, _ in events] == ["reset"]
+    assert graph.outgoing("а") == [("а", "б", "является")] and graph.incoming("б") == [("а", "б", "является")]
+    assert graph.node_type("б") == "класс" and graph.position("б") == (2, 4)
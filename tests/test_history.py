@@ -0,0 +1,109 @@
+from frame_model import FrameStore
+from graph_model import SemanticGraph
+from history import History
+
+
+def _models(depth=100):
+    graph = SemanticGraph()
+    frame_store = FrameStore()
+    return graph, frame_store, History(graph, frame_store, depth=depth)
+
+
+def test_undo_redo_node_with_relations():
+    graph, _, history = _models()
+    graph.add_node("птица", "класс", 0, 0)
+    graph.add_node("канарейка", "объект", 5, 5)
+    graph.add_relation("канарейка", "птица", "является")
+    history.commit()
+    graph.remove_node("птица")
+    history.commit()
+
+    assert history.undo()
+    assert graph.has_relation("канарейка", "птица", "является")
+    assert graph.position("птица") == (0, 0)
+    assert history.redo()
+    assert not graph.has_node("птица") and not list(graph.relations)
+    assert history.undo() and history.undo()
+    assert len(graph.nodes) == 0
+    assert not history.undo()
+
+
+def test_layout_is_one_compact_record():
+    graph, _, history = _models()
+    for i in range(1000):
+        graph.add_node(f"n{i}", "объект", i, 0)
+    history.commit()
+    names = [f"n{i}" for i in range(1000)]
+    graph.set_positions(names, [0.0] * 1000, [float(i) for i in range(1000)])
+    history.commit()
+    step = history._undo[-1]
+    assert len(step.records) == 1 and step.records[0][0] == "positions"
+    history.undo()
+    assert graph.position("n7") == (7, 0)
+
+
+def test_merge_key_keeps_earliest_position():
+    graph, _, history = _models()
+    graph.add_node("а", "объект", 0, 0)
+    history.commit()
+    graph.move_node("а", 10, 10)
+    history.commit("layout")
+    graph.move_node("а", 20, 20)
+    history.commit("layout")
+    history.undo()
+    assert graph.position("а") == (0, 0)
+
+
+def test_new_edit_clears_redo():
+    graph, _, history = _models()
+    graph.add_node("а", "объект", 0, 0)
+    history.commit()
+    history.undo()
+    assert history.can_redo()
+    graph.add_node("б", "объект", 0, 0)
+    history.commit()
+    assert not history.can_redo() and not history.redo()
+
+
+def test_depth_is_bounded():
+    graph, _, history = _models(depth=3)
+    for i in range(10):
+        graph.add_node(str(i), "объект", 0, 0)
+        history.commit()
+    assert sum(1 for _ in iter(history.undo, False)) == 3
+    assert len(graph.nodes) == 7
+
+
+def test_clear_and_load_restore_previous_state():
+    graph, _, history = _models()
+    graph.add_node("а", "объект", 1, 2)
+    history.commit()
+    graph.load({"б": {"type": "класс", "x": 0, "y": 0}}, [])
+    history.commit()
+    history.undo()
+    assert list(graph.nodes) == ["а"] and graph.position("а") == (1, 2)
+
+
+def test_frames_and_slots():
+    _, frame_store, history = _models()
+    frame_store.create_frame("Фрейм: Птица", "фрейм класса", 0, 0, {"Класс": "Птица"})
+    history.commit()
+    frame_store.set_slot("Фрейм: Птица", "Умеет", "Летать")
+    frame_store.move_frame("Фрейм: Птица", 5, 5)
+    history.commit()
+    frame_store.delete_frame("Фрейм: Птица")
+    history.commit()
+
+    history.undo()
+    assert frame_store.frames["Фрейм: Птица"]["slots"]["Умеет"] == "Летать"
+    history.undo()
+    frame = frame_store.frames["Фрейм: Птица"]
+    assert "Умеет" not in frame["slots"] and (frame["x"], frame["y"]) == (0, 0)
+
+
+def test_muted_changes_are_not_recorded():
+    graph, _, history = _models()
+    with history.muted():
+        graph.add_node("а", "объект", 0, 0)
+    history.commit()
+    assert not history.can_undo()
@@ -0,0 +1,62 @@
+from graph_model import SemanticGraph
+from inference import InheritanceIndex
+
+
+def _closure(graph):
+    """Замыкание, посчитанное заново обходом сети"""
+    result = {}
+    for name in graph.nodes:
+        seen = set()
+        stack = [relation["to"] for relation in graph.outgoing(name, "является")]
+        while stack:
+            node = stack.pop()
+            if node not in seen:
+                seen.add(node)
+                stack.extend(relation["to"] for relation in graph.outgoing(node, "является"))
+        result[name] = seen
+    return result
+
+
+def _graph():
+    graph = SemanticGraph()
+    for name in ("животное", "птица", "рыба", "канарейка", "акула", "летать", "кожа"):
+        graph.add_node(name, "класс", 0, 0)
+    graph.add_relation("птица", "животное", "является")
+    graph.add_relation("рыба", "животное", "является")
+    graph.add_relation("канарейка", "птица", "является")
+    graph.add_relation("акула", "рыба", "является")
+    graph.add_relation("птица", "летать", "умеет")
+    graph.add_relation("животное", "кожа", "имеет")
+    return graph
+
+
+def test_transitive_queries():
+    graph = _graph()
+    index = InheritanceIndex(graph)
+    assert index.is_a("канарейка", "животное")
+    assert not index.is_a("канарейка", "рыба")
+    assert index.descendants("животное") == {"птица", "рыба", "канарейка", "акула"}
+    assert index.properties("канарейка") == {"умеет": {"летать"}, "имеет": {"кожа"}}
+    assert ("имеет", "кожа", "животное") in index.inherited("акула")
+
+
+def test_incremental_updates_match_full_rebuild():
+    graph = _graph()
+    index = InheritanceIndex(graph)
+    graph.add_relation("акула", "птица", "является")
+    graph.remove_relation("птица", "животное", "является")
+    graph.add_relation("животное", "канарейка", "является")  # цикл
+    graph.remove_relation("канарейка", "птица", "является")
+    graph.remove_node("рыба")
+    expected = _closure(graph)
+    for name in graph.nodes:
+        assert index.ancestors(name) == expected[name]
+        assert index.descendants(name) == {other for other in graph.nodes if name in expected[other]}
+
+
+def test_reset_rebuilds():
+    graph = _graph()
+    index = InheritanceIndex(graph)
+    graph.load({"а": {"type": "класс", "x": 0, "y": 0}, "б": {"type": "класс", "x": 0, "y": 0}},
+               [{"from": "а", "to": "б", "type": "является"}])
+    assert index.ancestors("а") == {"б"} and not index.is_a("канарейка", "птица")
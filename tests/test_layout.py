@@ -0,0 +1,172 @@
+import math
+import random
+
+import pytest
+
+import layout
+from graph_model import SemanticGraph
+from layout import hierarchical_positions
+
+
+def _graph(nodes, relations):
+    graph = SemanticGraph()
+    for name, node_type in nodes:
+        graph.add_node(name, node_type, 0, 0)
+    for from_node, relation_type, to_node in relations:
+        graph.add_relation(from_node, to_node, relation_type)
+    return graph
+
+
+def _levels(graph):
+    names, xs, ys = hierarchical_positions(graph, 1200)
+    assert sorted(names) == sorted(graph.nodes)
+    return dict(zip(names, ys))
+
+
+def test_parents_above_children_and_properties_beside_owner():
+    graph = _graph([("животное", "класс"), ("птица", "класс"), ("канарейка", "объект"), ("летать", "свойство")],
+                   [("птица", "является", "животное"), ("канарейка", "является", "птица"),
+                    ("птица", "умеет", "летать")])
+    y = _levels(graph)
+    assert y["животное"] < y["птица"] < y["канарейка"]
+    assert y["летать"] == y["птица"]
+
+
+def test_longest_path_rank():
+    graph = _graph([(name, "класс") for name in "ABCD"],
+                   [("B", "является", "A"), ("C", "является", "B"), ("D", "является", "A"), ("D", "является", "C")])
+    y = _levels(graph)
+    assert y["A"] < y["B"] < y["C"] < y["D"]
+
+
+def test_cycle_does_not_push_node_below_its_descendants():
+    # Узлы добавлены так, что обход начинается ниже цикла A <-> B
+    graph = _graph([(name, "класс") for name in "DCAB"],
+                   [("A", "является", "B"), ("B", "является", "A"),
+                    ("C", "является", "A"), ("D", "является", "C")])
+    y = _levels(graph)
+    assert min(y.values()) in (y["A"], y["B"])
+    assert y["A"] < y["C"] < y["D"]
+
+
+def test_wide_layer_wraps_into_rows():
+    graph = _graph([("корень", "класс")] + [(f"o{i}", "объект") for i in range(50)],
+                   [(f"o{i}", "является", "корень") for i in range(50)])
+    names, xs, ys = hierarchical_positions(graph, 1200)
+    assert len({y for name, y in zip(names, ys) if name != "корень"}) > 1
+    assert len(set(zip(xs, ys))) == len(names)
+
+
+def _random_snapshot(count=120, seed=0, width=1000, height=600):
+    """Случайные координаты (с несколькими совпадающими точками) и связи"""
+    rng = random.Random(seed)
+    xs = [rng.uniform(0, width) for _ in range(count)]
+    ys = [rng.uniform(0, height) for _ in range(count)]
+    for i in range(5):
+        xs[i], ys[i] = 0.0, 0.0
+    adjacency = [[] for _ in range(count)]
+    for i in range(1, count):
+        j = rng.randrange(i)
+        adjacency[i].append(j)
+        adjacency[j].append(i)
+    return xs, ys, adjacency
+
+
+def _exact_forces(xs, ys, adjacency):
+    """Эталон: точные силы для всех узлов по прежним координатам"""
+    forces = []
+    for i in range(len(xs)):
+        fx, fy = 0.0, 0.0
+        for j in range(len(xs)):
+            if i != j:
+                dx, dy = xs[i] - xs[j], ys[i] - ys[j]
+                distance = max(math.sqrt(dx*dx + dy*dy), layout.MIN_DISTANCE)
+                force = layout.REPULSION / (distance * distance)
+                fx += force * dx / distance
+                fy += force * dy / distance
+        ax, ay = layout._attraction(i, xs, ys, adjacency)
+        forces.append((fx + ax, fy + ay))
+    return forces
+
+
+def _exact_step(xs, ys, adjacency, bounds):
+    """Эталон: одновременный сдвиг всех узлов по точным силам"""
+    min_x, min_y, max_x, max_y = bounds
+    result_x, result_y = [], []
+    for x, y, (fx, fy) in zip(xs, ys, _exact_forces(xs, ys, adjacency)):
+        move_x, move_y = layout._clamp_move(fx, fy)
+        result_x.append(max(min_x, min(max_x, x + move_x)))
+        result_y.append(max(min_y, min(max_y, y + move_y)))
+    return result_x, result_y
+
+
+def test_barnes_hut_forces_match_exact():
+    xs, ys, adjacency = _random_snapshot()
+    exact = _exact_forces(xs, ys, adjacency)
+    for theta, tolerance in ((0.0, 1e-9), (0.8, 0.05)):
+        approximate = layout.barnes_hut_forces(xs, ys, adjacency, theta)
+        errors = sorted(math.hypot(ax - ex, ay - ey) / max(math.hypot(ex, ey), 1e-9)
+                        for (ax, ay), (ex, ey) in zip(approximate, exact))
+        assert errors[len(errors) // 2] < tolerance
+
+
+def test_barnes_hut_step_positions_close_to_exact():
+    xs, ys, adjacency = _random_snapshot()
+    bounds = (60, 60, 940, 540)
+    expected_x, expected_y = _exact_step(xs, ys, adjacency, bounds)
+    layout.barnes_hut_step(xs, ys, adjacency, bounds)
+    assert max(abs(a - b) for a, b in zip(xs + ys, expected_x + expected_y)) < 1.0
+    # Узлы в углу (0, 0) прижаты к границе области
+    assert (xs[0], ys[0]) == (60, 60)
+
+
+def test_barnes_hut_handles_many_coincident_points():
+    count = 3000
+    xs, ys = [60.0] * count, [60.0] * count
+    adjacency = [[] for _ in range(count)]
+    tree = layout.QuadTree(xs, ys)
+    leaves = [groups for groups in tree.groups if groups is not None]
+    assert len(leaves) == 1 and len(leaves[0]) == 1
+    # Совпадающие точки друг друга не отталкивают
+    assert set(layout.barnes_hut_forces(xs, ys, adjacency)) == {(0.0, 0.0)}
+
+
+def test_grid_forces_match_exact():
+    np = pytest.importorskip("numpy")
+    xs, ys, adjacency = _random_snapshot(count=600, width=1200, height=700)
+    exact = _exact_forces(xs, ys, [[] for _ in xs])
+    fx, fy = layout.grid_forces(np.array(xs), np.array(ys))
+    errors = np.hypot(fx - [f[0] for f in exact], fy - [f[1] for f in exact])
+    errors /= np.maximum(np.hypot(*zip(*exact)), 1e-9)
+    assert np.median(errors) < 0.02 and np.percentile(errors, 90) < 0.1
+
+
+def test_auto_mode_picks_grid_for_large_graphs():
+    if "numpy" in layout.available_modes():
+        assert layout.choose_mode(layout.VECTORIZED_MODE_LIMIT + 1) == layout.MODE_GRID
+    else:
+        assert layout.choose_mode(layout.VECTORIZED_MODE_LIMIT + 1) == layout.MODE_BARNES_HUT
+    assert layout.choose_mode(10) == layout.MODE_EXACT
+
+
+def test_vectorized_step_matches_exact():
+    np = pytest.importorskip("numpy")
+    xs, ys, adjacency = _random_snapshot()
+    bounds = (60, 60, 940, 540)
+    exact = _exact_forces(xs, ys, adjacency)
+    x, y = np.array(xs), np.array(ys)
+    owners, others = layout.pack_edges(adjacency)
+    fx, fy = layout.vectorized_forces(x, y)
+    attraction = [layout._attraction(i, xs, ys, adjacency) for i in range(len(xs))]
+    assert np.allclose(fx + [a[0] for a in attraction], [f[0] for f in exact], rtol=1e-9, atol=1e-9)
+    assert np.allclose(fy + [a[1] for a in attraction], [f[1] for f in exact], rtol=1e-9, atol=1e-9)
+
+    expected_x, expected_y = _exact_step(xs, ys, adjacency, bounds)
+    total_move = layout.vectorized_step(x, y, owners, others, bounds)
+    assert np.allclose(x, expected_x) and np.allclose(y, expected_y)
+    assert total_move == pytest.approx(sum(abs(a - b) for a, b in zip(expected_x + expected_y, xs + ys)))
+    # В снимке есть и узлы с обрезанным сдвигом, и узлы, прижатые к границе
+    moves = np.hypot(x - [min(max(v, 60), 940) for v in xs], y - [min(max(v, 60), 540) for v in ys])
+    assert any(abs(layout.STEP * f[0]) > layout.MAX_MOVE for f in exact)
+    assert moves.max() <= layout.MAX_MOVE * math.sqrt(2) + 1e-9
+    assert (x[0], y[0]) == (60, 60)
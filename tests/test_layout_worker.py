@@ -0,0 +1,65 @@
+import random
+import time
+
+import layout
+from layout_worker import LayoutWorker
+
+
+def _worker(count=40, seed=0, **options):
+    rng = random.Random(seed)
+    names = [f"n{i}" for i in range(count)]
+    xs = [rng.uniform(100, 900) for _ in names]
+    ys = [rng.uniform(100, 500) for _ in names]
+    adjacency = [[] for _ in names]
+    for i in range(1, count):
+        j = rng.randrange(i)
+        adjacency[i].append(j)
+        adjacency[j].append(i)
+    options.setdefault("mode", layout.MODE_EXACT)
+    return LayoutWorker(names, xs, ys, adjacency, (60, 60, 940, 540), **options)
+
+
+def test_stops_at_convergence_threshold():
+    worker = _worker(max_iterations=1000, tolerance=0.5)
+    worker.start()
+    assert worker.join(timeout=30)
+    assert worker.error is None and worker.converged
+    assert 1 <= worker.iteration < worker.max_iterations
+    iteration, xs, ys = worker.poll()
+    assert iteration == worker.iteration and len(xs) == len(ys) == 40
+    # Следующая итерация с опубликованных координат сдвигает узлы меньше порога
+    check_x, check_y = list(xs), list(ys)
+    total_move = next(layout.iterate_layout(check_x, check_y, worker.adjacency, worker.bounds, layout.MODE_EXACT))
+    assert total_move / len(xs) < 1.0
+    assert worker.poll() is None
+
+
+def test_without_convergence_runs_all_iterations():
+    worker = _worker(max_iterations=5, tolerance=0)
+    worker.start()
+    assert worker.join(timeout=30)
+    assert not worker.converged and worker.iteration == 5
+    assert worker.poll()[0] == 5
+
+
+def test_cancel_ends_thread_without_publishing():
+    worker = _worker(count=300, max_iterations=10 ** 6, tolerance=0, publish_interval=0)
+    worker.start()
+    deadline = time.monotonic() + 30
+    while worker.iteration < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    worker.cancel()
+    assert worker.poll() is None
+    assert worker.join(timeout=30)
+    assert worker.done and worker.cancelled and worker.error is None
+    assert 2 <= worker.iteration < worker.max_iterations
+    # Итерация, которая шла во время отмены, свои координаты уже не публикует
+    assert worker.poll() is None
+
+
+def test_cancel_before_start():
+    worker = _worker()
+    worker.cancel()
+    worker.start()
+    assert worker.join(timeout=30)
+    assert worker.iteration == 0 and worker.poll() is None
@@ -0,0 +1,97 @@
+import csv
+
+import pytest
+
+from frame_model import FrameStore
+from graph_model import SemanticGraph
+from history import History
+from network_import import import_network
+
+
+def _write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_import_csv_with_declarations_and_errors(tmp_path):
+    path = _write(tmp_path, "net.csv",
+                  "from,type,to\n"
+                  "канарейка,является,птица\n"
+                  "птица,класс\n"
+                  "канарейка,является,птица\n"
+                  "канарейка,умеет\n"
+                  "a,b,c,d\n"
+                  "кот,умеет,кот\n")
+    graph = SemanticGraph()
+    report = import_network(graph, path)
+    assert graph.node_type("канарейка") == "объект"
+    # Тип по умолчанию уточняется объявлением ниже по файлу
+    assert graph.node_type("птица") == "класс"
+    assert graph.has_relation("канарейка", "птица", "является")
+    assert report.relations_added == 1 and report.duplicates == 1
+    assert report.error_count == 3
+    x1, y1 = graph.position("канарейка")
+    x2, y2 = graph.position("птица")
+    assert (x1, y1) != (x2, y2)
+
+
+def test_import_json_lines(tmp_path):
+    path = _write(tmp_path, "net.jsonl",
+                  '{"node": "рыба", "type": "class"}\n'
+                  '{"from": "акула", "type": "является", "to": "рыба"}\n'
+                  "не json\n")
+    graph = SemanticGraph()
+    report = import_network(graph, path)
+    assert graph.node_type("рыба") == "класс"
+    assert graph.has_relation("акула", "рыба", "является")
+    assert report.error_count == 1
+
+
+def test_import_single_reset_event(tmp_path):
+    path = _write(tmp_path, "net.tsv", "a\tимеет\tb\nb\tимеет\tc\n")
+    graph = SemanticGraph()
+    events = []
+    graph.subscribe(lambda event, *args: events.append(event))
+    import_network(graph, path)
+    assert events == ["reset"]
+
+
+def test_import_csv_error_is_value_error(tmp_path):
+    path = _write(tmp_path, "net.csv", "a,имеет,b\n" + "x" * 50 + ",имеет,b\n")
+    limit = csv.field_size_limit(10)
+    try:
+        with pytest.raises(ValueError, match="Строка 2"):
+            import_network(SemanticGraph(), path)
+    finally:
+        csv.field_size_limit(limit)
+
+
+def test_bad_encoding_is_a_line_error(tmp_path):
+    path = tmp_path / "net.csv"
+    path.write_bytes("a,имеет,b\n".encode() + b"\xff\xfe,x,y\n" + "c,имеет,d\n".encode())
+    graph = SemanticGraph()
+    report = import_network(graph, str(path))
+    assert report.error_count == 1 and report.errors[0].startswith("Строка 2:")
+    assert graph.has_relation("a", "b", "имеет") and graph.has_relation("c", "d", "имеет")
+
+
+def test_partial_import_rolls_back_through_history(tmp_path):
+    path = _write(tmp_path, "net.csv", "старый,имеет,новый\nновый,является,класс\n" + "x" * 50 + ",имеет,b\n")
+    graph = SemanticGraph()
+    history = History(graph, FrameStore())
+    graph.add_node("старый", "объект", 7, 7)
+    history.commit()
+    limit = csv.field_size_limit(10)
+    try:
+        with pytest.raises(ValueError):
+            import_network(graph, path)
+    finally:
+        csv.field_size_limit(limit)
+    assert graph.has_node("новый")
+    history.rollback()
+    assert list(graph.nodes) == ["старый"] and not list(graph.relations)
+    assert graph.position("старый") == (7, 7)
+    # Откат не оставляет шага для повтора, а прежний шаг по-прежнему отменяется
+    assert not history.can_redo()
+    assert history.undo() and len(graph.nodes) == 0
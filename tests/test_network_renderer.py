@@ -0,0 +1,200 @@
+import time
+
+from benchmark import dense_property_graph
+from graph_model import SemanticGraph
+from network_renderer import (LABEL_FONT, LABEL_RETRY_LIMIT, LOD_SCALE, MIN_FONT_SIZE, NetworkRenderer, edge_key,
+                              scaled_font)
+from svg_export import SvgCanvas
+
+
+class RecordingCanvas(SvgCanvas):
+    """SvgCanvas, запоминающий элементы, которые создавались или менялись"""
+
+    def __init__(self):
+        super().__init__()
+        self.touched = []
+
+    def _create(self, kind, coords, options):
+        item = super()._create(kind, coords, options)
+        self.touched.append(("create", item))
+        return item
+
+    def coords(self, item, *coords):
+        if coords:
+            self.touched.append(("coords", item))
+        return super().coords(item, *coords)
+
+    def itemconfigure(self, item, **options):
+        self.touched.append(("config", item))
+        super().itemconfigure(item, **options)
+
+    def delete(self, *items):
+        self.touched.extend(("delete", item) for item in items)
+        super().delete(*items)
+
+
+def _renderer(b_x):
+    graph = SemanticGraph()
+    graph.add_node("а", "объект", 0, 0)
+    graph.add_node("б", "свойство", b_x, 0)
+    graph.add_node("в", "свойство", 300, 500)
+    graph.add_relation("а", "б", "имеет")
+    renderer = NetworkRenderer(SvgCanvas(), graph, 60)
+    renderer.render()
+    return graph, renderer
+
+
+def _label_box(renderer):
+    pair = edge_key("а", "б")
+    if pair not in renderer.label_index:
+        return None
+    return renderer.label_index.box(pair)
+
+
+def test_multi_edges_share_one_line_and_label():
+    graph, renderer = _renderer(400)
+    graph.add_relation("б", "а", "умеет")
+    graph.add_relation("а", "б", "является")
+    renderer.render()
+    items = renderer.edge_items[edge_key("а", "б")]
+    assert len(renderer.edge_items) == 1 and len(items) == 3
+    assert renderer.canvas._items[items[2]][2]["text"] == "имеет, умеет, является"
+
+
+def test_label_moves_away_from_dragged_node():
+    graph, renderer = _renderer(600)
+    assert _label_box(renderer)[0] < 300 < _label_box(renderer)[2]
+    graph.move_node("в", 300, 0)
+    renderer.render()
+    x1, y1, x2, y2 = _label_box(renderer)
+    assert not renderer.node_index.intersects(x1, y1, x2, y2)
+    assert len(renderer.edge_items[edge_key("а", "б")]) == 3
+
+
+def test_dropped_label_returns_when_space_frees():
+    graph, renderer = _renderer(400)
+    graph.move_node("в", 200, 0)
+    renderer.render()
+    assert _label_box(renderer) is None
+    assert len(renderer.edge_items[edge_key("а", "б")]) == 1
+    graph.move_node("в", 200, 500)
+    renderer.render()
+    assert _label_box(renderer) is not None
+    assert len(renderer.edge_items[edge_key("а", "б")]) == 3
+
+
+def test_moving_hub_retries_only_labels_near_freed_areas():
+    graph = dense_property_graph(2000)
+    renderer = NetworkRenderer(SvgCanvas(), graph, 60)
+    renderer.render()
+    assert len(renderer._unlabeled) > LABEL_RETRY_LIMIT
+    hub = max(graph.nodes, key=lambda name: len(graph.incoming(name)))
+    edges = {edge_key(relation["from"], relation["to"]) for relation in graph.incoming(hub)}
+    calls = []
+    place_label = renderer._place_label
+    renderer._place_label = lambda pair, boxes: calls.append(pair) or place_label(pair, boxes)
+    timings = []
+    for step in range(3):
+        x, y = graph.position(hub)
+        graph.move_node(hub, x + 40, y + 40)
+        # Ребра узла и подписи, которые он закрыл на новом месте, ставятся заново
+        moved = len(edges) + len(renderer.label_index.query_rect(*renderer.node_index.box(hub)))
+        calls.clear()
+        start = time.perf_counter()
+        renderer.render()
+        timings.append(time.perf_counter() - start)
+        assert len(calls) <= moved + LABEL_RETRY_LIMIT
+    # Раньше после перемещения узла с десятками ребер заново пробовались все тысячи подписей (~1 с)
+    assert min(timings) < 0.2
+
+
+def _grid_graph(size=10, step=200):
+    graph = SemanticGraph()
+    for i in range(size):
+        for j in range(size):
+            graph.add_node(f"{i}:{j}", "объект", i * step, j * step)
+    for i in range(size):
+        for j in range(size - 1):
+            graph.add_relation(f"{i}:{j}", f"{i}:{j + 1}", "имеет")
+    return graph
+
+
+def test_move_updates_only_dirty_items():
+    graph = _grid_graph()
+    canvas = RecordingCanvas()
+    renderer = NetworkRenderer(canvas, graph, 60)
+    renderer.render()
+    before = dict(canvas._items)
+    canvas.touched.clear()
+    graph.move_node("5:5", 1010, 1000)
+    renderer.render()
+    allowed = set(renderer.node_items["5:5"])
+    for pair in (edge_key("5:4", "5:5"), edge_key("5:5", "5:6")):
+        allowed.update(renderer.edge_items[pair])
+    assert canvas.touched and {item for _, item in canvas.touched} <= allowed
+    assert not any(action == "create" for action, _ in canvas.touched)
+    assert set(canvas._items) == set(before)
+
+
+def test_culling_draws_only_visible_items():
+    graph = _grid_graph()
+    renderer = NetworkRenderer(SvgCanvas(), graph, 60)
+    renderer.set_culling(True)
+    renderer.set_viewport(0, 0, 500, 500)
+    renderer.render()
+    assert set(renderer.node_items) == {f"{i}:{j}" for i in range(3) for j in range(3)}
+    assert all(int(a.split(":")[0]) < 3 for a, b in renderer.edge_items)
+    assert len(renderer.canvas._items) < len(graph.nodes)
+    # Прокрутка: ушедшие элементы удаляются, появившиеся создаются
+    renderer.set_viewport(1500, 1500, 2000, 2000)
+    renderer.render()
+    assert set(renderer.node_items) == {f"{i}:{j}" for i in range(8, 10) for j in range(8, 10)}
+    assert "0:0" not in renderer.node_items
+
+
+def test_labels_dropped_at_low_zoom():
+    graph = _grid_graph(size=4)
+    renderer = NetworkRenderer(SvgCanvas(), graph, 60)
+    renderer.render()
+    assert all(len(items) == 3 for items in renderer.edge_items.values())
+    # Подпись мельче MIN_FONT_SIZE не рисуется, узлы сохраняют текст
+    renderer.scale_view(0, 0, 0.5)
+    renderer.invalidate()
+    renderer.render()
+    assert all(len(items) == 1 for items in renderer.edge_items.values())
+    assert all(len(items) == 2 for items in renderer.node_items.values())
+    assert not renderer.label_index.query_rect(-1000, -1000, 5000, 5000)
+    # С отсечением ниже LOD_SCALE узлы - точки без текста, ребра - линии без стрелок
+    renderer.set_culling(True)
+    renderer.set_viewport(0, 0, 1000, 1000)
+    renderer.scale_view(0, 0, (LOD_SCALE - 0.1) / renderer.scale)
+    renderer.render()
+    assert renderer.low_detail
+    assert all(len(items) == 1 for items in renderer.node_items.values())
+    lines = [renderer.canvas._items[items[0]] for items in renderer.edge_items.values()]
+    assert lines and all("arrow" not in options for _, _, options, _ in lines)
+
+
+def test_zoom_keeps_point_under_cursor():
+    graph, renderer = _renderer(400)
+    cursor = (250, 130)
+    world = renderer.to_world(*cursor)
+    for factor in (1.1, 1.1, 0.5, 3.0, 1 / 1.1):
+        renderer.scale_view(*cursor, factor)
+        x, y = renderer.to_canvas(*world)
+        assert abs(x - cursor[0]) < 1e-9 and abs(y - cursor[1]) < 1e-9
+    renderer.invalidate()
+    renderer.render()
+    # Узел рисуется в новом масштабе относительно указателя
+    x1, y1, x2, y2 = renderer.canvas.coords(renderer.node_items["б"][0])
+    expected_x, expected_y = renderer.to_canvas(400, 0)
+    assert abs((x1 + x2) / 2 - expected_x) < 1e-6 and abs((y1 + y2) / 2 - expected_y) < 1e-6
+    assert abs((x2 - x1) - 120 * renderer.scale) < 1e-6
+
+
+def test_scaled_font_drops_small_text():
+    assert scaled_font(LABEL_FONT, 1.0) == LABEL_FONT
+    assert scaled_font(LABEL_FONT, 2.0) == ("Arial", 18, "bold")
+    assert scaled_font(LABEL_FONT, (MIN_FONT_SIZE + 0.1) / LABEL_FONT[1])[1] == MIN_FONT_SIZE
+    assert scaled_font(LABEL_FONT, (MIN_FONT_SIZE - 0.6) / LABEL_FONT[1]) is None
+    assert scaled_font(("Arial", 8), 0.01) is None
@@ -0,0 +1,105 @@
+import os
+import struct
+
+import pytest
+
+from graph_model import SemanticGraph
+from network_storage import HEADER, NetworkFile, load_network, save_network
+
+
+def _graph():
+    graph = SemanticGraph()
+    graph.add_node("птица", "класс", 10.5, 20)
+    graph.add_node("канарейка", "объект", -3, 7.25)
+    graph.add_node("летать", "свойство", 0, 0)
+    graph.add_relation("канарейка", "птица", "является")
+    graph.add_relation("птица", "летать", "умеет")
+    graph.add_relation("канарейка", "летать", "умеет")
+    return graph
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "net.snet")
+    frames = {"Фрейм: Птица": {"type": "фрейм класса", "x": 1, "y": 2, "slots": {"Умеет": "Летать"}}}
+    save_network(path, _graph(), frames)
+    graph = SemanticGraph()
+    graph.add_node("лишний", "объект", 0, 0)
+    events = []
+    graph.subscribe(lambda event, *args: events.append(event))
+    assert load_network(path, graph) == frames
+    assert events == ["reset"]
+    assert not graph.has_node("лишний")
+    assert graph.position("птица") == (10.5, 20)
+    assert graph.node_type("канарейка") == "объект"
+    assert sorted(graph.relations) == sorted(_graph().relations)
+    assert {relation["to"] for relation in graph.outgoing("канарейка")} == {"птица", "летать"}
+    assert graph.relations_of_type("является") == [("канарейка", "птица", "является")]
+    assert not os.path.exists(path + ".tmp")
+
+
+def test_network_file_reads_records_lazily(tmp_path):
+    path = str(tmp_path / "net.snet")
+    save_network(path, _graph())
+    with NetworkFile(path) as network_file:
+        assert network_file.node_count == 3 and network_file.relation_count == 3
+        assert network_file.node(1) == ("канарейка", "объект", -3, 7.25)
+        assert network_file.relation(0) == ("канарейка", "птица", "является")
+
+
+def test_bad_node_index_keeps_graph(tmp_path):
+    path = str(tmp_path / "net.snet")
+    save_network(path, _graph())
+    data = bytearray(open(path, "rb").read())
+    # Начала связей - номера узлов 1, 0, 1: ищем эту последовательность u32
+    pattern = struct.pack("<3I", 1, 0, 1)
+    position = data.index(pattern)
+    data[position:position + 4] = struct.pack("<I", 99)
+    open(path, "wb").write(bytes(data))
+
+    graph = _graph()
+    with pytest.raises(ValueError):
+        load_network(path, graph)
+    assert len(graph.nodes) == 3 and len(graph.relations) == 3
+
+
+def test_duplicate_names_and_garbage(tmp_path):
+    path = str(tmp_path / "net.snet")
+    graph = SemanticGraph()
+    graph.add_node("а", "объект", 0, 0)
+    graph.add_node("б", "объект", 0, 0)
+    save_network(path, graph)
+    data = bytearray(open(path, "rb").read())
+    # Второе имя ссылается на ту же строку, что и первое
+    position = data.index(struct.pack("<2I", 0, 1))
+    data[position + 4:position + 8] = struct.pack("<I", 0)
+    open(path, "wb").write(bytes(data))
+    with pytest.raises(ValueError, match="имена"):
+        load_network(path, _graph())
+
+    open(path, "wb").write(b"SNET" + b"\0" * (HEADER.size - 4))
+    with pytest.raises(ValueError):
+        load_network(path, _graph())
+
+
+@pytest.mark.parametrize("frame", [1, {"type": "фрейм", "x": 0, "y": 0},
+                                   {"type": "фрейм", "x": "0", "y": 0, "slots": {}},
+                                   {"type": None, "x": 0, "y": 0, "slots": {}}])
+def test_bad_frame_keeps_graph(tmp_path, frame):
+    path = str(tmp_path / "net.snet")
+    save_network(path, SemanticGraph(), {"Ф": frame})
+    graph = _graph()
+    with pytest.raises(ValueError, match="фреймов"):
+        load_network(path, graph)
+    assert len(graph.nodes) == 3 and len(graph.relations) == 3
+
+
+def test_failed_save_removes_temp_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "net.snet")
+
+    def failing_replace(source, target):
+        raise OSError("нет места")
+
+    monkeypatch.setattr(os, "replace", failing_replace)
+    with pytest.raises(OSError):
+        save_network(path, _graph())
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,67 @@
+import json
+import threading
+
+import profiling
+from profiling import Profiler
+
+
+def _clock(monkeypatch, *ticks_ms):
+    """Подмена часов профилировщика: каждый вызов возвращает следующий отсчет (мс)"""
+    ticks = iter(tick * 1000000 for tick in ticks_ms)
+    monkeypatch.setattr(profiling.time, "perf_counter_ns", lambda: next(ticks))
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler()
+    with profiler.span("draw", nodes=3) as span:
+        span["items"] = 5
+    assert profiler.stats() == {} and profiler.trace_events() == []
+
+
+def test_rolling_stats_keep_last_window(monkeypatch):
+    # Начало отсчета, затем участки по 20, 10, 40 и 30 мс
+    _clock(monkeypatch, 0, 10, 30, 30, 40, 50, 90, 100, 130)
+    profiler = Profiler(enabled=True, window=3)
+    for items in (1, 2, 3, 4):
+        with profiler.span("draw") as span:
+            span["items"] = items
+    stat = profiler.stats()["draw"]
+    # Первый замер (20 мс) вытеснен из окна из трех последних
+    assert stat["count"] == 3
+    assert stat["last"] == 0.03 and stat["max"] == 0.04
+    assert abs(stat["mean"] - (0.01 + 0.04 + 0.03) / 3) < 1e-12
+    assert stat["args"] == {"items": 4}
+    assert profiler.format_stats() == "draw: 30.0 мс (сред. 26.7, макс. 40.0, n=3) items=4"
+    # В журнал попадают все замеры
+    assert len(profiler.trace_events()) == 4
+    profiler.clear()
+    assert profiler.stats() == {} and profiler.trace_events() == []
+
+
+def test_chrome_trace_has_nested_spans_and_threads(tmp_path):
+    profiler = Profiler(enabled=True)
+
+    def apply():
+        with profiler.span("layout.apply"):
+            pass
+
+    with profiler.span("layout.run", nodes=10):
+        with profiler.span("layout.iteration"):
+            pass
+        thread = threading.Thread(target=apply)
+        thread.start()
+        thread.join()
+    path = tmp_path / "trace.json"
+    profiler.write_trace(path)
+    with open(path, encoding="utf-8") as stream:
+        trace = json.load(stream)
+    events = {event["name"]: event for event in trace["traceEvents"]}
+    assert set(events) == {"layout.run", "layout.iteration", "layout.apply"}
+    for event in events.values():
+        assert event["ph"] == "X" and event["cat"] == "layout" and event["dur"] >= 0
+    outer, inner = events["layout.run"], events["layout.iteration"]
+    assert outer["ts"] <= inner["ts"] and inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    assert outer["args"] == {"nodes": 10}
+    assert outer["tid"] == inner["tid"] == threading.get_ident()
+    assert events["layout.apply"]["tid"] != outer["tid"]
+    assert len({event["pid"] for event in events.values()}) == 1
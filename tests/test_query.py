@@ -0,0 +1,50 @@
+import pytest
+
+from graph_model import SemanticGraph
+from query import QueryError, TripleQuery, parse_query, run_query
+
+
+def _graph():
+    graph = SemanticGraph()
+    for name, node_type in (("птица", "класс"), ("канарейка", "объект"), ("страус", "объект"),
+                            ("летать", "свойство"), ("желтый", "свойство")):
+        graph.add_node(name, node_type, 0, 0)
+    graph.add_relation("канарейка", "птица", "является")
+    graph.add_relation("страус", "птица", "является")
+    graph.add_relation("канарейка", "летать", "умеет")
+    graph.add_relation("канарейка", "желтый", "имеет цвет")
+    return graph
+
+
+def test_parse_multiword_relation_and_quotes():
+    assert parse_query('?x имеет цвет желтый; "большая птица" является ?y') == [
+        ("?x", "имеет цвет", "желтый"), ("большая птица", "является", "?y")]
+
+
+@pytest.mark.parametrize("text", ["", " ; ", "?x умеет", '?x умеет "летать'])
+def test_parse_errors(text):
+    with pytest.raises(QueryError):
+        parse_query(text)
+
+
+def test_join_of_patterns():
+    solutions = list(run_query(_graph(), "?x является птица\n?x умеет летать"))
+    assert solutions == [{"?x": "канарейка"}]
+
+
+def test_variable_relation_type():
+    solutions = list(run_query(_graph(), "канарейка ?r ?y"))
+    assert {(s["?r"], s["?y"]) for s in solutions} == {
+        ("является", "птица"), ("умеет", "летать"), ("имеет цвет", "желтый")}
+
+
+def test_ground_query_has_one_empty_solution():
+    query = TripleQuery.parse(_graph(), "канарейка является птица")
+    assert query.variables == []
+    assert list(query.results()) == [{}]
+    assert list(run_query(_graph(), "страус умеет летать")) == []
+
+
+def test_plan_starts_with_selective_pattern():
+    query = TripleQuery.parse(_graph(), "?x является ?y; ?x имеет цвет желтый")
+    assert query.plan()[0] == ("?x", "имеет цвет", "желтый")
@@ -0,0 +1,69 @@
+from frame_model import FrameStore
+from graph_model import SemanticGraph
+from search_index import KnowledgeSearch, SearchIndex, tokenize
+
+
+def test_tokenize_normalizes_case_and_yo():
+    assert tokenize("Ёжик, ЕЖИК-2") == ["ежик", "ежик", "2"]
+
+
+def test_prefix_and_conjunction():
+    index = SearchIndex()
+    index.add(1, "Канарейка желтая")
+    index.add(2, "Канарейка синяя")
+    index.add(3, "Желтый попугай")
+    assert set(index.search("кан")) == {1, 2}
+    assert set(index.search("жел кан")) == {1}
+    assert set(index.search("ЖЕЛ")) == {1, 3}
+    assert index.search("кан зеленая") == []
+    assert index.search("  ") == []
+
+
+def test_replace_and_remove_documents():
+    index = SearchIndex()
+    index.add("a", "красный")
+    index.add("a", "синий")
+    assert index.search("крас") == [] and index.search("син") == ["a"]
+    index.remove("a")
+    assert len(index) == 0 and index.search("син") == []
+    assert index._tokens == []
+    index.discard("a")
+
+
+def test_limit_and_key():
+    index = SearchIndex()
+    index.rebuild((i, f"узел {i}") for i in range(100))
+    assert len(index.search("узел", limit=10)) == 10
+    assert index.search("узел", limit=3, key=lambda doc: -doc) == sorted(index.search("узел", limit=3), reverse=True)
+
+
+def test_most_selective_term_by_posting_size():
+    index = SearchIndex()
+    # У «а» одно слово индекса с большим числом документов, у «б» - много слов по одному документу
+    index.rebuild([(i, f"а б{i}") for i in range(50)] + [(100 + i, "а") for i in range(500)])
+    terms = [index._prefix_tokens("а"), index._prefix_tokens("б")]
+    assert index._most_selective(terms) == 1
+    assert len(index.search("а б", limit=1000)) == 50
+
+
+def test_knowledge_search_follows_models():
+    graph = SemanticGraph()
+    frame_store = FrameStore()
+    search = KnowledgeSearch(graph, frame_store)
+    graph.add_node("Ёлка", "объект", 0, 0)
+    graph.add_node("лес", "класс", 0, 0)
+    graph.add_relation("Ёлка", "лес", "растет в")
+    frame_store.create_frame("Фрейм: Ель", "фрейм объекта", 0, 0, {"Запах": "хвойный"})
+    assert search.search("елк") == [("node", "Ёлка")]
+    assert search.search("раст") == [("relation_type", "растет в")]
+    assert search.search("хвой") == [("slot", "Фрейм: Ель", "Запах")]
+    assert search.search("ель") == [("frame", "Фрейм: Ель")]
+
+    frame_store.set_slot("Фрейм: Ель", "Запах", "смолистый")
+    assert search.search("хвой") == [] and search.search("смол")
+    graph.remove_relation("Ёлка", "лес", "растет в")
+    assert search.search("раст") == []
+    frame_store.delete_frame("Фрейм: Ель")
+    assert search.search("ель") == []
+    graph.clear()
+    assert search.search("елк") == []
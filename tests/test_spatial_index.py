@@ -0,0 +1,84 @@
+import math
+
+from spatial_index import GridIndex, find_free_position
+
+
+def test_query_rect_and_remove():
+    index = GridIndex(cell_size=10)
+    index.insert("a", 5, 5)
+    index.insert("b", 25, 25)
+    index.insert("line", 0, 0, 1000, 1000)
+    assert index.query_rect(0, 0, 10, 10) == {"a", "line"}
+    index.remove("a")
+    assert index.query_rect(0, 0, 10, 10) == {"line"}
+    assert "a" not in index and len(index) == 2
+
+
+def test_insert_moves_existing_key():
+    index = GridIndex(cell_size=10)
+    index.insert("a", 5, 5)
+    index.insert("a", 105, 105)
+    assert index.query_rect(0, 0, 10, 10) == set()
+    assert index.query_rect(100, 100, 110, 110) == {"a"}
+
+
+def test_intersects_matches_query_rect():
+    index = GridIndex(cell_size=7)
+    for i in range(50):
+        index.insert(i, i * 3, (i * 7) % 40, i * 3 + 2, (i * 7) % 40 + 2)
+    for x in range(0, 160, 9):
+        for y in range(0, 45, 5):
+            assert index.intersects(x, y, x + 4, y + 4) == bool(index.query_rect(x, y, x + 4, y + 4))
+
+
+def test_bounds_and_outer_bounds():
+    index = GridIndex(cell_size=10)
+    assert index.bounds() is None and index.outer_bounds() is None
+    index.insert("a", 12, 3)
+    index.insert("b", -5, 40)
+    assert index.bounds() == (-10, 0, 20, 50)
+    assert index.outer_bounds() == (-5, 3, 12, 40)
+
+
+def test_any_within():
+    index = GridIndex(cell_size=10)
+    index.insert("a", 0, 0)
+    assert index.any_within(3, 4, 5.1)
+    assert not index.any_within(3, 4, 5)
+
+
+def _place(index, count, bounds=(0, 0, 500, 300), distance=50):
+    positions = []
+    for i in range(count):
+        x, y = find_free_position(index, 250, 150, distance, bounds, spiral_step=25)
+        assert not index.any_within(x, y, distance)
+        index.insert(i, x, y)
+        positions.append((x, y))
+    return positions
+
+
+def test_find_free_position_keeps_distance():
+    index = GridIndex(cell_size=55)
+    positions = _place(index, 300)
+    for i, (x1, y1) in enumerate(positions):
+        for x2, y2 in positions[i + 1:]:
+            assert math.hypot(x1 - x2, y1 - y2) >= 50
+
+
+def test_find_free_position_work_is_bounded_when_full():
+    index = GridIndex(cell_size=55)
+    _place(index, 200)
+    calls = []
+    any_within = index.any_within
+
+    def counting(x, y, radius):
+        calls.append((x, y))
+        return any_within(x, y, radius)
+
+    index.any_within = counting
+    _place(index, 50)
+    first = len(calls)
+    calls.clear()
+    _place(index, 50)
+    # Проверок на одну вставку не становится больше с ростом числа элементов
+    assert len(calls) <= first * 1.1
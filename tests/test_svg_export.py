@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+import xml.etree.ElementTree as ElementTree
+
+import cli
+from graph_model import SemanticGraph
+from svg_export import render_frames_svg, render_network_svg
+
+SVG = "{http://www.w3.org/2000/svg}"
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _texts(document):
+    return ["".join(span.text or "" for span in text.iter(SVG + "tspan")) for text in document.iter(SVG + "text")]
+
+
+def test_network_svg_has_nodes_edges_and_labels():
+    graph = SemanticGraph()
+    graph.add_node("птица", "класс", 100, 100)
+    graph.add_node("канарейка", "объект", 100, 400)
+    graph.add_node("летать", "свойство", 500, 100)
+    graph.add_relation("канарейка", "птица", "является")
+    graph.add_relation("птица", "летать", "умеет")
+    document = ElementTree.fromstring(render_network_svg(graph).encode("utf-8"))
+
+    ellipses = list(document.iter(SVG + "ellipse"))
+    assert len(ellipses) == 3
+    assert {ellipse.get("fill") for ellipse in ellipses} == {"lightblue", "lightgreen", "lightyellow"}
+    lines = list(document.iter(SVG + "polyline"))
+    assert sorted(line.get("stroke") for line in lines) == ["blue", "red"]
+    # Стрелка у конца связи; линия рисуется от меньшего имени пары к большему
+    assert all(line.get("marker-end") or line.get("marker-start") for line in lines)
+    assert {marker.get("id") for marker in document.iter(SVG + "marker")} == {"arrow-blue", "arrow-red"}
+    assert sorted(_texts(document)) == ["канарейка", "летать", "птица", "умеет", "является"]
+
+
+def test_frames_svg_lists_slots():
+    frames = {"Фрейм: Птица": {"type": "фрейм класса", "x": 200, "y": 150, "slots": {"Умеет": "Летать"}}}
+    texts = _texts(ElementTree.fromstring(render_frames_svg(frames).encode("utf-8")))
+    assert "Фрейм: Птица" in texts and any("Летать" in text for text in texts)
+
+
+def test_cli_writes_network_and_frames(tmp_path):
+    source = tmp_path / "net.csv"
+    source.write_text("канарейка,является,птица\nптица,умеет,летать\n", encoding="utf-8")
+    output = tmp_path / "net.svg"
+    frames = tmp_path / "frames.svg"
+    assert cli.main([str(source), "-o", str(output), "--mode", "exact", "--iterations", "3"]) == 0
+    assert len(list(ElementTree.parse(output).iter(SVG + "ellipse"))) == 3
+    assert cli.main(["example", "-o", str(output), "--frames", str(frames), "--no-layout"]) == 0
+    assert list(ElementTree.parse(frames).iter(SVG + "text"))
+    assert cli.main([str(tmp_path / "нет.csv"), "-o", str(output)]) == 1
+
+
+def test_cli_starts_without_tkinter_and_numpy():
+    code = "import sys, cli; print('tkinter' in sys.modules, 'numpy' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["False", "False"]